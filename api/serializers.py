@@ -0,0 +1,65 @@
+from rest_framework import serializers
+
+from core.models import Blog, Category, Option, Question, Quiz, Tag
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    quiz_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ('id', 'name', 'description', 'quiz_count')
+
+
+class QuizSerializer(serializers.ModelSerializer):
+    category = serializers.StringRelatedField()
+    category_id = serializers.IntegerField(read_only=True)
+    question_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = (
+            'id', 'title', 'description', 'category', 'category_id', 'status', 'is_paid', 'price',
+            'questions_per_attempt', 'question_count', 'image', 'created_at',
+        )
+
+
+class OptionSerializer(serializers.ModelSerializer):
+    # is_correct is deliberately not exposed
+    class Meta:
+        model = Option
+        fields = ('id', 'text')
+
+
+class QuestionSerializer(serializers.ModelSerializer):
+    quiz_id = serializers.IntegerField(read_only=True)
+    options = OptionSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ('id', 'quiz_id', 'text', 'options')
+
+
+class TagSerializer(serializers.ModelSerializer):
+    blog_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Tag
+        fields = ('id', 'name', 'blog_count')
+
+
+class BlogSerializer(serializers.ModelSerializer):
+    author = serializers.CharField(source='author.username', read_only=True)
+    tags = serializers.SlugRelatedField(slug_field='name', many=True, read_only=True)
+
+    class Meta:
+        model = Blog
+        fields = (
+            'id', 'title', 'summary', 'image', 'author', 'tags', 'like_count', 'dislike_count',
+            'comment_count', 'created_at', 'updated_at',
+        )
+
+
+class BlogDetailSerializer(BlogSerializer):
+    class Meta(BlogSerializer.Meta):
+        fields = BlogSerializer.Meta.fields + ('content',)
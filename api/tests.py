@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Category, Option, Question, Quiz
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Geography')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=category)
+        cls.question = Question.objects.create(quiz=cls.quiz, text='Capital of France?')
+        Option.objects.create(question=cls.question, text='Paris', is_correct=True)
+
+    def test_matching_etag_is_a_304_after_one_query(self):
+        first = self.client.get('/api/quizzes/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'])
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/quizzes/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(len(queries), 1)
+
+    def test_matching_last_modified_is_a_304(self):
+        first = self.client.get('/api/quizzes/')
+        second = self.client.get('/api/quizzes/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_each_query_string_has_its_own_etag(self):
+        etag = self.client.get('/api/quizzes/')['ETag']
+        response = self.client.get(f'/api/quizzes/?category={self.quiz.category_id}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_a_change_invalidates_the_etag(self):
+        etag = self.client.get('/api/questions/')['ETag']
+        Option.objects.create(question=self.question, text='Lyon')
+        response = self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([option['text'] for option in response.json()['results'][0]['options']], ['Paris', 'Lyon'])
+
+
+class QuestionListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Geography')
+        cls.active = Quiz.objects.create(title='Capitals', category=category)
+        cls.held = Quiz.objects.create(title='Rivers', category=category, status='hold')
+        Question.objects.create(quiz=cls.active, text='Capital of France?')
+        Question.objects.create(quiz=cls.held, text='Longest river?')
+
+    def texts(self, path):
+        return [question['text'] for question in self.client.get(path).json()['results']]
+
+    def test_questions_of_quizzes_on_hold_are_hidden(self):
+        self.assertEqual(self.texts('/api/questions/'), ['Capital of France?'])
+        self.assertEqual(self.texts(f'/api/questions/?quiz={self.held.id}'), [])
+
+    def test_putting_a_quiz_on_hold_invalidates_the_etag(self):
+        etag = self.client.get('/api/questions/')['ETag']
+        quiz = Quiz.objects.get(pk=self.active.pk)
+        quiz.status = 'hold'
+        quiz.save()
+        response = self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_correct_answers_are_not_exposed(self):
+        question = Question.objects.get(quiz=self.active)
+        Option.objects.create(question=question, text='Paris', is_correct=True)
+        option = self.client.get(f'/api/questions/{question.id}/').json()['options'][0]
+        self.assertEqual(set(option), {'id', 'text'})
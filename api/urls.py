@@ -0,0 +1,18 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from . import views
+
+router = DefaultRouter()
+router.register('categories', views.CategoryViewSet, basename='category')
+router.register('quizzes', views.QuizViewSet, basename='quiz')
+router.register('questions', views.QuestionViewSet, basename='question')
+router.register('blogs', views.BlogViewSet, basename='blog')
+router.register('tags', views.TagViewSet, basename='tag')
+
+urlpatterns = [
+    path('', include(router.urls)),
+    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+]
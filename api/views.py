@@ -0,0 +1,102 @@
+from django.db.models import Count
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import viewsets
+
+from core.models import Blog, Category, Question, Quiz, Tag
+from core.versions import changed_at, etag_for
+
+from .pagination import IdCursorPagination, NewestCursorPagination
+from .serializers import (
+    BlogDetailSerializer, BlogSerializer, CategorySerializer, QuestionSerializer, QuizSerializer, TagSerializer,
+)
+
+
+class ConditionalReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only endpoint answering conditional GETs from core.versions stamps.
+
+    ``versioned_by`` names the content groups a response depends on. The
+    validators are checked before the queryset is touched, so a 304 costs one
+    query. Every queryset loads its relations with select_related,
+    prefetch_related or annotations, so each page takes a fixed number of
+    queries whatever its size.
+    """
+    versioned_by = ()
+    pagination_class = IdCursorPagination
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+    def conditional(self, request, handler, *args, **kwargs):
+        last_modified = changed_at(*self.versioned_by)
+        etag = etag_for(last_modified, request.get_full_path(), request.accepted_renderer.format)
+        timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class CategoryViewSet(ConditionalReadOnlyViewSet):
+    queryset = Category.objects.annotate(quiz_count=Count('quiz')).order_by('id')
+    serializer_class = CategorySerializer
+    versioned_by = ('categories',)
+
+
+class QuizViewSet(ConditionalReadOnlyViewSet):
+    serializer_class = QuizSerializer
+    versioned_by = ('quizzes',)
+
+    def get_queryset(self):
+        quizzes = Quiz.objects.select_related('category').annotate(question_count=Count('question'))
+        category = self.request.query_params.get('category')
+        if category and category.isdigit():
+            quizzes = quizzes.filter(category_id=category)
+        status = self.request.query_params.get('status')
+        if status:
+            quizzes = quizzes.filter(status=status)
+        return quizzes
+
+
+class QuestionViewSet(ConditionalReadOnlyViewSet):
+    serializer_class = QuestionSerializer
+    # A quiz going on hold hides its questions, so quiz changes count too
+    versioned_by = ('questions', 'quizzes')
+
+    def get_queryset(self):
+        # Like the quiz pages, only active quizzes hand out their questions
+        questions = Question.objects.filter(quiz__status='active').prefetch_related('options')
+        quiz = self.request.query_params.get('quiz')
+        if quiz and quiz.isdigit():
+            questions = questions.filter(quiz_id=quiz)
+        return questions
+
+
+class BlogViewSet(ConditionalReadOnlyViewSet):
+    queryset = Blog.objects.select_related('author').prefetch_related('tags')
+    pagination_class = NewestCursorPagination
+    versioned_by = ('blogs', 'reactions', 'comments')
+
+    def get_serializer_class(self):
+        return BlogDetailSerializer if self.action == 'retrieve' else BlogSerializer
+
+    def get_queryset(self):
+        blogs = super().get_queryset()
+        tag = self.request.query_params.get('tag')
+        if tag:
+            blogs = blogs.filter(tags__name=tag)
+        return blogs
+
+
+class TagViewSet(ConditionalReadOnlyViewSet):
+    queryset = Tag.objects.annotate(blog_count=Count('blogs')).order_by('id')
+    serializer_class = TagSerializer
+    versioned_by = ('tags',)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Quiz, Question, Option, Attempt, Answer, Blog, Tag
+from .models import Category, Quiz, Question, Option, Attempt, Answer, Blog, Tag, OutboundEmail
 from django.contrib.auth.models import User
 
 class OptionInline(admin.TabularInline):
@@ -34,6 +34,12 @@ class BlogAdmin(admin.ModelAdmin):
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name',)
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'kind', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('subject', 'recipients')
+
 
 
 admin.site.register(Category)
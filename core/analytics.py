@@ -0,0 +1,223 @@
+"""
+Incremental rollups behind the admin dashboard.
+
+Creating or deleting an Attempt adjusts its quiz's QuizDailyStats row and the
+'attempts' StatCounter with F() updates; User and Quiz signals keep the
+'users' and 'quizzes' counters. Deleting a user takes all of their attempts
+out of the rollups up front, once per (quiz, day), because by the time the
+cascade sends each attempt's post_delete the user's other attempts are gone.
+Bulk writes skip signals, so bulk importers call ``bump_counter`` themselves
+and ``manage.py backfill_rollups`` rebuilds everything from history.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Attempt, Quiz, QuizDailyStats, StatCounter
+
+COUNTERS = ('users', 'quizzes', 'attempts')
+
+# Users being deleted whose attempts forget_user_stats already took out of the
+# rollups, so the attempts' own post_delete must not count them a second time.
+_settled_user_ids = set()
+
+
+def bump_counter(name, delta=1):
+    if not delta:
+        return
+    if not StatCounter.objects.filter(name=name).update(value=F('value') + delta):
+        StatCounter.objects.get_or_create(name=name)
+        StatCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def counter_values():
+    values = dict.fromkeys(COUNTERS, 0)
+    values.update(StatCounter.objects.filter(name__in=COUNTERS).values_list('name', 'value'))
+    return values
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def attempt_day(attempt):
+    return timezone.localdate(attempt.completed_at)
+
+
+def user_has_other_attempts(attempt, day):
+    start, end = day_bounds(day)
+    return Attempt.objects.filter(
+        user_id=attempt.user_id, quiz_id=attempt.quiz_id, completed_at__gte=start, completed_at__lt=end,
+    ).exclude(pk=attempt.pk).exists()
+
+
+def shifted(field, delta):
+    # A decrement is floored at 0: counts that drifted low must not trip the CHECK constraints
+    return F(field) + delta if delta >= 0 else Greatest(F(field) + delta, 0)
+
+
+def is_perfect(attempt):
+    return attempt.total > 0 and attempt.score >= attempt.total
+
+
+def update_daily_stats(attempt, sign):
+    day = attempt_day(attempt)
+    changes = dict(
+        attempt_count=shifted('attempt_count', sign),
+        score_sum=shifted('score_sum', sign * attempt.score),
+        perfect_count=shifted('perfect_count', sign if is_perfect(attempt) else 0),
+        unique_users=shifted('unique_users', 0 if user_has_other_attempts(attempt, day) else sign),
+    )
+    if not QuizDailyStats.objects.filter(quiz_id=attempt.quiz_id, date=day).update(**changes) and sign > 0:
+        QuizDailyStats.objects.get_or_create(quiz_id=attempt.quiz_id, date=day)
+        QuizDailyStats.objects.filter(quiz_id=attempt.quiz_id, date=day).update(**changes)
+
+
+def record_attempt_stats(attempt):
+    # savepoint=False: this usually runs inside the caller's transaction already
+    with transaction.atomic(savepoint=False):
+        update_daily_stats(attempt, 1)
+        bump_counter('attempts')
+
+
+def forget_attempt_stats(attempt):
+    with transaction.atomic(savepoint=False):
+        update_daily_stats(attempt, -1)
+        bump_counter('attempts', -1)
+
+
+def forget_user_stats(user):
+    """Take all of ``user``'s attempts out of the rollups, as one user per (quiz, day)."""
+    rows = (
+        Attempt.objects.filter(user=user).annotate(date=TruncDate('completed_at'))
+        .values('quiz_id', 'date')
+        .annotate(
+            attempt_count=Count('id'),
+            score_sum=Sum('score'),
+            perfect_count=Count('id', filter=Q(total__gt=0, score__gte=F('total'))),
+        )
+        .order_by()
+    )
+    with transaction.atomic(savepoint=False):
+        rows = list(rows)
+        for row in rows:
+            QuizDailyStats.objects.filter(quiz_id=row['quiz_id'], date=row['date']).update(
+                attempt_count=shifted('attempt_count', -row['attempt_count']),
+                score_sum=shifted('score_sum', -row['score_sum']),
+                perfect_count=shifted('perfect_count', -row['perfect_count']),
+                unique_users=shifted('unique_users', -1),
+            )
+        bump_counter('attempts', -sum(row['attempt_count'] for row in rows))
+    _settled_user_ids.add(user.pk)
+
+
+def rebuild_rollups():
+    """Recompute every rollup from the raw tables. Returns the number of daily rows written."""
+    rows = (
+        Attempt.objects.annotate(date=TruncDate('completed_at'))
+        .values('quiz_id', 'date')
+        .annotate(
+            attempt_count=Count('id'),
+            score_sum=Sum('score'),
+            perfect_count=Count('id', filter=Q(total__gt=0, score__gte=F('total'))),
+            unique_users=Count('user_id', distinct=True),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        QuizDailyStats.objects.all().delete()
+        stats = QuizDailyStats.objects.bulk_create([QuizDailyStats(**row) for row in rows], batch_size=500)
+        totals = {
+            'users': User.objects.count(),
+            'quizzes': Quiz.objects.count(),
+            'attempts': Attempt.objects.count(),
+        }
+        for name, value in totals.items():
+            StatCounter.objects.update_or_create(name=name, defaults={'value': value})
+    return len(stats)
+
+
+def top_quizzes(limit=5):
+    return list(
+        QuizDailyStats.objects.values('quiz_id', 'quiz__title')
+        .annotate(attempts=Sum('attempt_count'))
+        .filter(attempts__gt=0)
+        .order_by('-attempts')[:limit]
+    )
+
+
+def daily_series(days):
+    """One entry per day for the last ``days`` days (oldest first), zero-filled."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    by_date = {
+        row['date']: row
+        for row in QuizDailyStats.objects.filter(date__gte=start).values('date').annotate(
+            attempts=Sum('attempt_count'),
+            score_sum=Sum('score_sum'),
+            perfect=Sum('perfect_count'),
+            takers=Sum('unique_users'),
+        ).order_by()
+    }
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = by_date.get(day, {})
+        attempts = row.get('attempts') or 0
+        series.append({
+            'date': day,
+            'attempts': attempts,
+            'average_score': round((row.get('score_sum') or 0) / attempts, 2) if attempts else 0,
+            'perfect': row.get('perfect') or 0,
+            'takers': row.get('takers') or 0,
+        })
+    return series
+
+
+@receiver(post_save, sender=Attempt)
+def record_attempt_on_create(sender, instance, created, **kwargs):
+    if created:
+        record_attempt_stats(instance)
+
+
+@receiver(post_delete, sender=Attempt)
+def forget_attempt_on_delete(sender, instance, **kwargs):
+    if instance.user_id not in _settled_user_ids:
+        forget_attempt_stats(instance)
+
+
+@receiver(post_save, sender=User)
+def count_user_on_create(sender, instance, created, **kwargs):
+    if created:
+        bump_counter('users')
+
+
+@receiver(pre_delete, sender=User)
+def forget_user_on_delete(sender, instance, **kwargs):
+    # Runs before the cascade deletes the user's attempts
+    forget_user_stats(instance)
+
+
+@receiver(post_delete, sender=User)
+def count_user_on_delete(sender, instance, **kwargs):
+    # The cascade has sent every attempt's post_delete by now
+    _settled_user_ids.discard(instance.pk)
+    bump_counter('users', -1)
+
+
+@receiver(post_save, sender=Quiz)
+def count_quiz_on_create(sender, instance, created, **kwargs):
+    if created:
+        bump_counter('quizzes')
+
+
+@receiver(post_delete, sender=Quiz)
+def count_quiz_on_delete(sender, instance, **kwargs):
+    bump_counter('quizzes', -1)
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Register the cache invalidation, search index, analytics, leaderboard, DB tuning,
+        # content version, image variant, related blog, comment and reaction counter receivers.
+        from . import (  # noqa: F401
+            analytics, comments, db, fragments, images, leaderboards, quiz_cache, reactions, related, search,
+            versions,
+        )
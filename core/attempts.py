@@ -0,0 +1,56 @@
+from django.db import transaction
+
+from .models import Attempt, Answer, Option
+from .quiz_cache import draw_question_ids
+
+
+def clean_answers(answers):
+    # Session/POST data arrives as {"<question_id>": <option_id>}; drop anything malformed.
+    cleaned = {}
+    for qid, oid in answers.items():
+        try:
+            cleaned[int(qid)] = int(oid)
+        except (TypeError, ValueError):
+            continue
+    return cleaned
+
+
+def record_attempt(user, quiz, answers, seed=None):
+    """
+    Grade ``answers`` ({question_id: option_id}) against ``quiz`` (a quiz
+    snapshot) and persist the Attempt with all of its Answers in one transaction.
+    Only questions in the attempt's draw (see ``draw_question_ids``) count.
+    """
+    question_ids = draw_question_ids(quiz, seed)
+    drawn = set(question_ids)
+    answers = {qid: oid for qid, oid in clean_answers(answers).items() if qid in drawn}
+
+    # savepoint=False: quiz_result and attempt_quiz_all call this inside their own transaction
+    with transaction.atomic(savepoint=False):
+        # One batched lookup validates every selected option against the live rows.
+        option_rows = Option.objects.filter(
+            id__in=set(answers.values()),
+            question__quiz_id=quiz.id,
+        ).values_list('id', 'question_id', 'is_correct')
+        options = {oid: (qid, is_correct) for oid, qid, is_correct in option_rows}
+
+        graded = [
+            (qid, oid, options[oid][1])
+            for qid, oid in answers.items()
+            if oid in options and options[oid][0] == qid
+        ]
+
+        attempt = Attempt.objects.create(
+            user=user,
+            quiz_id=quiz.id,
+            score=sum(1 for _, _, is_correct in graded if is_correct),
+            total=len(question_ids),
+            seed=seed,
+            question_order=','.join(map(str, question_ids)),
+        )
+        Answer.objects.bulk_create([
+            Answer(attempt=attempt, question_id=qid, selected_option_id=oid)
+            for qid, oid, _ in graded
+        ])
+
+    return attempt
@@ -0,0 +1,350 @@
+"""
+Per-view query-budget and latency benchmarks.
+
+``seed_dataset`` fills a throwaway database with a realistic amount of content,
+then ``run_benchmarks`` requests every view routed to ``core.views`` or
+``api.views`` and records query count, wall time and response size. Each
+view needs an entry in ``VIEW_SPECS`` saying how to call it and how many
+queries it may run; a routed view without one is reported as a violation,
+so new views cannot slip in unmeasured. Run it through ``manage.py benchmark_views``; ``manage.py test``
+also holds every view to its budget (core/tests/test_budgets.py).
+"""
+import io
+import itertools
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from .models import Answer, Attempt, Blog, BlogReaction, Category, Comment, Option, Question, Quiz, Tag
+from .analytics import rebuild_rollups
+from .search import rebuild_index
+from .leaderboards import rebuild_leaderboards
+from .related import rebuild_related_blogs
+
+# Rows created by seed_dataset() at scale=1; the *_per_* sizes do not scale.
+DATASET_SIZES = {
+    'users': 200,
+    'categories': 12,
+    'quizzes': 60,
+    'tags': 30,
+    'blogs': 150,
+}
+QUESTIONS_PER_QUIZ = 20
+TAGS_PER_BLOG = 3
+COMMENTS_PER_BLOG = 10
+REACTIONS_PER_BLOG = 20
+ATTEMPTS_PER_USER = 5
+
+_unique = itertools.count()
+
+
+class Dataset:
+    """Seeded rows the view specs build their URLs from."""
+
+    def __init__(self, **rows):
+        self.__dict__.update(rows)
+
+
+def seed_dataset(scale=1.0):
+    sizes = {name: max(1, int(count * scale)) for name, count in DATASET_SIZES.items()}
+    password = make_password('benchmark')
+    now = timezone.now()
+
+    staff = User.objects.create(username='bench_staff', email='staff@example.com', password=password,
+                                is_staff=True, is_superuser=True)
+    User.objects.bulk_create([
+        User(username=f'bench_user_{i}', email=f'user{i}@example.com', password=password)
+        for i in range(sizes['users'])
+    ])
+    users = list(User.objects.filter(is_staff=False).order_by('id'))
+
+    Category.objects.bulk_create([
+        Category(name=f'Category {i}', description=f'About category {i}') for i in range(sizes['categories'])
+    ])
+    categories = list(Category.objects.order_by('id'))
+
+    Quiz.objects.bulk_create([
+        Quiz(title=f'Quiz {i}', category=categories[i % len(categories)],
+             description=f'Practice questions on topic {i}', status='hold' if i % 5 == 4 else 'active')
+        for i in range(sizes['quizzes'])
+    ])
+    quizzes = list(Quiz.objects.order_by('id'))
+    active_quizzes = [quiz for quiz in quizzes if quiz.status == 'active']
+
+    Question.objects.bulk_create([
+        Question(quiz=quiz, text=f'{quiz.title}: question {n}?')
+        for quiz in quizzes for n in range(QUESTIONS_PER_QUIZ)
+    ])
+    questions = list(Question.objects.order_by('id'))
+    Option.objects.bulk_create([
+        Option(question=question, text=f'Option {n}', is_correct=(n == question.id % 4))
+        for question in questions for n in range(4)
+    ])
+
+    Tag.objects.bulk_create([Tag(name=f'tag{i}') for i in range(sizes['tags'])])
+    tags = list(Tag.objects.order_by('id'))
+
+    paragraph = '<p>' + ' '.join(['Lorem ipsum dolor sit amet, consectetur adipiscing elit.'] * 20) + '</p>'
+    Blog.objects.bulk_create([
+        Blog(title=f'Blog post {i}', summary=f'Summary of blog post {i}', content=paragraph * 5,
+             author=users[i % len(users)] if i % 3 else staff, created_at=now - timedelta(hours=i))
+        for i in range(sizes['blogs'])
+    ])
+    blogs = list(Blog.objects.order_by('id'))
+    Blog.tags.through.objects.bulk_create([
+        Blog.tags.through(blog_id=blog.id, tag_id=tags[(blog.id + n) % len(tags)].id)
+        for blog in blogs for n in range(min(TAGS_PER_BLOG, len(tags)))
+    ])
+    Comment.objects.bulk_create([
+        Comment(blog=blog, user=users[(blog.id + n) % len(users)], content=f'Comment {n} on {blog.title}')
+        for blog in blogs for n in range(COMMENTS_PER_BLOG)
+    ])
+    BlogReaction.objects.bulk_create([
+        BlogReaction(blog=blog, user=users[(blog.id + n) % len(users)], is_like=bool(n % 3))
+        for blog in blogs for n in range(min(REACTIONS_PER_BLOG, len(users)))
+    ])
+
+    Attempt.objects.bulk_create([
+        Attempt(user=user, quiz=active_quizzes[(user.id + n) % len(active_quizzes)],
+                score=(user.id + n) % (QUESTIONS_PER_QUIZ + 1), total=QUESTIONS_PER_QUIZ)
+        for user in users for n in range(ATTEMPTS_PER_USER)
+    ])
+    options = {}
+    for option in Option.objects.filter(is_correct=True):
+        options.setdefault(option.question_id, option.id)
+    Answer.objects.bulk_create([
+        Answer(attempt=attempt, question_id=question_id, selected_option_id=options[question_id])
+        for attempt in Attempt.objects.filter(user=users[0])
+        for question_id in attempt.quiz.question_set.values_list('id', flat=True)
+    ])
+
+    # bulk_create() skips signals: bring derived data up to date.
+    call_command('repair_blog_counters', stdout=io.StringIO())
+    rebuild_index()
+    rebuild_rollups()
+    rebuild_leaderboards()
+    rebuild_related_blogs()
+    cache.clear()
+
+    return Dataset(
+        staff=staff,
+        user=users[0],
+        category=categories[0],
+        quiz=active_quizzes[0],
+        question=questions[0],
+        blog=blogs[0],
+        tag=tags[0],
+        counts={
+            'users': len(users) + 1,
+            'categories': len(categories),
+            'quizzes': len(quizzes),
+            'questions': len(questions),
+            'tags': len(tags),
+            'blogs': len(blogs),
+            'comments': Comment.objects.count(),
+            'reactions': BlogReaction.objects.count(),
+            'attempts': Attempt.objects.count(),
+            'answers': Answer.objects.count(),
+        },
+    )
+
+
+class ViewSpec:
+    """
+    How to benchmark one URL name. ``kwargs``/``data`` are callables taking
+    the Dataset (called before every request, outside the measured window);
+    ``prepare`` is called with (client, dataset) before every request, also
+    unmeasured, to set up session state.
+    """
+
+    def __init__(self, budget, role='anonymous', method='get', kwargs=None, data=None, query='', prepare=None):
+        self.budget = budget
+        self.role = role
+        self.method = method
+        self.kwargs = kwargs or (lambda d: {})
+        self.data = data or (lambda d: {})
+        self.query = query
+        self.prepare = prepare
+
+
+def _start_quiz(client, d):
+    client.get(reverse('start_quiz', kwargs={'quiz_id': d.quiz.id}))
+
+
+def _disposable_user(d):
+    return {'user_id': User.objects.create(username=f'bench_disposable_{next(_unique)}').id}
+
+
+def _disposable_quiz(d):
+    return {'quiz_id': Quiz.objects.create(title=f'Disposable {next(_unique)}', category=d.category).id}
+
+
+def _disposable_blog(d):
+    return {'blog_id': Blog.objects.create(title=f'Disposable {next(_unique)}', summary='s', content='c', author=d.staff).id}
+
+
+# Budgets are for the cold (empty cache) request and include session and auth queries.
+# The conditional pages (core.conditional) spend one of them on their validators.
+VIEW_SPECS = {
+    'home': ViewSpec(3),
+    'register': ViewSpec(0),
+    'login': ViewSpec(0),
+    'logout': ViewSpec(4, role='user'),
+    'category_quizzes': ViewSpec(1, kwargs=lambda d: {'category_id': d.category.id}),
+    'start_quiz': ViewSpec(8, role='user', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    'attempt_quiz': ViewSpec(3, role='user', kwargs=lambda d: {'quiz_id': d.quiz.id}, prepare=_start_quiz),
+    'attempt_quiz_all': ViewSpec(6, role='user', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    # A user's first attempt on a quiz also creates their leaderboard entries; later ones add one query.
+    'quiz_result': ViewSpec(20, role='user', kwargs=lambda d: {'quiz_id': d.quiz.id}, prepare=_start_quiz),
+    'my_attempts': ViewSpec(3, role='user'),
+    'leaderboard': ViewSpec(5, role='user'),
+    'quiz_leaderboard': ViewSpec(6, role='user', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    'admin_dashboard': ViewSpec(5, role='staff'),
+    'admin_manage_users': ViewSpec(3, role='staff'),
+    'admin_add_user': ViewSpec(2, role='staff'),
+    'edit_user': ViewSpec(3, role='staff', kwargs=lambda d: {'user_id': d.user.id}),
+    'upload_users_csv': ViewSpec(2, role='staff'),
+    'delete_user': ViewSpec(18, role='staff', kwargs=_disposable_user),
+    'admin_manage_quizzes': ViewSpec(4, role='staff'),
+    'admin_add_quiz': ViewSpec(3, role='staff'),
+    'admin_edit_quiz': ViewSpec(5, role='staff', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    'upload_quizzes_csv': ViewSpec(2, role='staff'),
+    'admin_add_question': ViewSpec(3, role='staff', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    'admin_item_analysis': ViewSpec(6, role='staff', kwargs=lambda d: {'quiz_id': d.quiz.id}),
+    'admin_delete_quiz': ViewSpec(19, role='staff', kwargs=_disposable_quiz),
+    'upload_mcq_csv': ViewSpec(2, role='staff'),
+    'quiz_list': ViewSpec(2),
+    'blog_list': ViewSpec(3),
+    'blog_detail': ViewSpec(6, kwargs=lambda d: {'blog_id': d.blog.id}),
+    'blog_comments': ViewSpec(3, kwargs=lambda d: {'blog_id': d.blog.id}, query='format=json'),
+    'about': ViewSpec(0),
+    'contact': ViewSpec(0),
+    'course': ViewSpec(0),
+    'category_list': ViewSpec(1),
+    'blogs_by_tag': ViewSpec(3, kwargs=lambda d: {'tag_name': d.tag.name}),
+    'submit_blog': ViewSpec(5, role='user'),
+    'blog_react': ViewSpec(9, role='user', kwargs=lambda d: {'blog_id': d.blog.id, 'reaction_type': 'like'}),
+    'admin_blogs': ViewSpec(3, role='staff'),
+    'add_blog': ViewSpec(5, role='staff'),
+    'edit_blog': ViewSpec(7, role='staff', kwargs=lambda d: {'blog_id': d.blog.id}),
+    'delete_blog': ViewSpec(14, role='staff', kwargs=_disposable_blog),
+    'search': ViewSpec(5, query='q=post'),
+    # api.views: anonymous reads, answered from a cold cache
+    'category-list': ViewSpec(2),
+    'category-detail': ViewSpec(2, kwargs=lambda d: {'pk': d.category.id}),
+    'quiz-list': ViewSpec(2),
+    'quiz-detail': ViewSpec(2, kwargs=lambda d: {'pk': d.quiz.id}),
+    'question-list': ViewSpec(3),
+    'question-detail': ViewSpec(3, kwargs=lambda d: {'pk': d.question.id}),
+    'blog-list': ViewSpec(3),
+    'blog-detail': ViewSpec(3, kwargs=lambda d: {'pk': d.blog.id}),
+    'tag-list': ViewSpec(2),
+    'tag-detail': ViewSpec(2, kwargs=lambda d: {'pk': d.tag.id}),
+}
+
+BENCHMARKED_VIEW_MODULES = ('core.views', 'api.views')
+
+
+def routed_view_names(resolver=None):
+    """Names of every URL pattern whose view lives in one of BENCHMARKED_VIEW_MODULES."""
+    names = []
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            names.extend(name for name in routed_view_names(pattern) if name not in names)
+        elif (isinstance(pattern, URLPattern) and pattern.name and pattern.name not in names
+              and pattern.callback.__module__ in BENCHMARKED_VIEW_MODULES):
+            names.append(pattern.name)
+    return names
+
+
+def client_for(role, dataset):
+    client = Client()
+    if role == 'user':
+        client.force_login(dataset.user)
+    elif role == 'staff':
+        client.force_login(dataset.staff)
+    return client
+
+
+def benchmark_view(name, spec, dataset, repeat):
+    client = client_for(spec.role, dataset)
+    queries, timings, sizes, statuses = [], [], [], []
+    url = None
+    cache.clear()
+    for _ in range(repeat):
+        if spec.prepare:
+            spec.prepare(client, dataset)
+        url = reverse(name, kwargs=spec.kwargs(dataset))
+        if spec.query:
+            url = f'{url}?{spec.query}'
+        data = spec.data(dataset)
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = getattr(client, spec.method)(url, data) if data else getattr(client, spec.method)(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context.captured_queries))
+        sizes.append(len(response.content) if not response.streaming else 0)
+        statuses.append(response.status_code)
+
+    return {
+        'url': url,
+        'method': spec.method.upper(),
+        'role': spec.role,
+        'status': statuses[0],
+        'queries': max(queries),
+        'cold_queries': queries[0],
+        'warm_queries': queries[-1],
+        'budget': spec.budget,
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'bytes': sizes[0],
+    }
+
+
+def run_benchmarks(dataset, repeat=5, names=None):
+    """Return (results, violations); results maps URL name to its measurements."""
+    results = {}
+    violations = []
+    for name in names or routed_view_names():
+        spec = VIEW_SPECS.get(name)
+        if spec is None:
+            violations.append(f"{name}: no benchmark spec (add one to core.benchmarks.VIEW_SPECS)")
+            continue
+        try:
+            # Queries on other threads' connections would not be captured, so count them all here
+            with override_settings(CONCURRENT_READS=False):
+                result = benchmark_view(name, spec, dataset, repeat)
+        except Exception as exc:
+            violations.append(f"{name}: raised {exc.__class__.__name__}: {exc}")
+            continue
+        results[name] = result
+        if result['status'] >= 500:
+            violations.append(f"{name}: HTTP {result['status']}")
+        if result['queries'] > spec.budget:
+            violations.append(f"{name}: {result['queries']} queries, budget {spec.budget}")
+    return results, violations
+
+
+def compare_with_baseline(results, baseline, time_tolerance):
+    """Return (query_regressions, slowdowns) against an earlier run's JSON output."""
+    query_regressions = []
+    slowdowns = []
+    for name, result in results.items():
+        previous = baseline.get('views', {}).get(name)
+        if previous is None:
+            continue
+        if result['queries'] > previous['queries']:
+            query_regressions.append(f"{name}: {previous['queries']} -> {result['queries']} queries")
+        if previous['median_ms'] and result['median_ms'] > previous['median_ms'] * time_tolerance:
+            slowdowns.append(f"{name}: {previous['median_ms']}ms -> {result['median_ms']}ms median")
+    return query_regressions, slowdowns
@@ -0,0 +1,50 @@
+"""
+Paginated comment threads and the Blog.comment_count counter.
+
+A thread is read COMMENTS_PER_PAGE comments at a time, newest first, with
+keyset pagination over (created_at, id) (see core/pagination.py). Each
+page is one query that also loads the commenters' users. blog_detail
+renders the first page. ``blog_comments`` serves the following pages as an
+HTML fragment for the "Older comments" link, or as JSON with
+``?format=json``.
+
+Blog.comment_count is adjusted with an UPDATE ... SET comment_count =
+comment_count +/- 1 whenever a comment is created or deleted, so list
+views can show it without counting comments. Bulk writes skip signals, and
+``manage.py repair_blog_counters`` recomputes the counter.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Blog, Comment
+from .pagination import paginate_keyset
+
+COMMENTS_PER_PAGE = 20
+
+
+def comment_page(request, blog_id):
+    """One KeysetPage of ``blog_id``'s comments, newest first, read from ``?after=``/``?before=``."""
+    comments = Comment.objects.filter(blog_id=blog_id).select_related('user')
+    return paginate_keyset(request, comments, ('-created_at', '-id'), COMMENTS_PER_PAGE)
+
+
+def comment_json(comment):
+    return {
+        'id': comment.id,
+        'user': comment.user.username,
+        'content': comment.content,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        Blog.objects.filter(pk=instance.blog_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    # The filter keeps a counter that drifted to 0 from going negative
+    Blog.objects.filter(pk=instance.blog_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
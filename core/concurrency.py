@@ -0,0 +1,52 @@
+"""
+Run a view's independent reads at the same time.
+
+Django 3.0 serves ASGI, but it cannot run ``async def`` views (that arrived
+in 3.1). Under ASGI every view still runs as sync code in a worker thread.
+So the read-heavy views pass their independent queries to ``gather``
+instead. ``gather`` runs each callable on a shared thread pool, and each
+pool thread uses its own database connection. The request then waits for
+the slowest query, not the sum of all of them.
+
+This only happens when settings.CONCURRENT_READS is on. quiz_project/asgi.py
+turns it on, so WSGI deployments and the test client keep running queries
+one after another. Callables must return evaluated data (lists, not lazy
+querysets), or the query would still run later on the request thread.
+Compare the two serving modes with ``manage.py benchmark_serving``.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+DEFAULT_WORKERS = 4
+
+_executor = None
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'CONCURRENT_READ_WORKERS', DEFAULT_WORKERS),
+            thread_name_prefix='concurrent-reads',
+        )
+    return _executor
+
+
+def _run(call):
+    try:
+        return call()
+    finally:
+        # Pool threads never see request_finished: apply CONN_MAX_AGE here instead
+        close_old_connections()
+
+
+def gather(*calls):
+    """Call each zero-argument callable and return their results in order."""
+    # Other connections cannot see an open transaction's writes, so stay on this one
+    if not getattr(settings, 'CONCURRENT_READS', False) or len(calls) < 2 or connection.in_atomic_block:
+        return [call() for call in calls]
+    futures = [executor().submit(_run, call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
@@ -0,0 +1,115 @@
+"""
+Conditional GET for the public HTML pages.
+
+``conditional_page`` wraps a view with a validators function. That function
+returns (last_modified, etag_stamp, etag_parts) from a single indexed query,
+or None to skip the check. The decorator answers
+If-None-Match/If-Modified-Since with 304 before the view runs. An unchanged
+page therefore costs the validator query: no page queries and no template
+rendering.
+
+The navbar and the comment form depend on the visitor, so the ETag also
+hashes the session and CSRF cookies. Responses are marked
+``private, no-cache``, which means browsers keep them and revalidate every
+time. Changes that no signal reports are not covered, as with the home page
+fragments. An example is an author renaming their account.
+
+A request with flash messages waiting is never answered with 304, since
+that would use the messages up without showing them. The page is rendered
+and marked uncacheable instead.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import OuterRef, Subquery
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import Blog, Comment, ContentVersion
+from .versions import changed_at, etag_for
+
+
+def visitor(request):
+    return (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ''),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    )
+
+
+def has_pending_messages(request):
+    # len() loads the stored messages without marking them used. With the
+    # default storage and no messages cookie this reads nothing.
+    return bool(len(get_messages(request)))
+
+
+def conditional_page(validators):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            if has_pending_messages(request):
+                response = view(request, *args, **kwargs)
+                add_never_cache_headers(response)
+                return response
+            found = validators(*args, **kwargs)
+            if found is None:
+                return view(request, *args, **kwargs)
+            last_modified, etag_stamp, parts = found
+            etag = etag_for(etag_stamp, request.get_full_path(), *parts, *visitor(request))
+            timestamp = int(last_modified.timestamp())
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(timestamp)
+                patch_cache_control(response, private=True, no_cache=True)
+                patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
+
+
+def versioned_by(*groups):
+    """Validators for a page that only changes when one of the core.versions ``groups`` does."""
+    def validators(*args, **kwargs):
+        stamp = changed_at(*groups)
+        return stamp, stamp, ()
+    return validators
+
+
+def latest_stamp(*groups):
+    return Subquery(
+        ContentVersion.objects.filter(name__in=groups).order_by('-changed_at').values('changed_at')[:1]
+    )
+
+
+def blog_page_validators(blog_id):
+    """
+    One blog's own timestamp, counters and latest comment, plus the
+    'blogs'/'tags' stamps for the tag badges and related posts. Reactions and
+    comment deletions only change counts, so Last-Modified also takes the
+    'reactions' and 'comments' stamps. That keeps If-Modified-Since alone
+    safe. The ETag stays specific to this blog.
+    """
+    # The counters are Blog columns and the latest comment is one step into the
+    # (blog, created_at, id) index, so the cost does not grow with the thread
+    row = Blog.objects.filter(pk=blog_id).annotate(
+        last_comment=Subquery(
+            Comment.objects.filter(blog=OuterRef('pk')).order_by('-created_at', '-id').values('created_at')[:1]
+        ),
+        content_changed=latest_stamp('blogs', 'tags'),
+        activity_changed=latest_stamp('comments', 'reactions'),
+    ).values_list(
+        'updated_at', 'like_count', 'dislike_count', 'last_comment', 'comment_count',
+        'content_changed', 'activity_changed',
+    ).first()
+    if row is None:
+        return None  # let the view answer 404
+    updated_at, likes, dislikes, last_comment, comments, content_changed, activity_changed = row
+    etag_stamp = max(stamp for stamp in (updated_at, last_comment, content_changed) if stamp)
+    return max(etag_stamp, activity_changed or etag_stamp), etag_stamp, (likes, dislikes, comments)
+
@@ -0,0 +1,35 @@
+"""
+Per-connection database tuning driven by settings (see quiz_project/settings_production.py).
+
+Django 3.0 has neither an SQLite ``init_command`` nor ``CONN_HEALTH_CHECKS``,
+so both are done with signals here:
+
+- SQLITE_PRAGMAS (dict) is applied to every new SQLite connection.
+- DB_HEALTH_CHECKS pings persistent connections (CONN_MAX_AGE > 0) when a
+  request starts and drops any that went away, instead of failing the
+  request's first query.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    for name, value in pragmas.items():
+        # Straight on the DB-API connection so the statements stay out of connection.queries
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    if not getattr(settings, 'DB_HEALTH_CHECKS', False):
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
@@ -0,0 +1,123 @@
+"""
+Cached HTML fragments for the home page.
+
+Each fragment is stored as ``(generation, fresh_until, html)``. Invalidation
+bumps the fragment's generation; ``FRAGMENT_TIMEOUT`` covers changes no signal
+reports (e.g. an author renaming their account). Either way the old HTML stays
+in the cache as a stale copy, so while one request rebuilds the fragment under
+a short lock, concurrent requests serve the stale copy instead of rebuilding.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from .images import attach_variants
+from .models import Blog, Category, ProcessedImage, Tag
+
+FRAGMENT_TIMEOUT = 60 * 10
+STALE_TIMEOUT = 60 * 60 * 24
+LOCK_TIMEOUT = 30
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+
+HOME_CATEGORIES = 'home_categories'
+HOME_BLOGS = 'home_blogs'
+
+
+def generation_key(name):
+    return f'fragment:{name}:generation'
+
+
+def value_key(name):
+    return f'fragment:{name}:html'
+
+
+def lock_key(name):
+    return f'fragment:{name}:lock'
+
+
+def invalidate_fragment(name):
+    key = generation_key(name)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr().
+            cache.set(key, 1, None)
+
+
+def get_fragment(name, build):
+    """Return the cached HTML for ``name``, calling ``build()`` at most once per invalidation."""
+    generation = cache.get(generation_key(name), 0)
+    cached = cache.get(value_key(name))
+    if cached is not None and cached[0] == generation and cached[1] > time.time():
+        return cached[2]
+
+    if cache.add(lock_key(name), 1, LOCK_TIMEOUT):
+        try:
+            html = build()
+            # Stored under the generation read before building: an invalidation
+            # that lands mid-build leaves this copy stale rather than fresh.
+            cache.set(value_key(name), (generation, time.time() + FRAGMENT_TIMEOUT, html), STALE_TIMEOUT)
+            return html
+        finally:
+            cache.delete(lock_key(name))
+
+    # Someone else is rebuilding: serve the stale copy if there is one.
+    if cached is not None:
+        return cached[2]
+
+    # Cold cache: wait briefly for the rebuilding request, then build ourselves.
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        cached = cache.get(value_key(name))
+        if cached is not None:
+            return cached[2]
+    return build()
+
+
+def build_home_categories():
+    categories = Category.objects.all()
+    return render_to_string('core/home_categories.html', {'categories': categories})
+
+
+def build_home_blogs():
+    blogs = list(Blog.objects.select_related('author').prefetch_related('tags').order_by('-created_at')[:6])  # latest 6 blogs
+    attach_variants(blogs)
+    return render_to_string('core/home_blogs.html', {'blogs': blogs})
+
+
+def home_categories_html():
+    return get_fragment(HOME_CATEGORIES, build_home_categories)
+
+
+def home_blogs_html():
+    return get_fragment(HOME_BLOGS, build_home_blogs)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_home_categories(sender, **kwargs):
+    invalidate_fragment(HOME_CATEGORIES)
+
+
+@receiver([post_save, post_delete], sender=Blog)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_home_blogs(sender, **kwargs):
+    invalidate_fragment(HOME_BLOGS)
+
+
+@receiver(post_save, sender=ProcessedImage)
+def invalidate_home_blogs_on_variants(sender, instance, **kwargs):
+    # A blog image finished processing: rebuild so the cards pick up the variants
+    if instance.status == 'ready':
+        invalidate_fragment(HOME_BLOGS)
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def invalidate_home_blogs_on_tags_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_fragment(HOME_BLOGS)
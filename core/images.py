@@ -0,0 +1,186 @@
+"""
+Resized variants of uploaded images, rendered off the request path.
+
+Quiz and blog images and the CKEditor uploads referenced by blog content
+are stored at whatever size they were uploaded. Saving a quiz or blog
+queues its images as pending ProcessedImage rows (one per original).
+``manage.py process_images`` then renders them in a process pool (see
+core/renditions.py) and stores the variant list on the row.
+``manage.py backfill_images`` queues media that was uploaded before this
+existed.
+
+Templates use the ``responsive_images`` tag library. Views call
+``attach_variants`` on the objects they render, so a page costs one query
+for all of its images. An image whose variants are not ready yet is shown
+at its original size. Variants are written to MEDIA_ROOT directly, so this
+needs the default FileSystemStorage.
+"""
+import json
+import os
+import re
+from concurrent.futures import as_completed
+from datetime import timedelta
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Blog, ProcessedImage, Quiz
+from .renditions import VARIANT_DIR, render_variants
+
+DEFAULT_BATCH_SIZE = 20
+CLAIM_SECONDS = 60 * 10
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff')
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_SRC_RE = re.compile(r'\bsrc\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def upload_dir():
+    return getattr(settings, 'CKEDITOR_UPLOAD_PATH', 'uploads/').strip('/') + '/'
+
+
+def media_name(url):
+    """Storage name for a MEDIA_URL link (absolute or not), or None for anything else."""
+    path = unquote(urlsplit(url).path)
+    if not path.startswith(settings.MEDIA_URL):
+        return None
+    return path[len(settings.MEDIA_URL):]
+
+
+def is_original(name):
+    # ckeditor_uploader stores a *_thumb copy next to each upload for its browser
+    base, extension = os.path.splitext(name)
+    return (extension.lower() in IMAGE_EXTENSIONS and not base.endswith('_thumb')
+            and not name.startswith(VARIANT_DIR + '/'))
+
+
+def content_image_names(html):
+    """CKEditor upload names of the images embedded in ``html``."""
+    names = []
+    for tag in IMG_TAG_RE.findall(html or ''):
+        match = IMG_SRC_RE.search(tag)
+        name = match and media_name(match.group(1))
+        if name and name.startswith(upload_dir()) and is_original(name):
+            names.append(name)
+    return names
+
+
+def request_variants(names, reprocess=False):
+    """Queue ``names`` for processing. Images already tracked are left alone unless ``reprocess``."""
+    names = sorted(set(names))
+    if not names:
+        return
+    ProcessedImage.objects.bulk_create([ProcessedImage(name=name) for name in names], ignore_conflicts=True)
+    if reprocess:
+        ProcessedImage.objects.filter(name__in=names).update(status='pending', next_attempt_at=timezone.now())
+
+
+def claim_batch(batch_size):
+    """Mark up to ``batch_size`` due images as taken by this worker and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            ProcessedImage.objects.filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        # As with the email outbox: one conditional UPDATE per row, so a row another
+        # worker claimed first is skipped, and the rows fall due again if this worker dies
+        claimed = [
+            pk for pk in ids
+            if ProcessedImage.objects.filter(pk=pk, status='pending', next_attempt_at__lte=now).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS),
+            )
+        ]
+    return list(ProcessedImage.objects.filter(id__in=claimed).order_by('id'))
+
+
+def finish(image, variants=None, error=''):
+    image.status = 'failed' if error else 'ready'
+    image.variants = json.dumps(variants) if variants else ''
+    image.last_error = error
+    image.processed_at = timezone.now()
+    # save() rather than update(): the page caches listen for ready images
+    image.save(update_fields=['status', 'variants', 'last_error', 'processed_at'])
+
+
+def process_pending(pool, batch_size=DEFAULT_BATCH_SIZE):
+    """Render one batch of pending images on ``pool`` (a ProcessPoolExecutor). Returns (ready, failed)."""
+    futures = {}
+    failed = 0
+    for image in claim_batch(batch_size):
+        try:
+            source = default_storage.path(image.name)
+        except NotImplementedError:
+            finish(image, error="The storage backend has no local files.")
+            failed += 1
+            continue
+        futures[pool.submit(render_variants, source, settings.MEDIA_ROOT, image.name)] = image
+
+    ready = 0
+    for future in as_completed(futures):
+        try:
+            variants = future.result()
+        except Exception as exc:
+            finish(futures[future], error=f"{exc.__class__.__name__}: {exc}")
+            failed += 1
+        else:
+            finish(futures[future], variants)
+            ready += 1
+    return ready, failed
+
+
+def backfill_names():
+    """Every original image in use or uploaded: quiz and blog images plus CKEditor uploads."""
+    names = set(Quiz.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+    names.update(Blog.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+    for content in Blog.objects.values_list('content', flat=True).iterator():
+        names.update(content_image_names(content))
+    root = os.path.join(settings.MEDIA_ROOT, upload_dir())
+    for directory, _, files in os.walk(root):
+        for file_name in files:
+            name = os.path.relpath(os.path.join(directory, file_name), settings.MEDIA_ROOT).replace(os.sep, '/')
+            if is_original(name):
+                names.add(name)
+    return names
+
+
+def variants_for(names):
+    """{name: variant list} for the ready images among ``names``, in one query."""
+    names = set(names)
+    if not names:
+        return {}
+    return {
+        name: json.loads(variants)
+        for name, variants in ProcessedImage.objects.filter(name__in=names, status='ready').values_list(
+            'name', 'variants',
+        )
+    }
+
+
+def attach_variants(objects, field='image'):
+    """Set ``.variants`` on each object's image file for the responsive_image tag. Returns ``objects``."""
+    files = [getattr(obj, field) for obj in objects if getattr(obj, field)]
+    found = variants_for(file.name for file in files)
+    for file in files:
+        file.variants = found.get(file.name)
+    return objects
+
+
+@receiver(post_save, sender=Quiz)
+def queue_quiz_image(sender, instance, **kwargs):
+    if instance.image:
+        request_variants([instance.image.name])
+
+
+@receiver(post_save, sender=Blog)
+def queue_blog_images(sender, instance, **kwargs):
+    names = content_image_names(instance.content)
+    if instance.image:
+        names.append(instance.image.name)
+    request_variants(names)
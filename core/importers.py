@@ -0,0 +1,355 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+
+from .models import Category, Quiz, Question, Option
+from .analytics import bump_counter
+from .quiz_cache import invalidate_quiz_snapshot
+from .search import index_quizzes
+from .versions import touch
+
+DEFAULT_BATCH_SIZE = 500
+# Below this many passwords a process pool costs more than it saves.
+MIN_PARALLEL_HASHES = 32
+# Keeps IN (...) lookups under SQLite's bound-parameter limit.
+IN_LOOKUP_CHUNK_SIZE = 900
+MCQ_OPTION_COLUMNS = ['option1', 'option2', 'option3', 'option4']
+
+
+class ImportReport:
+    """Outcome of one CSV import: rows inserted/updated, plus (line, reason) for every skipped or rejected row."""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = []
+        self.rejected = []
+
+    def skip(self, line_number, reason):
+        self.skipped.append((line_number, reason))
+
+    def reject(self, line_number, reason):
+        self.rejected.append((line_number, reason))
+
+    def summary(self):
+        summary = f"{self.inserted} inserted, {len(self.skipped)} skipped, {len(self.rejected)} rejected"
+        if self.updated:
+            summary = f"{self.updated} updated, " + summary
+        return summary
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def filter_in_chunks(queryset, field, values):
+    values = list(values)
+    for start in range(0, len(values), IN_LOOKUP_CHUNK_SIZE):
+        yield from queryset.filter(**{f'{field}__in': values[start:start + IN_LOOKUP_CHUNK_SIZE]})
+
+
+def bulk_create_returning_ids(model, objs):
+    """
+    bulk_create() that leaves primary keys set on ``objs``. Must run inside a
+    transaction: backends that cannot return ids from a bulk insert (SQLite on
+    this Django version) read back the newest ids, which are ours while the
+    transaction holds the write lock.
+    """
+    model.objects.bulk_create(objs)
+    if objs and objs[0].pk is None and not connection.features.can_return_rows_from_bulk_insert:
+        ids = list(model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objs)])
+        for obj, pk in zip(objs, reversed(ids)):
+            obj.pk = pk
+    return objs
+
+
+def parse_mcq_row(row):
+    """Return (quiz_title, question_text, [(option_text, is_correct), ...]) or raise ValueError."""
+    missing = [column for column in ['quiz_title', 'question', 'correct_option_index'] + MCQ_OPTION_COLUMNS
+               if row.get(column) is None]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+
+    quiz_title = row['quiz_title'].strip()
+    question_text = row['question'].strip()
+    if not quiz_title:
+        raise ValueError("empty quiz_title")
+    if not question_text:
+        raise ValueError("empty question")
+
+    try:
+        correct_index = int(row['correct_option_index'])
+    except ValueError:
+        raise ValueError(f"correct_option_index {row['correct_option_index']!r} is not a number")
+    if not 0 <= correct_index < len(MCQ_OPTION_COLUMNS):
+        raise ValueError(f"correct_option_index {correct_index} is out of range")
+
+    option_texts = [row[column].strip() for column in MCQ_OPTION_COLUMNS]
+    if not all(option_texts):
+        raise ValueError("every option must have text")
+    if any(len(text) > Option._meta.get_field('text').max_length for text in option_texts):
+        raise ValueError("option text is too long")
+
+    options = [(text, idx == correct_index) for idx, text in enumerate(option_texts)]
+    return quiz_title, question_text, options
+
+
+def import_mcq_rows(rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import MCQ rows (dicts with quiz_title, question, option1-4 and
+    correct_option_index). Questions and their options are bulk inserted in
+    ``batch_size`` chunks, one transaction per chunk.
+    """
+    report = ImportReport()
+    quiz_ids = {}  # quiz title -> id (None when no such quiz)
+    touched_quiz_ids = set()
+
+    def parsed_rows():
+        # Line 1 is the CSV header.
+        for line_number, row in enumerate(rows, start=2):
+            try:
+                quiz_title, question_text, options = parse_mcq_row(row)
+            except ValueError as exc:
+                report.reject(line_number, str(exc))
+                continue
+
+            if quiz_title not in quiz_ids:
+                quiz_ids[quiz_title] = Quiz.objects.filter(title=quiz_title).values_list('id', flat=True).first()
+            quiz_id = quiz_ids[quiz_title]
+            if quiz_id is None:
+                report.skip(line_number, f"no quiz titled {quiz_title!r}")
+                continue
+
+            yield quiz_id, question_text, options
+
+    for batch in batched(parsed_rows(), batch_size):
+        with transaction.atomic():
+            questions = bulk_create_returning_ids(Question, [
+                Question(quiz_id=quiz_id, text=question_text) for quiz_id, question_text, _ in batch
+            ])
+            Option.objects.bulk_create([
+                Option(question_id=question.pk, text=text, is_correct=is_correct)
+                for question, (_, _, options) in zip(questions, batch)
+                for text, is_correct in options
+            ])
+        report.inserted += len(batch)
+        touched_quiz_ids.update(quiz_id for quiz_id, _, _ in batch)
+
+    # bulk_create() sends no post_save signals, so drop the cached snapshots here.
+    for quiz_id in touched_quiz_ids:
+        invalidate_quiz_snapshot(quiz_id)
+    if touched_quiz_ids:
+        touch('questions', 'quizzes')
+
+    return report
+
+
+def import_mcq_csv(file_obj, batch_size=DEFAULT_BATCH_SIZE):
+    return import_mcq_rows(csv.DictReader(file_obj), batch_size=batch_size)
+
+
+def parse_user_row(row):
+    """Return (username, email, password) or raise ValueError."""
+    username = (row.get('username') or '').strip()
+    email = (row.get('email') or '').strip()
+    password = row.get('password') or ''
+
+    if not username:
+        raise ValueError("empty username")
+    if not password:
+        raise ValueError("empty password")
+    if len(username) > User._meta.get_field('username').max_length:
+        raise ValueError("username is too long")
+    try:
+        User.username_validator(username)
+        if email:
+            validate_email(email)
+    except ValidationError as exc:
+        raise ValueError("; ".join(exc.messages))
+
+    return username, User.objects.normalize_email(email), password
+
+
+def init_hasher_worker():
+    # Spawned (non-forked) workers start without app registry or settings.
+    django.setup()
+
+
+def hash_passwords(passwords, executor=None, workers=1):
+    if executor is None or len(passwords) < MIN_PARALLEL_HASHES:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_user_rows(rows, batch_size=DEFAULT_BATCH_SIZE, workers=1):
+    """
+    Import user rows (dicts with username, email, password). Existing
+    usernames and emails are loaded in one query, passwords are hashed across
+    a pool of ``workers`` processes and users are bulk inserted per batch.
+    The default of one worker hashes inline: only the management command
+    starts a pool, never a request handled by a (possibly threaded) server.
+    """
+    report = ImportReport()
+
+    seen_usernames = set()
+    seen_emails = set()
+    for username, email in User.objects.values_list('username', 'email').iterator():
+        seen_usernames.add(username)
+        if email:
+            seen_emails.add(email.lower())
+
+    def parsed_rows():
+        for line_number, row in enumerate(rows, start=2):
+            try:
+                username, email, password = parse_user_row(row)
+            except ValueError as exc:
+                report.reject(line_number, str(exc))
+                continue
+
+            if username in seen_usernames:
+                report.skip(line_number, f"username {username!r} already exists")
+                continue
+            if email and email.lower() in seen_emails:
+                report.skip(line_number, f"email {email!r} already exists")
+                continue
+            seen_usernames.add(username)
+            if email:
+                seen_emails.add(email.lower())
+
+            yield username, email, password
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_hasher_worker) if workers > 1 else None
+    try:
+        for batch in batched(parsed_rows(), batch_size):
+            hashed = hash_passwords([password for _, _, password in batch], executor, workers)
+            with transaction.atomic():
+                User.objects.bulk_create([
+                    User(username=username, email=email, password=password_hash)
+                    for (username, email, _), password_hash in zip(batch, hashed)
+                ])
+            bump_counter('users', len(batch))
+            report.inserted += len(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return report
+
+
+def import_users_csv(file_obj, batch_size=DEFAULT_BATCH_SIZE, workers=1):
+    return import_user_rows(csv.DictReader(file_obj), batch_size=batch_size, workers=workers)
+
+
+def parse_quiz_row(row):
+    """Return (title, category_name, status, description) or raise ValueError."""
+    title = (row.get('title') or '').strip()
+    category_name = (row.get('category') or '').strip()
+    status = (row.get('status') or 'active').strip().lower()
+    description = (row.get('description') or '').strip() or None
+
+    if not title:
+        raise ValueError("empty title")
+    if len(title) > Quiz._meta.get_field('title').max_length:
+        raise ValueError("title is too long")
+    if not category_name:
+        raise ValueError("empty category")
+    if len(category_name) > Category._meta.get_field('name').max_length:
+        raise ValueError("category name is too long")
+    if status not in dict(Quiz.STATUS_CHOICES):
+        raise ValueError(f"unknown status {status!r}")
+
+    return title, category_name, status, description
+
+
+def resolve_categories(names):
+    """Map every category name to its id, bulk creating the missing ones."""
+    category_ids = {
+        category.name: category.id
+        for category in filter_in_chunks(Category.objects.only('id', 'name'), 'name', names)
+    }
+    missing = [name for name in names if name not in category_ids]
+    if missing:
+        Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+        category_ids.update(
+            (category.name, category.id)
+            for category in filter_in_chunks(Category.objects.only('id', 'name'), 'name', missing)
+        )
+    return category_ids
+
+
+def import_quiz_rows(rows, batch_size=DEFAULT_BATCH_SIZE, update_existing=False):
+    """
+    Import quiz rows (dicts with title, category and optional status and
+    description). Category names are resolved up front and quizzes are
+    written in batches inside one transaction. With ``update_existing`` a row
+    whose title matches an existing quiz updates it instead of adding a copy.
+    """
+    report = ImportReport()
+
+    parsed = []
+    for line_number, row in enumerate(rows, start=2):
+        try:
+            parsed.append((line_number,) + parse_quiz_row(row))
+        except ValueError as exc:
+            report.reject(line_number, str(exc))
+
+    with transaction.atomic():
+        category_ids = resolve_categories({category_name for _, _, category_name, _, _ in parsed})
+
+        existing = {}
+        if update_existing:
+            for quiz in filter_in_chunks(Quiz.objects.order_by('-id'), 'title', {title for _, title, _, _, _ in parsed}):
+                existing[quiz.title] = quiz  # ordered by -id, so the oldest quiz with a title wins
+
+        to_create = {}  # title -> Quiz; with update_existing repeated titles collapse onto one row
+        to_create_list = []
+        to_update = {}
+        for line_number, title, category_name, status, description in parsed:
+            quiz = existing.get(title) or (to_create.get(title) if update_existing else None)
+            if quiz is None:
+                quiz = Quiz(title=title)
+                to_create[title] = quiz
+                to_create_list.append(quiz)
+            elif quiz.pk is not None:
+                to_update[quiz.pk] = quiz
+            quiz.category_id = category_ids[category_name]
+            quiz.status = status
+            if description is not None:
+                quiz.description = description
+
+        for batch in batched(to_create_list, batch_size):
+            bulk_create_returning_ids(Quiz, batch)
+        for batch in batched(to_update.values(), batch_size):
+            Quiz.objects.bulk_update(batch, ['category', 'status', 'description'])
+
+        # Bulk writes send no post_save signals: keep the search index and totals in step here.
+        index_quizzes([quiz.pk for quiz in to_create_list] + list(to_update))
+        bump_counter('quizzes', len(to_create_list))
+        touch('categories', 'quizzes')
+
+    report.inserted = len(to_create_list)
+    report.updated = len(to_update)
+
+    # ... and drop the cached snapshots of updated quizzes.
+    for quiz_id in to_update:
+        invalidate_quiz_snapshot(quiz_id)
+
+    return report
+
+
+def import_quizzes_csv(file_obj, batch_size=DEFAULT_BATCH_SIZE, update_existing=False):
+    return import_quiz_rows(csv.DictReader(file_obj), batch_size=batch_size, update_existing=update_existing)
@@ -0,0 +1,190 @@
+"""
+Classical item analysis for quiz questions.
+
+Per question we keep additive sums over its responses: count n, correct
+count Sx, and sums of the attempt score Sy, Sy^2 and x*y. Per option we keep
+its selection count. New Answer rows (joined with Attempt.score) are streamed
+in chunks into NumPy arrays and folded into those sums with ``bincount``;
+difficulty, discrimination and distractor rates are then derived for the whole
+quiz at once. QuizItemAnalysis records the last attempt included, so reruns
+only read attempts added since.
+
+Discrimination is the corrected item-total point-biserial correlation, i.e.
+against the score with the item itself removed (y - x), which follows from the
+same sums because x is 0/1.
+"""
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Answer, Attempt, Option, OptionStats, Question, QuestionStats, QuizItemAnalysis
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_CHUNK_SIZE = 50000
+REPORT_CACHE_TIMEOUT = 60 * 60 * 24
+QUESTION_SUMS = ('responses', 'correct', 'score_sum', 'score_sq_sum', 'correct_score_sum')
+
+
+def chunks(iterator, size):
+    chunk = []
+    for row in iterator:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def derive_statistics(sums):
+    """Vectorized difficulty and discrimination from the per-question sum arrays."""
+    n = sums['responses'].astype(np.float64)
+    sx = sums['correct'].astype(np.float64)
+    # Item-removed score y' = y - x; with x in {0, 1}, x^2 == x.
+    sy = sums['score_sum'] - sx
+    syy = sums['score_sq_sum'] - 2 * sums['correct_score_sum'] + sx
+    sxy = sums['correct_score_sum'] - sx
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        difficulty = np.where(n > 0, sx / n, np.nan)
+        denominator = np.sqrt((n * sx - sx ** 2) * (n * syy - sy ** 2))
+        discrimination = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+    return difficulty, discrimination
+
+
+def nullable(values):
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
+
+
+def analyze_quiz(quiz_id, chunk_size=DEFAULT_CHUNK_SIZE, full=False):
+    """Fold attempts newer than the quiz's watermark into its item statistics."""
+    if np is None:
+        raise ImproperlyConfigured("Item analysis requires NumPy (pip install numpy).")
+
+    with transaction.atomic():
+        run, _ = QuizItemAnalysis.objects.select_for_update().get_or_create(quiz_id=quiz_id)
+        if full:
+            run.last_attempt_id = run.attempts_processed = run.answers_processed = 0
+            run.covered_until = None
+
+        new_attempts = Attempt.objects.filter(quiz_id=quiz_id, id__gt=run.last_attempt_id).aggregate(
+            last_id=Max('id'), last_completed=Max('completed_at'), count=Count('id'),
+        )
+
+        question_ids = np.array(sorted(Question.objects.filter(quiz_id=quiz_id).values_list('id', flat=True)), dtype=np.int64)
+        option_rows = sorted(Option.objects.filter(question__quiz_id=quiz_id).values_list('id', 'question_id'))
+        option_ids = np.array([option_id for option_id, _ in option_rows], dtype=np.int64)
+
+        sums = {name: np.zeros(len(question_ids), dtype=np.int64) for name in QUESTION_SUMS}
+        selections = np.zeros(len(option_ids), dtype=np.int64)
+        if not full:
+            for row in QuestionStats.objects.filter(quiz_id=quiz_id).values('question_id', *QUESTION_SUMS):
+                position = np.searchsorted(question_ids, row['question_id'])
+                if position < len(question_ids) and question_ids[position] == row['question_id']:
+                    for name in QUESTION_SUMS:
+                        sums[name][position] = row[name]
+            for option_id, count in OptionStats.objects.filter(question__quiz_id=quiz_id).values_list('option_id', 'selections'):
+                position = np.searchsorted(option_ids, option_id)
+                if position < len(option_ids) and option_ids[position] == option_id:
+                    selections[position] = count
+
+        answers_seen = 0
+        if new_attempts['last_id'] is not None and len(question_ids):
+            rows = Answer.objects.filter(
+                attempt__quiz_id=quiz_id,
+                attempt_id__gt=run.last_attempt_id,
+                attempt_id__lte=new_attempts['last_id'],
+            ).values_list('question_id', 'selected_option_id', 'selected_option__is_correct', 'attempt__score')
+
+            for chunk in chunks(rows.iterator(chunk_size=chunk_size), chunk_size):
+                data = np.array(chunk, dtype=np.int64)
+                answers_seen += len(data)
+
+                q_pos = np.searchsorted(question_ids, data[:, 0]).clip(max=len(question_ids) - 1)
+                known = question_ids[q_pos] == data[:, 0]
+                q_pos, x, y = q_pos[known], data[known, 2], data[known, 3]
+                size = len(question_ids)
+                sums['responses'] += np.bincount(q_pos, minlength=size)
+                sums['correct'] += np.bincount(q_pos, weights=x, minlength=size).astype(np.int64)
+                sums['score_sum'] += np.bincount(q_pos, weights=y, minlength=size).astype(np.int64)
+                sums['score_sq_sum'] += np.bincount(q_pos, weights=y * y, minlength=size).astype(np.int64)
+                sums['correct_score_sum'] += np.bincount(q_pos, weights=x * y, minlength=size).astype(np.int64)
+
+                if len(option_ids):
+                    o_pos = np.searchsorted(option_ids, data[:, 1]).clip(max=len(option_ids) - 1)
+                    o_pos = o_pos[option_ids[o_pos] == data[:, 1]]
+                    selections += np.bincount(o_pos, minlength=len(option_ids))
+
+        difficulty, discrimination = derive_statistics(sums)
+        question_position = {int(qid): position for position, qid in enumerate(question_ids)}
+        responses_by_option = np.array(
+            [sums['responses'][question_position[question_id]] for _, question_id in option_rows], dtype=np.float64,
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            selection_rate = np.where(responses_by_option > 0, selections / responses_by_option, np.nan)
+
+        QuestionStats.objects.filter(quiz_id=quiz_id).delete()
+        QuestionStats.objects.bulk_create([
+            QuestionStats(
+                question_id=int(question_id), quiz_id=quiz_id,
+                difficulty=p_value, discrimination=r_pb,
+                **{name: int(sums[name][position]) for name in QUESTION_SUMS}
+            )
+            for position, (question_id, p_value, r_pb) in enumerate(
+                zip(question_ids, nullable(difficulty), nullable(discrimination)))
+        ], batch_size=500)
+        OptionStats.objects.filter(question__quiz_id=quiz_id).delete()
+        OptionStats.objects.bulk_create([
+            OptionStats(option_id=option_id, question_id=question_id, selections=int(count), selection_rate=rate)
+            for (option_id, question_id), count, rate in zip(option_rows, selections, nullable(selection_rate))
+        ], batch_size=500)
+
+        if new_attempts['last_id'] is not None:
+            run.last_attempt_id = new_attempts['last_id']
+            run.covered_until = new_attempts['last_completed']
+            run.attempts_processed += new_attempts['count']
+            run.answers_processed += answers_seen
+        run.computed_at = timezone.now()
+        run.save()
+
+    return run
+
+
+def item_report(quiz_id):
+    """Rows for the admin report: one per question with its option breakdown."""
+    options = {}
+    for stats in OptionStats.objects.filter(question__quiz_id=quiz_id).select_related('option').order_by('option_id'):
+        options.setdefault(stats.question_id, []).append({
+            'text': stats.option.text,
+            'is_correct': stats.option.is_correct,
+            'selections': stats.selections,
+            'selection_rate': stats.selection_rate,
+        })
+    return [
+        {
+            'question': stats.question.text,
+            'responses': stats.responses,
+            'difficulty': stats.difficulty,
+            'discrimination': stats.discrimination,
+            'options': options.get(stats.question_id, []),
+        }
+        for stats in QuestionStats.objects.filter(quiz_id=quiz_id).select_related('question').order_by('question_id')
+    ]
+
+
+def cached_item_report(run):
+    """The report for a run; keyed on computed_at so a rerun never serves stale rows."""
+    if run.computed_at is None:
+        return []
+    key = f"item_report:{run.quiz_id}:{run.computed_at.timestamp()}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = item_report(run.quiz_id)
+        cache.set(key, rows, REPORT_CACHE_TIMEOUT)
+    return rows
@@ -0,0 +1,209 @@
+"""
+Per-quiz and global leaderboards maintained incrementally.
+
+LeaderboardEntry holds each user's best score per quiz (earliest completion
+wins ties) and, with quiz=None, the sum of their per-quiz bests. An Attempt
+only touches the tables when it beats the user's best. LeaderboardBucket
+counts users per score on each board. A rank is the user's position in
+board order: the bucket sum above their score, plus the users on the same
+score who reached it earlier. Only that tied group is counted in the entry
+table, through its (quiz, -best_score, achieved_at, user) index.
+
+Bulk writes skip signals; ``manage.py rebuild_leaderboards`` recomputes
+everything from Attempt history.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Max, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Attempt, LeaderboardBucket, LeaderboardEntry, Quiz
+
+BOARD_ORDERING = ('-best_score', 'achieved_at', 'user_id')
+
+
+def move_bucket(quiz_id, old_score, new_score):
+    """Move one user from the ``old_score`` bucket to ``new_score`` (either may be None)."""
+    if old_score == new_score:
+        return
+    if old_score is not None:
+        left = LeaderboardBucket.objects.filter(quiz_id=quiz_id, score=old_score, users__gt=0).update(
+            users=F('users') - 1,
+        )
+        if not left:
+            # The counts have drifted (rebuild_leaderboards fixes them): adding the user
+            # to the new bucket without taking them out of the old one would widen the gap
+            return
+    if new_score is not None:
+        if not LeaderboardBucket.objects.filter(quiz_id=quiz_id, score=new_score).update(users=F('users') + 1):
+            bucket, created = LeaderboardBucket.objects.get_or_create(
+                quiz_id=quiz_id, score=new_score, defaults={'users': 1},
+            )
+            if not created:
+                LeaderboardBucket.objects.filter(pk=bucket.pk).update(users=F('users') + 1)
+
+
+def set_entry(quiz_id, user_id, entry, score, achieved_at):
+    """Point the (quiz_id, user_id) entry at ``score``; ``entry`` is the current row or None."""
+    if entry is None:
+        LeaderboardEntry.objects.create(quiz_id=quiz_id, user_id=user_id, best_score=score, achieved_at=achieved_at)
+        move_bucket(quiz_id, None, score)
+    else:
+        LeaderboardEntry.objects.filter(pk=entry.pk).update(best_score=score, achieved_at=achieved_at)
+        move_bucket(quiz_id, entry.best_score, score)
+
+
+def drop_entry(entry):
+    LeaderboardEntry.objects.filter(pk=entry.pk).delete()
+    move_bucket(entry.quiz_id, entry.best_score, None)
+
+
+def adjust_global(user_id, delta, achieved_at=None):
+    """
+    Add ``delta`` to the user's global total. The global entry is dated by the
+    user's latest per-quiz best, which is re-read when ``achieved_at`` is not
+    given (i.e. after a best was lowered or removed).
+    """
+    entry = LeaderboardEntry.objects.select_for_update().filter(quiz__isnull=True, user_id=user_id).first()
+    if achieved_at is None:
+        achieved_at = LeaderboardEntry.objects.filter(
+            quiz__isnull=False, user_id=user_id,
+        ).aggregate(latest=Max('achieved_at'))['latest']
+        if achieved_at is None:
+            if entry is not None:
+                drop_entry(entry)
+            return
+    total = (entry.best_score if entry else 0) + delta
+    if entry is None or (total, achieved_at) != (entry.best_score, entry.achieved_at):
+        set_entry(None, user_id, entry, total, achieved_at)
+
+
+def record_attempt_score(attempt):
+    # savepoint=False: this usually runs inside the caller's transaction already
+    with transaction.atomic(savepoint=False):
+        entry = LeaderboardEntry.objects.select_for_update().filter(
+            quiz_id=attempt.quiz_id, user_id=attempt.user_id,
+        ).first()
+        if entry is not None and entry.best_score >= attempt.score:
+            return
+        set_entry(attempt.quiz_id, attempt.user_id, entry, attempt.score, attempt.completed_at)
+        adjust_global(attempt.user_id, attempt.score - (entry.best_score if entry else 0), attempt.completed_at)
+
+
+def forget_attempt_score(attempt):
+    """Re-derive the user's best on this quiz from their remaining attempts."""
+    with transaction.atomic(savepoint=False):
+        entry = LeaderboardEntry.objects.select_for_update().filter(
+            quiz_id=attempt.quiz_id, user_id=attempt.user_id,
+        ).first()
+        if entry is None or entry.best_score != attempt.score:
+            return
+        best = Attempt.objects.filter(quiz_id=attempt.quiz_id, user_id=attempt.user_id).order_by(
+            '-score', 'completed_at',
+        ).first()
+        if best is None:
+            drop_entry(entry)
+            adjust_global(attempt.user_id, -entry.best_score)
+        elif (best.score, best.completed_at) != (entry.best_score, entry.achieved_at):
+            set_entry(attempt.quiz_id, attempt.user_id, entry, best.score, best.completed_at)
+            adjust_global(attempt.user_id, best.score - entry.best_score)
+
+
+def top_entries(quiz_id=None, limit=25):
+    """The first ``limit`` entries of a board, each with ``.rank`` set as rank_of() would compute it."""
+    entries = list(
+        LeaderboardEntry.objects.filter(quiz_id=quiz_id).select_related('user').order_by(*BOARD_ORDERING)[:limit]
+    )
+    for position, entry in enumerate(entries, start=1):
+        entry.rank = position
+    return entries
+
+
+def rank_of(entry):
+    """
+    Position of ``entry`` in BOARD_ORDERING: 1 + the users with a higher score
+    + the users tied on its score who reached it first. One query.
+    """
+    tied_ahead = LeaderboardEntry.objects.filter(
+        Q(achieved_at__lt=entry.achieved_at) | Q(achieved_at=entry.achieved_at, user_id__lt=entry.user_id),
+        quiz_id=entry.quiz_id, best_score=entry.best_score,
+    ).annotate(users=Func(F('id'), function='COUNT')).values('users')
+    ahead = LeaderboardBucket.objects.filter(quiz_id=entry.quiz_id, score__gt=entry.best_score).aggregate(
+        users=Coalesce(Sum('users'), 0) + Subquery(tied_ahead, output_field=IntegerField()),
+    )['users']
+    return ahead + 1
+
+
+def user_standing(user, quiz_id=None):
+    """(entry, rank) for ``user`` on a board, or (None, None) if they are not on it."""
+    if not user.is_authenticated:
+        return None, None
+    entry = LeaderboardEntry.objects.filter(quiz_id=quiz_id, user=user).first()
+    return (entry, rank_of(entry)) if entry else (None, None)
+
+
+def rebuild_leaderboards():
+    """Recompute every board from Attempt history. Returns the number of entries written."""
+    best = {}
+    for quiz_id, user_id, score, completed_at in Attempt.objects.order_by('completed_at', 'id').values_list(
+        'quiz_id', 'user_id', 'score', 'completed_at',
+    ).iterator():
+        current = best.get((quiz_id, user_id))
+        if current is None or score > current[0]:
+            best[(quiz_id, user_id)] = (score, completed_at)
+
+    totals = {}
+    for (quiz_id, user_id), (score, completed_at) in best.items():
+        total, latest = totals.get(user_id, (0, completed_at))
+        totals[user_id] = (total + score, max(latest, completed_at))
+
+    entries = [
+        LeaderboardEntry(quiz_id=quiz_id, user_id=user_id, best_score=score, achieved_at=completed_at)
+        for (quiz_id, user_id), (score, completed_at) in best.items()
+    ] + [
+        LeaderboardEntry(quiz_id=None, user_id=user_id, best_score=total, achieved_at=latest)
+        for user_id, (total, latest) in totals.items()
+    ]
+    buckets = {}
+    for entry in entries:
+        key = (entry.quiz_id, entry.best_score)
+        buckets[key] = buckets.get(key, 0) + 1
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardBucket.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=500)
+        LeaderboardBucket.objects.bulk_create([
+            LeaderboardBucket(quiz_id=quiz_id, score=score, users=users)
+            for (quiz_id, score), users in buckets.items()
+        ], batch_size=500)
+    return len(entries)
+
+
+@receiver(post_save, sender=Attempt)
+def update_leaderboard_on_create(sender, instance, created, **kwargs):
+    if created:
+        record_attempt_score(instance)
+
+
+@receiver(post_delete, sender=Attempt)
+def update_leaderboard_on_delete(sender, instance, **kwargs):
+    forget_attempt_score(instance)
+
+
+@receiver(pre_delete, sender=Quiz)
+def drop_quiz_leaderboard(sender, instance, **kwargs):
+    # Runs before the cascade, so the per-attempt handler then finds nothing to adjust
+    entries = list(LeaderboardEntry.objects.filter(quiz=instance))
+    LeaderboardEntry.objects.filter(quiz=instance).delete()
+    LeaderboardBucket.objects.filter(quiz=instance).delete()
+    for entry in entries:
+        adjust_global(entry.user_id, -entry.best_score)
+
+
+@receiver(pre_delete, sender=User)
+def drop_user_leaderboard(sender, instance, **kwargs):
+    for entry in LeaderboardEntry.objects.filter(user=instance):
+        drop_entry(entry)
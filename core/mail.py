@@ -0,0 +1,122 @@
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+DEFAULT_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 60 * 60
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def due_ids(now, batch_size):
+    return list(
+        OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+
+
+def claim_batch(batch_size):
+    """Mark up to ``batch_size`` due emails as taken by this worker and return them."""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    # One UPDATE claims the batch. It stamps this worker's token on each row and
+    # pushes next_attempt_at forward, which hides the row from other workers
+    # until the batch is finished (or the worker dies and the row falls due
+    # again). A row another worker claimed since the SELECT is no longer due,
+    # so it does not match. The rows this worker won are read back by token.
+    OutboundEmail.objects.filter(
+        id__in=due_ids(now, batch_size), status='pending', next_attempt_at__lte=now,
+    ).update(claimed_by=token, next_attempt_at=now + timedelta(seconds=RETRY_MAX_SECONDS))
+    return list(OutboundEmail.objects.filter(claimed_by=token).order_by('id'))
+
+
+def group_for_delivery(emails, digest):
+    """
+    Yield lists of emails that go out as one message. With ``digest`` a burst
+    of comment notifications for the same author becomes a single email.
+    """
+    groups = {}
+    for email in emails:
+        key = email.digest_key if digest and email.kind == 'comment' and email.digest_key else f'single:{email.id}'
+        groups.setdefault(key, []).append(email)
+    return groups.values()
+
+
+def build_message(group, connection):
+    first = group[0]
+    if len(group) == 1:
+        subject, body = first.subject, first.body
+    else:
+        subject = f"{len(group)} new comments on your blogs"
+        body = "\n\n----------\n\n".join(f"{email.subject}\n\n{email.body}" for email in group)
+    return EmailMessage(subject, body, first.from_email, first.recipient_list, connection=connection)
+
+
+def record_failure(ids, attempts, error, max_attempts):
+    if attempts >= max_attempts:
+        OutboundEmail.objects.filter(id__in=ids).update(
+            status='failed', attempts=attempts, last_error=error, claimed_by=None,
+        )
+        return False
+    OutboundEmail.objects.filter(id__in=ids).update(
+        status='pending', attempts=attempts, last_error=error, claimed_by=None,
+        next_attempt_at=timezone.now() + retry_delay(attempts),
+    )
+    return True
+
+
+def deliver_pending(batch_size=DEFAULT_BATCH_SIZE, digest=False, max_attempts=MAX_ATTEMPTS, connection=None):
+    """
+    Send one batch of due emails over a single SMTP connection.
+    Returns (sent, retried, failed) counts of outbox rows.
+    """
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0, 0
+
+    sent = retried = failed = 0
+    connection = connection or get_connection()
+    groups = list(group_for_delivery(emails, digest))
+    try:
+        for position, group in enumerate(groups):
+            ids = [email.id for email in group]
+            attempts = max(email.attempts for email in group) + 1
+            try:
+                connection.open()  # no-op while the connection is already open
+            except Exception as exc:
+                # Server unreachable: put the rest of the batch back for a later retry.
+                for pending in groups[position:]:
+                    pending_ids = [email.id for email in pending]
+                    pending_attempts = max(email.attempts for email in pending) + 1
+                    if record_failure(pending_ids, pending_attempts, str(exc), max_attempts):
+                        retried += len(pending_ids)
+                    else:
+                        failed += len(pending_ids)
+                break
+            try:
+                build_message(group, connection).send()
+            except Exception as exc:
+                if record_failure(ids, attempts, str(exc), max_attempts):
+                    retried += len(ids)
+                else:
+                    failed += len(ids)
+                # The server may have dropped us; the next message reconnects.
+                connection.close()
+            else:
+                OutboundEmail.objects.filter(id__in=ids).update(
+                    status='sent', attempts=attempts, sent_at=timezone.now(), last_error='', claimed_by=None,
+                )
+                sent += len(ids)
+    finally:
+        connection.close()
+
+    return sent, retried, failed
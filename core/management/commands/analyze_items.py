@@ -0,0 +1,40 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core.item_analysis import DEFAULT_CHUNK_SIZE, analyze_quiz
+from core.models import Quiz, QuizItemAnalysis
+
+
+class Command(BaseCommand):
+    help = "Compute per-question difficulty, discrimination and distractor rates from quiz answers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, action='append', dest='quizzes',
+                            help="Quiz id to analyse (repeatable). Defaults to every quiz.")
+        parser.add_argument('--full', action='store_true',
+                            help="Discard stored sums and reprocess every attempt, e.g. after attempts were deleted.")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Answer rows loaded into memory at a time.")
+
+    def handle(self, *args, **options):
+        quizzes = Quiz.objects.order_by('id')
+        if options['quizzes']:
+            quizzes = quizzes.filter(id__in=options['quizzes'])
+            missing = set(options['quizzes']) - set(quizzes.values_list('id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown quiz id(s): {', '.join(map(str, sorted(missing)))}")
+
+        quiz_ids = list(quizzes.values_list('id', flat=True))
+        for quiz_id in quiz_ids:
+            previous = 0 if options['full'] else (
+                QuizItemAnalysis.objects.filter(quiz_id=quiz_id).values_list('attempts_processed', flat=True).first() or 0
+            )
+            try:
+                run = analyze_quiz(quiz_id, chunk_size=options['chunk_size'], full=options['full'])
+            except ImproperlyConfigured as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(
+                f"Quiz {quiz_id}: {run.attempts_processed - previous} new attempt(s), "
+                f"{run.attempts_processed} total, covered until {run.covered_until or '-'}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Analysed {len(quiz_ids)} quiz(zes)."))
@@ -0,0 +1,23 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from core.images import backfill_names, request_variants
+
+
+class Command(BaseCommand):
+    help = ("Queue variants for every existing quiz image, blog image and CKEditor upload, "
+            "then render them (see process_images).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reprocess', action='store_true',
+                            help="Also re-render images that are already ready or failed.")
+        parser.add_argument('--enqueue-only', action='store_true',
+                            help="Only queue the images; leave rendering to process_images.")
+        parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU).")
+
+    def handle(self, *args, **options):
+        names = backfill_names()
+        request_variants(names, reprocess=options['reprocess'])
+        self.stdout.write(f"{len(names)} images found.")
+        if not options['enqueue_only']:
+            call_command('process_images', workers=options['workers'], stdout=self.stdout)
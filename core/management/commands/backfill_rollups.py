@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily quiz rollups and site-wide counters from Attempt history."
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily quiz rollup row(s)."))
@@ -0,0 +1,65 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.write_benchmark import run_profile
+
+# What settings.py gives you: default journal, a new connection per request
+# and Python's default 5 second lock timeout.
+DEVELOPMENT_PROFILE = {'pragmas': {}, 'timeout': 5.0, 'persistent': False}
+
+
+def production_profile():
+    # Read from settings rather than importing settings_production, which needs DJANGO_SECRET_KEY
+    return {
+        'pragmas': settings.PRODUCTION_SQLITE_PRAGMAS,
+        'timeout': settings.PRODUCTION_SQLITE_BUSY_TIMEOUT,
+        'persistent': True,
+    }
+
+
+class Command(BaseCommand):
+    help = ("Compare SQLite write throughput under concurrent writers for the development settings "
+            "and the production profile (WAL, synchronous=NORMAL, busy timeout, persistent connections).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Concurrent writer processes.")
+        parser.add_argument('--readers', type=int, default=4, help="Concurrent reader processes.")
+        parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each profile's run.")
+        parser.add_argument('--output', help="Write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        results = {}
+        profiles = {'development': DEVELOPMENT_PROFILE, 'production': production_profile()}
+        for name, profile in profiles.items():
+            self.stdout.write(f"Running {name} profile for {options['seconds']}s...")
+            results[name] = run_profile(
+                profile, writers=options['writers'], readers=options['readers'], seconds=options['seconds'],
+            )
+
+        self.stdout.write(f"{'profile':<13}{'role':<7}{'ops/s':>10}{'median ms':>11}{'p95 ms':>10}{'errors':>8}")
+        for name, summary in results.items():
+            for role, row in summary.items():
+                self.stdout.write(
+                    f"{name:<13}{role:<7}{row['ops_per_second']:>10.1f}{row['median_ms']:>11.2f}"
+                    f"{row['p95_ms']:>10.2f}{row['errors']:>8}"
+                )
+
+        before = results['development']['write']['ops_per_second']
+        after = results['production']['write']['ops_per_second']
+        if before:
+            self.stdout.write(self.style.SUCCESS(f"Write throughput: {after / before:.1f}x the development settings."))
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'writers': options['writers'],
+                    'readers': options['readers'],
+                    'seconds': options['seconds'],
+                    'profiles': profiles,
+                    'results': results,
+                }, output_file, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,65 @@
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmarks import seed_dataset
+from core.serving_benchmark import SERVED_VIEWS, run_serving_benchmark
+
+
+class Command(BaseCommand):
+    help = ("Seed a throwaway test database and compare requests/sec and p99 latency of the read-heavy "
+            "views served through WSGI and through ASGI with concurrent reads.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiply the seeded dataset size.")
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per view and mode.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Requests in flight at once.")
+        parser.add_argument('--view', action='append', dest='views', choices=SERVED_VIEWS,
+                            help="Only benchmark this URL name (repeatable).")
+        parser.add_argument('--output', help="Write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        cache.clear()
+        try:
+            dataset = seed_dataset(scale=options['scale'])
+            results = run_serving_benchmark(
+                dataset, requests=options['requests'], concurrency=options['concurrency'], names=options['views'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'view':<14}{'mode':<6}{'req/s':>10}{'median ms':>11}{'p99 ms':>10}{'errors':>8}")
+        for name, modes in results.items():
+            for mode, row in modes.items():
+                self.stdout.write(
+                    f"{name:<14}{mode:<6}{row['requests_per_second']:>10.1f}{row['median_ms']:>11.2f}"
+                    f"{row['p99_ms']:>10.2f}{row['errors']:>8}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'scale': options['scale'],
+                    'requests': options['requests'],
+                    'concurrency': options['concurrency'],
+                    'dataset': dataset.counts,
+                    'views': results,
+                }, output_file, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        errors = sum(row['errors'] for modes in results.values() for row in modes.values())
+        if errors:
+            raise CommandError(f"{errors} requests failed with a server error.")
@@ -0,0 +1,77 @@
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmarks import compare_with_baseline, run_benchmarks, seed_dataset
+
+
+class Command(BaseCommand):
+    help = ("Seed a throwaway test database and measure query count, wall time and response size "
+            "of every core view; fail on query budget violations.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiply the seeded dataset size.")
+        parser.add_argument('--repeat', type=int, default=5, help="Requests per view (the first one is cold).")
+        parser.add_argument('--view', action='append', dest='views', help="Only benchmark this URL name (repeatable).")
+        parser.add_argument('--output', help="Write results to this JSON file (a baseline for --compare).")
+        parser.add_argument('--compare', help="Baseline JSON from an earlier run to diff against.")
+        parser.add_argument('--time-tolerance', type=float, default=1.5,
+                            help="With --compare, flag views whose median time grew by more than this factor.")
+        parser.add_argument('--fail-on-slowdown', action='store_true',
+                            help="With --compare, treat time slowdowns as failures, not warnings.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        cache.clear()
+        try:
+            dataset = seed_dataset(scale=options['scale'])
+            results, violations = run_benchmarks(dataset, repeat=options['repeat'], names=options['views'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'view':<24}{'status':>7}{'queries':>9}{'budget':>8}{'median ms':>11}{'bytes':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24}{result['status']:>7}{result['queries']:>9}{result['budget']:>8}"
+                f"{result['median_ms']:>11.2f}{result['bytes']:>10}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'scale': options['scale'],
+                    'repeat': options['repeat'],
+                    'dataset': dataset.counts,
+                    'views': results,
+                }, output_file, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        failures = list(violations)
+        if baseline is not None:
+            query_regressions, slowdowns = compare_with_baseline(results, baseline, options['time_tolerance'])
+            failures.extend(query_regressions)
+            if options['fail_on_slowdown']:
+                failures.extend(slowdowns)
+            else:
+                for slowdown in slowdowns:
+                    self.stderr.write(self.style.WARNING(f"slower: {slowdown}"))
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(failure))
+            raise CommandError(f"{len(failures)} benchmark failure(s).")
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} views within budget."))
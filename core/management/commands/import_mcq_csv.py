@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.importers import DEFAULT_BATCH_SIZE, import_mcq_csv
+
+
+class Command(BaseCommand):
+    help = "Import MCQ questions from a CSV file (quiz_title, question, option1-4, correct_option_index)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with open(options['csv_path'], encoding='utf-8', newline='') as csv_file:
+            report = import_mcq_csv(csv_file, batch_size=options['batch_size'])
+
+        for line_number, reason in report.skipped:
+            self.stdout.write(f"line {line_number}: skipped, {reason}")
+        for line_number, reason in report.rejected:
+            self.stderr.write(f"line {line_number}: rejected, {reason}")
+        self.stdout.write(self.style.SUCCESS(report.summary()))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.importers import DEFAULT_BATCH_SIZE, import_quizzes_csv
+
+
+class Command(BaseCommand):
+    help = "Import quizzes from a CSV file (title, category, status, description)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--update-existing', action='store_true',
+                            help="Update quizzes whose title already exists instead of adding duplicates.")
+
+    def handle(self, *args, **options):
+        with open(options['csv_path'], encoding='utf-8', newline='') as csv_file:
+            report = import_quizzes_csv(csv_file, batch_size=options['batch_size'],
+                                        update_existing=options['update_existing'])
+
+        for line_number, reason in report.rejected:
+            self.stderr.write(f"line {line_number}: rejected, {reason}")
+        self.stdout.write(self.style.SUCCESS(report.summary()))
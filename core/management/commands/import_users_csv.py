@@ -0,0 +1,25 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.importers import DEFAULT_BATCH_SIZE, import_users_csv
+
+
+class Command(BaseCommand):
+    help = "Import users from a CSV file (username, email, password), hashing passwords in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Password hashing processes (default: one per CPU).")
+
+    def handle(self, *args, **options):
+        with open(options['csv_path'], encoding='utf-8', newline='') as csv_file:
+            report = import_users_csv(csv_file, batch_size=options['batch_size'], workers=options['workers'] or os.cpu_count() or 1)
+
+        for line_number, reason in report.skipped:
+            self.stdout.write(f"line {line_number}: skipped, {reason}")
+        for line_number, reason in report.rejected:
+            self.stderr.write(f"line {line_number}: invalid, {reason}")
+        self.stdout.write(self.style.SUCCESS(report.summary()))
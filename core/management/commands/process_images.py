@@ -0,0 +1,27 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.images import DEFAULT_BATCH_SIZE, process_pending
+
+
+class Command(BaseCommand):
+    help = "Render the thumb/card/full WebP and fallback variants of queued images in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU).")
+        parser.add_argument('--loop', action='store_true', help="Keep polling the queue instead of exiting when it is empty.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                ready, failed = process_pending(pool, batch_size=options['batch_size'])
+                if ready or failed:
+                    self.stdout.write(f"{ready} ready, {failed} failed")
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.quiz_state import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired in-progress quiz attempts stored by the 'db' quiz state backend."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired quiz state row(s)."))
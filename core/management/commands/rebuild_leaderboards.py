@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-quiz and global leaderboards from Attempt history."
+
+    def handle(self, *args, **options):
+        entries = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {entries} leaderboard entries."))
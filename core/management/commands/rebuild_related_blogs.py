@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.related import rebuild_related_blogs
+
+
+class Command(BaseCommand):
+    help = "Recompute every blog's tag/title vector and its list of related blogs."
+
+    def handle(self, *args, **options):
+        count = rebuild_related_blogs()
+        self.stdout.write(self.style.SUCCESS(f"Related blogs rebuilt for {count} blogs."))
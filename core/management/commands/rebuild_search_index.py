@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FTS5 full-text search index for quizzes and blogs."
+
+    def handle(self, *args, **options):
+        if not rebuild_index():
+            raise CommandError("FTS5 is not available on this database; search uses the icontains fallback.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
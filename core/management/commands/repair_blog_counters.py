@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from core.models import Blog
+
+
+class Command(BaseCommand):
+    help = "Recompute Blog.like_count/dislike_count from BlogReaction rows and Blog.comment_count from Comment rows."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = list(
+                Blog.objects.annotate(
+                    likes=Count('reactions', filter=Q(reactions__is_like=True), distinct=True),
+                    dislikes=Count('reactions', filter=Q(reactions__is_like=False), distinct=True),
+                    comment_total=Count('comments', distinct=True),
+                )
+                .filter(
+                    ~Q(like_count=F('likes')) | ~Q(dislike_count=F('dislikes'))
+                    | ~Q(comment_count=F('comment_total'))
+                )
+                .values_list('pk', 'likes', 'dislikes', 'comment_total')
+            )
+            for pk, likes, dislikes, comment_total in drifted:
+                Blog.objects.filter(pk=pk).update(like_count=likes, dislike_count=dislikes, comment_count=comment_total)
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired reaction and comment counters on {len(drifted)} blog(s)."))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from core.mail import DEFAULT_BATCH_SIZE, MAX_ATTEMPTS, deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+        parser.add_argument('--digest', action='store_true',
+                            help="Merge pending comment notifications for the same author into one email.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting when it is empty.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between polls with --loop.")
+        parser.add_argument('--host', help="Override EMAIL_HOST (e.g. a local SMTP stand-in).")
+        parser.add_argument('--port', type=int, help="Override EMAIL_PORT.")
+        parser.add_argument('--no-tls', action='store_true', help="Disable EMAIL_USE_TLS.")
+        parser.add_argument('--no-auth', action='store_true', help="Do not log in (EMAIL_HOST_USER is ignored).")
+
+    def get_connection(self, options):
+        overrides = {}
+        if options['host']:
+            overrides['host'] = options['host']
+        if options['port']:
+            overrides['port'] = options['port']
+        if options['no_tls']:
+            overrides['use_tls'] = False
+        if options['no_auth']:
+            overrides['username'] = ''
+            overrides['password'] = ''
+        return get_connection(**overrides)
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, failed = deliver_pending(
+                batch_size=options['batch_size'],
+                digest=options['digest'],
+                max_attempts=options['max_attempts'],
+                connection=self.get_connection(options),
+            )
+            if sent or retried or failed:
+                self.stdout.write(f"{sent} sent, {retried} retried, {failed} failed")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,39 @@
+# Generated by Django 3.0.7 on 2026-10-18 08:41
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_reaction_counters(apps, schema_editor):
+    Blog = apps.get_model('core', 'Blog')
+    for blog in Blog.objects.annotate(
+        likes=Count('reactions', filter=Q(reactions__is_like=True)),
+        dislikes=Count('reactions', filter=Q(reactions__is_like=False)),
+    ).filter(Q(likes__gt=0) | Q(dislikes__gt=0)):
+        Blog.objects.filter(pk=blog.pk).update(like_count=blog.likes, dislike_count=blog.dislikes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_category_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='description',
+            field=models.CharField(blank=True, max_length=500, null=True),
+        ),
+        migrations.RunPython(populate_reaction_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+from html import unescape
+
+from django.db import migrations, OperationalError
+from django.utils.html import strip_tags
+
+
+def plain_text(html):
+    return unescape(strip_tags(html or ''))
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS core_blog_fts "
+                "USING fts5(title, summary, content, tags, tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS core_quiz_fts "
+                "USING fts5(title, description, tokenize='porter unicode61')"
+            )
+        except OperationalError:
+            # SQLite without FTS5: search falls back to icontains.
+            return
+
+        Blog = apps.get_model('core', 'Blog')
+        Quiz = apps.get_model('core', 'Quiz')
+        tags = {}
+        for blog_id, name in Blog.tags.through.objects.values_list('blog_id', 'tag__name'):
+            tags.setdefault(blog_id, []).append(name)
+        cursor.executemany(
+            "INSERT INTO core_blog_fts (rowid, title, summary, content, tags) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (pk, title, plain_text(summary), plain_text(content), ' '.join(tags.get(pk, [])))
+                for pk, title, summary, content in Blog.objects.values_list('pk', 'title', 'summary', 'content')
+            ],
+        )
+        cursor.executemany(
+            "INSERT INTO core_quiz_fts (rowid, title, description) VALUES (%s, %s, %s)",
+            [(pk, title, description or '') for pk, title, description in Quiz.objects.values_list('pk', 'title', 'description')],
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS core_blog_fts")
+        cursor.execute("DROP TABLE IF EXISTS core_quiz_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_blog_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
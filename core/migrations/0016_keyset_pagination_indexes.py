@@ -0,0 +1,25 @@
+# Generated by Django 3.0.7 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['user', 'completed_at', 'id'], name='core_attemp_user_id_893238_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['created_at', 'id'], name='core_blog_created_af227b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['status', 'id'], name='core_quiz_status_b9bc49_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 3.0.7 on 2026-10-18 08:49
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    Attempt = apps.get_model('core', 'Attempt')
+    Quiz = apps.get_model('core', 'Quiz')
+    User = apps.get_model('auth', 'User')
+    QuizDailyStats = apps.get_model('core', 'QuizDailyStats')
+    StatCounter = apps.get_model('core', 'StatCounter')
+
+    rows = (
+        Attempt.objects.annotate(date=TruncDate('completed_at'))
+        .values('quiz_id', 'date')
+        .annotate(
+            attempt_count=Count('id'),
+            score_sum=Sum('score'),
+            perfect_count=Count('id', filter=Q(total__gt=0, score__gte=F('total'))),
+            unique_users=Count('user_id', distinct=True),
+        )
+        .order_by()
+    )
+    QuizDailyStats.objects.bulk_create([QuizDailyStats(**row) for row in rows], batch_size=500)
+    StatCounter.objects.bulk_create([
+        StatCounter(name='users', value=User.objects.count()),
+        StatCounter(name='quizzes', value=Quiz.objects.count()),
+        StatCounter(name='attempts', value=Attempt.objects.count()),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('core', '0016_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuizDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('perfect_count', models.PositiveIntegerField(default=0)),
+                ('unique_users', models.PositiveIntegerField(default=0)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='core.Quiz')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='quizdailystats',
+            index=models.Index(fields=['date'], name='core_quizda_date_3a7d2a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='quizdailystats',
+            unique_together={('quiz', 'date')},
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
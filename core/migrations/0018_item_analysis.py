@@ -0,0 +1,51 @@
+# Generated by Django 3.0.7 on 2026-10-18 08:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizItemAnalysis',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_attempt_id', models.PositiveIntegerField(default=0)),
+                ('covered_until', models.DateTimeField(blank=True, null=True)),
+                ('attempts_processed', models.PositiveIntegerField(default=0)),
+                ('answers_processed', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='item_analysis', to='core.Quiz')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('score_sq_sum', models.BigIntegerField(default=0)),
+                ('correct_score_sum', models.BigIntegerField(default=0)),
+                ('difficulty', models.FloatField(blank=True, null=True)),
+                ('discrimination', models.FloatField(blank=True, null=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='core.Question')),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_stats', to='core.Quiz')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OptionStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('selections', models.PositiveIntegerField(default=0)),
+                ('selection_rate', models.FloatField(blank=True, null=True)),
+                ('option', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='core.Option')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='option_stats', to='core.Question')),
+            ],
+        ),
+    ]
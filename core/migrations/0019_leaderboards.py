@@ -0,0 +1,89 @@
+# Generated by Django 3.0.7 on 2026-10-18 08:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_leaderboards(apps, schema_editor):
+    Attempt = apps.get_model('core', 'Attempt')
+    LeaderboardEntry = apps.get_model('core', 'LeaderboardEntry')
+    LeaderboardBucket = apps.get_model('core', 'LeaderboardBucket')
+
+    best = {}
+    for quiz_id, user_id, score, completed_at in Attempt.objects.order_by('completed_at', 'id').values_list(
+        'quiz_id', 'user_id', 'score', 'completed_at',
+    ).iterator():
+        current = best.get((quiz_id, user_id))
+        if current is None or score > current[0]:
+            best[(quiz_id, user_id)] = (score, completed_at)
+
+    totals = {}
+    for (quiz_id, user_id), (score, completed_at) in best.items():
+        total, latest = totals.get(user_id, (0, completed_at))
+        totals[user_id] = (total + score, max(latest, completed_at))
+
+    rows = [(quiz_id, user_id, score, at) for (quiz_id, user_id), (score, at) in best.items()]
+    rows += [(None, user_id, total, at) for user_id, (total, at) in totals.items()]
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(quiz_id=quiz_id, user_id=user_id, best_score=score, achieved_at=at)
+        for quiz_id, user_id, score, at in rows
+    ], batch_size=500)
+
+    buckets = {}
+    for quiz_id, _, score, _ in rows:
+        buckets[(quiz_id, score)] = buckets.get((quiz_id, score), 0) + 1
+    LeaderboardBucket.objects.bulk_create([
+        LeaderboardBucket(quiz_id=quiz_id, score=score, users=users) for (quiz_id, score), users in buckets.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0018_item_analysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('best_score', models.IntegerField(default=0)),
+                ('achieved_at', models.DateTimeField()),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='core.Quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LeaderboardBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField()),
+                ('users', models.IntegerField(default=0)),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_buckets', to='core.Quiz')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['quiz', '-best_score', 'achieved_at', 'user'], name='core_leader_quiz_id_200a52_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('quiz', 'user'), name='unique_quiz_leaderboard_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(quiz__isnull=True), fields=('user',), name='unique_global_leaderboard_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardbucket',
+            constraint=models.UniqueConstraint(fields=('quiz', 'score'), name='unique_quiz_leaderboard_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardbucket',
+            constraint=models.UniqueConstraint(condition=models.Q(quiz__isnull=True), fields=('score',), name='unique_global_leaderboard_bucket'),
+        ),
+        migrations.RunPython(backfill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0020_question_pools'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seed', models.PositiveIntegerField()),
+                ('question_index', models.PositiveIntegerField(default=0)),
+                ('answers', models.TextField(blank=True, default='')),
+                ('expires_at', models.DateTimeField()),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='core.Quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='quizprogress',
+            index=models.Index(fields=['expires_at'], name='core_quizpr_expires_3f9aca_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='quizprogress',
+            unique_together={('user', 'quiz')},
+        ),
+    ]
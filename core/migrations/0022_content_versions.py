@@ -0,0 +1,31 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:05
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_versions(apps, schema_editor):
+    ContentVersion = apps.get_model('core', 'ContentVersion')
+    now = timezone.now()
+    ContentVersion.objects.bulk_create([
+        ContentVersion(name=name, changed_at=now) for name in ('categories', 'quizzes', 'questions', 'blogs', 'tags')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_quiz_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:20
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def create_versions(apps, schema_editor):
+    ContentVersion = apps.get_model('core', 'ContentVersion')
+    now = timezone.now()
+    for name in ('comments', 'reactions'):
+        ContentVersion.objects.get_or_create(name=name, defaults={'changed_at': now})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_processed_images'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
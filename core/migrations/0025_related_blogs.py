@@ -0,0 +1,109 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+STOPWORDS = frozenset(
+    'the and for with from that this these those your you are was were how what why when who which into '
+    'about over under not but its our out can use using all any more most some than then them they will'.split()
+)
+
+
+def backfill_related_blogs(apps, schema_editor):
+    # Same scoring as core.related.rebuild_related_blogs at the time of writing
+    Blog = apps.get_model('core', 'Blog')
+    BlogTerm = apps.get_model('core', 'BlogTerm')
+    RelatedBlog = apps.get_model('core', 'RelatedBlog')
+
+    features = {}
+    for blog_id, title in Blog.objects.values_list('pk', 'title'):
+        features[blog_id] = Counter(
+            f'title:{word}' for word in re.findall(r'[a-z0-9]+', title.lower())
+            if len(word) >= 3 and word not in STOPWORDS
+        )
+    for blog_id, tag_id in Blog.tags.through.objects.values_list('blog_id', 'tag_id'):
+        features[blog_id][f'tag:{tag_id}'] = 2.0
+
+    frequencies = Counter(term for terms in features.values() for term in terms)
+    vectors = {}
+    for blog_id, terms in features.items():
+        vector = {
+            term: weight * (math.log((1 + len(features)) / (1 + frequencies[term])) + 1.0)
+            for term, weight in terms.items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        vectors[blog_id] = {term: value / norm for term, value in vector.items()} if norm else {}
+
+    postings = defaultdict(list)
+    for blog_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((blog_id, weight))
+    related = []
+    for blog_id, vector in vectors.items():
+        totals = defaultdict(float)
+        for term, weight in vector.items():
+            for other_id, other_weight in postings[term]:
+                totals[other_id] += weight * other_weight
+        matches = heapq.nlargest(3, (
+            (round(score, 9), other_id) for other_id, score in totals.items() if other_id != blog_id and score > 0
+        ))
+        related += [
+            RelatedBlog(blog_id=blog_id, related_id=other_id, score=score, rank=rank)
+            for rank, (score, other_id) in enumerate(matches)
+        ]
+
+    BlogTerm.objects.bulk_create([
+        BlogTerm(blog_id=blog_id, term=term, weight=weight)
+        for blog_id, vector in vectors.items() for term, weight in vector.items()
+    ], batch_size=500)
+    RelatedBlog.objects.bulk_create(related, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_comment_reaction_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedBlog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='core.Blog')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.Blog')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BlogTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.FloatField()),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='core.Blog')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='relatedblog',
+            index=models.Index(fields=['blog', 'rank'], name='core_relate_blog_id_beabd4_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedblog',
+            constraint=models.UniqueConstraint(fields=('blog', 'related'), name='unique_related_blog'),
+        ),
+        migrations.AddIndex(
+            model_name='blogterm',
+            index=models.Index(fields=['term'], name='core_blogte_term_6052a7_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='blogterm',
+            constraint=models.UniqueConstraint(fields=('blog', 'term'), name='unique_blog_term'),
+        ),
+        migrations.RunPython(backfill_related_blogs, migrations.RunPython.noop),
+    ]
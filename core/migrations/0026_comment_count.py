@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_counts(apps, schema_editor):
+    Blog = apps.get_model('core', 'Blog')
+    Comment = apps.get_model('core', 'Comment')
+    counts = Comment.objects.filter(blog=OuterRef('pk')).order_by().values('blog').annotate(total=Count('id')).values('total')
+    Blog.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_related_blogs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog', 'created_at', 'id'], name='core_commen_blog_id_6a7bd5_idx'),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
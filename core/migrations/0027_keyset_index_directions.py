@@ -0,0 +1,37 @@
+# Generated by Django 3.0.7 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_comment_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attempt',
+            name='core_attemp_user_id_893238_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='core_blog_created_af227b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='quiz',
+            name='core_quiz_status_b9bc49_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['user', '-completed_at', 'id'], name='core_attemp_user_id_9d558e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-created_at', 'id'], name='core_blog_created_0034e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['-status', 'id'], name='core_quiz_status_497eff_idx'),
+        ),
+    ]
@@ -4,7 +4,6 @@ from django.utils import timezone
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
 
 
@@ -29,8 +28,12 @@ class Quiz(models.Model):
     is_paid = models.BooleanField(default=False)  # Free or Paid
     price = models.DecimalField(max_digits=6, decimal_places=2, default=0.00)  # Only used if paid
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    questions_per_attempt = models.PositiveIntegerField(null=True, blank=True)  # Draw this many from the bank; empty = all
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['-status', 'id'])]  # quiz_list keyset pagination
+
     def __str__(self):
         return self.title
 
@@ -54,8 +57,17 @@ class Attempt(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE)
     score = models.IntegerField()
     total = models.IntegerField()
+    seed = models.PositiveIntegerField(null=True, blank=True)  # Seed of the question draw, see core.quiz_cache
+    question_order = models.TextField(blank=True, default='')  # Comma-separated ids of the questions asked, in order
     completed_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', '-completed_at', 'id'])]  # my_attempts keyset pagination
+
+    @property
+    def question_ids(self):
+        return [int(qid) for qid in self.question_order.split(',') if qid]
+
     def __str__(self):
         return f"{self.user.username} - {self.quiz.title} ({self.score}/{self.total})"
 
@@ -64,6 +76,110 @@ class Answer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     selected_option = models.ForeignKey(Option, on_delete=models.CASCADE)
 
+class QuizProgress(models.Model):
+    """In-progress attempt for the 'db' quiz state backend (see core.quiz_state)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_progress')
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='progress')
+    seed = models.PositiveIntegerField()
+    question_index = models.PositiveIntegerField(default=0)
+    answers = models.TextField(blank=True, default='')  # "question_id:option_id," appended per step
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'quiz')
+        indexes = [models.Index(fields=['expires_at'])]
+
+class QuizItemAnalysis(models.Model):
+    """Watermark of the Answer data already folded into a quiz's item statistics."""
+    quiz = models.OneToOneField(Quiz, on_delete=models.CASCADE, related_name='item_analysis')
+    last_attempt_id = models.PositiveIntegerField(default=0)
+    covered_until = models.DateTimeField(null=True, blank=True)  # completed_at of the newest attempt included
+    attempts_processed = models.PositiveIntegerField(default=0)
+    answers_processed = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Item analysis for {self.quiz_id} up to attempt {self.last_attempt_id}"
+
+class QuestionStats(models.Model):
+    """Additive sums for one question plus the statistics derived from them (see core.item_analysis)."""
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='stats')
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='question_stats')
+    responses = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0)
+    score_sq_sum = models.BigIntegerField(default=0)
+    correct_score_sum = models.BigIntegerField(default=0)
+    difficulty = models.FloatField(null=True, blank=True)  # p-value: share of responses that were correct
+    discrimination = models.FloatField(null=True, blank=True)  # corrected item-total point-biserial
+
+class OptionStats(models.Model):
+    option = models.OneToOneField(Option, on_delete=models.CASCADE, related_name='stats')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='option_stats')
+    selections = models.PositiveIntegerField(default=0)
+    selection_rate = models.FloatField(null=True, blank=True)
+
+class QuizDailyStats(models.Model):
+    """Per-quiz, per-day attempt rollup maintained by core.analytics."""
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    attempt_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    perfect_count = models.PositiveIntegerField(default=0)
+    unique_users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('quiz', 'date')
+        indexes = [models.Index(fields=['date'])]
+
+    def __str__(self):
+        return f"{self.quiz_id} on {self.date}: {self.attempt_count} attempts"
+
+class StatCounter(models.Model):
+    """Site-wide running total (users, quizzes, attempts) maintained by core.analytics."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class ContentVersion(models.Model):
+    """When a group of public content last changed; the basis of HTTP validators (see core.versions)."""
+    name = models.CharField(max_length=50, unique=True)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} changed {self.changed_at}"
+
+class LeaderboardEntry(models.Model):
+    """A user's best result on one quiz, or their summed best scores when quiz is null (global board)."""
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, null=True, blank=True, related_name='leaderboard')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    best_score = models.IntegerField(default=0)
+    achieved_at = models.DateTimeField()  # when best_score was first reached; earlier wins ties
+
+    class Meta:
+        indexes = [models.Index(fields=['quiz', '-best_score', 'achieved_at', 'user'])]
+        constraints = [
+            models.UniqueConstraint(fields=['quiz', 'user'], name='unique_quiz_leaderboard_entry'),
+            models.UniqueConstraint(fields=['user'], condition=models.Q(quiz__isnull=True), name='unique_global_leaderboard_entry'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} on {self.quiz_id or 'all quizzes'}: {self.best_score}"
+
+class LeaderboardBucket(models.Model):
+    """Number of users on a board holding a given best score, so ranks never count the entry table."""
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, null=True, blank=True, related_name='leaderboard_buckets')
+    score = models.IntegerField()
+    users = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['quiz', 'score'], name='unique_quiz_leaderboard_bucket'),
+            models.UniqueConstraint(fields=['score'], condition=models.Q(quiz__isnull=True), name='unique_global_leaderboard_bucket'),
+        ]
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
@@ -79,19 +195,117 @@ class Blog(models.Model):
     tags = models.ManyToManyField(Tag, related_name='blogs', blank=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blogs', default = 1)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by toggle_blog_reaction and core.comments; `manage.py repair_blog_counters` recomputes them.
+    like_count = models.PositiveIntegerField(default=0)
+    dislike_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['-created_at', 'id'])]  # blog list keyset pagination
 
     def __str__(self):
         return self.title
 
+class BlogTerm(models.Model):
+    """One non-zero entry of a blog's unit-length feature vector (see core.related)."""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=100)  # 'tag:<id>' or 'title:<word>'
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['blog', 'term'], name='unique_blog_term')]
+        indexes = [models.Index(fields=['term'])]
+
+class RelatedBlog(models.Model):
+    """A blog's top-K most similar blogs, best first; maintained by core.related."""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['blog', 'related'], name='unique_related_blog')]
+        indexes = [models.Index(fields=['blog', 'rank'])]
+
 class Comment(models.Model):
     blog = models.ForeignKey('Blog', related_name='comments', on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['blog', 'created_at', 'id'])]  # comment thread keyset pagination
+
     def __str__(self):
         return f'Comment by {self.user.username} on {self.blog.title}'
 
+class OutboundEmail(models.Model):
+    """Email waiting to be sent by `manage.py send_queued_email`."""
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+    KIND_CHOICES = (
+        ('comment', 'Comment notification'),
+        ('contact', 'Contact form'),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.TextField()  # comma separated
+    digest_key = models.CharField(max_length=100, blank=True)  # messages sharing a key may be merged
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_by = models.CharField(max_length=32, null=True, blank=True)  # token of the worker sending it, see core.mail
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipients} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, kind, subject, body, recipients, from_email=None, digest_key=''):
+        return cls.objects.create(
+            kind=kind,
+            subject=subject[:255],
+            body=body,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=','.join(recipients),
+            digest_key=digest_key,
+        )
+
+    @property
+    def recipient_list(self):
+        return [address for address in self.recipients.split(',') if address]
+
+class ProcessedImage(models.Model):
+    """Resized variants of one uploaded image, rendered by `manage.py process_images` (see core.images)."""
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+    name = models.CharField(max_length=255, unique=True)  # storage name of the original, e.g. blogs/cat.jpg
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    variants = models.TextField(blank=True)  # JSON list of {size, format, name, width, height}
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
 @receiver(post_save, sender=Comment)
 def notify_author_on_comment(sender, instance, created, **kwargs):
     if created:
@@ -99,12 +313,12 @@ def notify_author_on_comment(sender, instance, created, **kwargs):
         author_email = blog.author.email if blog.author.email else None
 
         if author_email:
-            send_mail(
+            OutboundEmail.enqueue(
+                kind='comment',
                 subject=f"New Comment on: {blog.title}",
-                message=f"{instance.user.username} commented:\n\n{instance.content}",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[author_email],
-                fail_silently=True,
+                body=f"{instance.user.username} commented:\n\n{instance.content}",
+                recipients=[author_email],
+                digest_key=f"comment-author:{blog.author_id}",
             )
 
 class BlogReaction(models.Model):
@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination.
+
+A page is fetched with ``WHERE (sort keys) > (last row's keys) ORDER BY ...
+LIMIT n + 1`` instead of ``OFFSET``, so deep pages cost the same as the first
+one. Cursors are the boundary row's sort values, signed so they are opaque to
+clients and cannot be forged into arbitrary filters.
+"""
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'core.pagination'
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def _fields(queryset, ordering):
+    return [(key.lstrip('-'), key.startswith('-'), queryset.model._meta.get_field(key.lstrip('-')))
+            for key in ordering]
+
+
+def encode_cursor(obj, fields):
+    return signing.dumps([field.value_to_string(obj) for _, _, field in fields], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor, fields):
+    """Return the sort values stored in ``cursor``, or None when it is invalid."""
+    try:
+        values = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    try:
+        return [field.to_python(value) for value, (_, _, field) in zip(values, fields)]
+    except Exception:
+        return None
+
+
+def _after(fields, values, backwards):
+    """Q matching rows strictly after ``values`` in sort order (before them, if ``backwards``)."""
+    condition = Q()
+    for position, (name, descending, _) in enumerate(fields):
+        lookup = 'lt' if descending != backwards else 'gt'
+        term = Q(**{f'{name}__{lookup}': values[position]})
+        for (previous_name, _, _), previous_value in zip(fields[:position], values[:position]):
+            term &= Q(**{previous_name: previous_value})
+        condition |= term
+    # Redundant with the OR above, but gives the database a range on the leading index column
+    name, descending, _ = fields[0]
+    bound = Q(**{f'{name}__{"lte" if descending != backwards else "gte"}': values[0]})
+    return bound & condition
+
+
+def paginate_keyset(request, queryset, ordering, per_page):
+    """
+    Return a KeysetPage of ``queryset`` sorted by ``ordering`` (field names,
+    '-' for descending; the last one must be unique, e.g. 'id'). Reads
+    ``?after=`` / ``?before=`` cursors from the request.
+    """
+    fields = _fields(queryset, ordering)
+    after = decode_cursor(request.GET['after'], fields) if request.GET.get('after') else None
+    before = decode_cursor(request.GET['before'], fields) if request.GET.get('before') else None
+
+    if before is not None:
+        reverse_ordering = [key[1:] if key.startswith('-') else f'-{key}' for key in ordering]
+        rows = list(queryset.filter(_after(fields, before, backwards=True)).order_by(*reverse_ordering)[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return KeysetPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1], fields) if rows else None,
+            previous_cursor=encode_cursor(rows[0], fields) if rows and has_more else None,
+        )
+
+    if after is not None:
+        queryset = queryset.filter(_after(fields, after, backwards=False))
+    rows = list(queryset.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], fields) if rows and has_more else None,
+        previous_cursor=encode_cursor(rows[0], fields) if rows and after is not None else None,
+    )
@@ -0,0 +1,146 @@
+import random
+import secrets
+from collections import namedtuple
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Quiz, Question, Option
+
+# Immutable, picklable view of a quiz used by the start/attempt/result flow.
+# Built once per quiz and kept in the cache until a Quiz/Question/Option row
+# belonging to it is saved or deleted.
+QuizSnapshot = namedtuple('QuizSnapshot', [
+    'id', 'title', 'status', 'questions_per_attempt', 'question_ids', 'questions', 'questions_by_id',
+    'correct_option_ids', 'option_questions',
+])
+QuestionSnapshot = namedtuple('QuestionSnapshot', ['id', 'text', 'options'])
+OptionSnapshot = namedtuple('OptionSnapshot', ['id', 'text'])
+
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 24
+DRAW_SALT = 'core.quiz_cache.draw'
+
+
+def snapshot_cache_key(quiz_id):
+    return f'quiz_snapshot:v2:{quiz_id}'
+
+
+def build_quiz_snapshot(quiz_id):
+    quiz = Quiz.objects.filter(pk=quiz_id).values('id', 'title', 'status', 'questions_per_attempt').first()
+    if quiz is None:
+        return None
+
+    question_rows = Question.objects.filter(quiz_id=quiz_id).order_by('id').values_list('id', 'text')
+    option_rows = (
+        Option.objects.filter(question__quiz_id=quiz_id)
+        .order_by('question_id', 'id')
+        .values_list('id', 'question_id', 'text', 'is_correct')
+    )
+
+    options_by_question = {}
+    correct_option_ids = {}
+    option_questions = {}
+    for option_id, question_id, text, is_correct in option_rows:
+        options_by_question.setdefault(question_id, []).append(OptionSnapshot(option_id, text))
+        option_questions[option_id] = question_id
+        if is_correct:
+            correct_option_ids.setdefault(question_id, set()).add(option_id)
+
+    questions = tuple(
+        QuestionSnapshot(qid, text, tuple(options_by_question.get(qid, ())))
+        for qid, text in question_rows
+    )
+    return QuizSnapshot(
+        id=quiz['id'],
+        title=quiz['title'],
+        status=quiz['status'],
+        questions_per_attempt=quiz['questions_per_attempt'],
+        question_ids=tuple(q.id for q in questions),
+        questions=questions,
+        questions_by_id={q.id: q for q in questions},
+        correct_option_ids={qid: frozenset(oids) for qid, oids in correct_option_ids.items()},
+        option_questions=option_questions,
+    )
+
+
+def get_quiz_snapshot(quiz_id):
+    key = snapshot_cache_key(quiz_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_quiz_snapshot(quiz_id)
+        if snapshot is not None:
+            cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_quiz_snapshot(quiz_id):
+    cache.delete(snapshot_cache_key(quiz_id))
+
+
+def new_draw_seed():
+    return secrets.randbits(31)
+
+
+def draw_question_ids(snapshot, seed):
+    """
+    The questions an attempt asks, in order: a sample of
+    ``questions_per_attempt`` ids (the whole bank when unset) taken from the
+    cached id tuple with ``random.Random(seed)``. Any worker given the same
+    seed and snapshot draws the same list; the cost depends on the number
+    drawn, not the bank size. ``seed=None`` keeps the bank order (attempts
+    started before draws were seeded).
+    """
+    if seed is None:
+        return list(snapshot.question_ids)
+    count = min(snapshot.questions_per_attempt or len(snapshot.question_ids), len(snapshot.question_ids))
+    return random.Random(seed).sample(snapshot.question_ids, count)
+
+
+def draw_questions(snapshot, seed):
+    return [snapshot.questions_by_id[qid] for qid in draw_question_ids(snapshot, seed)]
+
+
+def draw_token(snapshot, seed):
+    # Whole-quiz mode hands the seed to the client, signed so it cannot pick its own questions
+    return signing.dumps([snapshot.id, seed], salt=DRAW_SALT)
+
+
+def read_draw_token(snapshot, token):
+    """The seed in ``token`` if it is valid for this quiz, else None."""
+    try:
+        quiz_id, seed = signing.loads(token or '', salt=DRAW_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return seed if quiz_id == snapshot.id and isinstance(seed, int) else None
+
+
+def is_correct_option(snapshot, question_id, option_id):
+    return option_id in snapshot.correct_option_ids.get(question_id, ())
+
+
+def option_belongs_to(snapshot, question_id, option_id):
+    return snapshot.option_questions.get(option_id) == question_id
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_snapshot_on_quiz_change(sender, instance, **kwargs):
+    invalidate_quiz_snapshot(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_snapshot_on_question_change(sender, instance, **kwargs):
+    invalidate_quiz_snapshot(instance.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=Option)
+def invalidate_snapshot_on_option_change(sender, instance, **kwargs):
+    # Options are usually created with their question instance (admin_add_question,
+    # admin inlines), so the FK cache normally answers without a query
+    if Option.question.is_cached(instance):
+        quiz_id = instance.question.quiz_id
+    else:
+        quiz_id = Question.objects.filter(pk=instance.question_id).values_list('quiz_id', flat=True).first()
+    if quiz_id is not None:
+        invalidate_quiz_snapshot(quiz_id)
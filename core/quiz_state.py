@@ -0,0 +1,233 @@
+"""
+Storage for quizzes in progress, keyed by (user, quiz).
+
+The step-by-step flow used to keep its state in request.session, so every
+answer rewrote the whole session row and two open quizzes shared one set of
+keys. A state here is just the draw seed and the current question index,
+plus the answers given so far. Each step writes only what changed. The
+backend is chosen with settings.QUIZ_STATE_BACKEND:
+
+- 'db' (default): one QuizProgress row per (user, quiz). Each step is a
+  single UPDATE that appends the answer. ``manage.py purge_quiz_state``
+  deletes expired rows.
+- 'cache': a small header key plus one key per answered question. The cache
+  timeout expires abandoned attempts. Only use this with a cache shared by
+  all workers.
+- 'cookie': a signed cookie per quiz. No server-side writes, but the views
+  must pass their response through ``store.commit()``.
+
+States expire QUIZ_STATE_TTL seconds after the last step.
+
+``finish(quiz_id, seed)`` ends a run and returns True for exactly one
+caller, so a double submit records one Attempt. Call it in the same
+transaction as the write. The 'db' backend guards with a conditional
+DELETE of the progress row. The other two backends guard with an atomic
+``cache.add`` of a per-run key, so they need a cache shared by all workers.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from .models import QuizProgress
+
+QuizState = namedtuple('QuizState', ['seed', 'index'])
+
+DEFAULT_TTL = 60 * 60 * 6
+COOKIE_SALT = 'core.quiz_state'
+
+
+def state_ttl():
+    return getattr(settings, 'QUIZ_STATE_TTL', DEFAULT_TTL)
+
+
+class DatabaseQuizStateStore:
+    def __init__(self, request):
+        self.user_id = request.user.pk
+
+    def rows(self, quiz_id):
+        return QuizProgress.objects.filter(user_id=self.user_id, quiz_id=quiz_id)
+
+    def expiry(self):
+        return timezone.now() + timedelta(seconds=state_ttl())
+
+    def get(self, quiz_id):
+        row = self.rows(quiz_id).filter(expires_at__gt=timezone.now()).values_list('seed', 'question_index').first()
+        return QuizState(*row) if row else None
+
+    def answers(self, quiz_id, state, question_ids):
+        text = self.rows(quiz_id).filter(seed=state.seed).values_list('answers', flat=True).first() or ''
+        answers = dict(pair.split(':') for pair in text.split(',') if pair)
+        wanted = set(map(str, question_ids))
+        return {qid: int(oid) for qid, oid in answers.items() if qid in wanted}
+
+    def start(self, quiz_id, seed):
+        fields = {'seed': seed, 'question_index': 0, 'answers': '', 'expires_at': self.expiry()}
+        if not self.rows(quiz_id).update(**fields):
+            try:
+                with transaction.atomic():
+                    QuizProgress.objects.create(user_id=self.user_id, quiz_id=quiz_id, **fields)
+            except IntegrityError:  # a concurrent start created the row first
+                self.rows(quiz_id).update(**fields)
+        return QuizState(seed, 0)
+
+    def advance(self, quiz_id, state, question_id=None, option_id=None):
+        changes = {'question_index': F('question_index') + 1, 'expires_at': self.expiry()}
+        if question_id is not None:
+            changes['answers'] = Concat(F('answers'), Value(f'{question_id}:{option_id},'), output_field=TextField())
+        self.rows(quiz_id).filter(seed=state.seed).update(**changes)
+
+    def clear(self, quiz_id):
+        self.rows(quiz_id).delete()
+
+    def finish(self, quiz_id, seed):
+        deleted, _ = self.rows(quiz_id).filter(seed=seed, expires_at__gt=timezone.now()).delete()
+        return deleted > 0
+
+    def commit(self, response):
+        return response
+
+
+def claim_run(user_id, quiz_id, seed):
+    """True for the first caller to finish this run; the key outlives any state of it."""
+    return cache.add(f'quiz_state:{user_id}:{quiz_id}:{seed}:finished', True, state_ttl())
+
+
+class CacheQuizStateStore:
+    def __init__(self, request):
+        self.user_id = request.user.pk
+
+    def key(self, quiz_id):
+        return f'quiz_state:{self.user_id}:{quiz_id}'
+
+    def answer_key(self, quiz_id, state, question_id):
+        # The seed scopes answer keys to one run, so a restart never sees stale answers
+        return f'quiz_state:{self.user_id}:{quiz_id}:{state.seed}:{question_id}'
+
+    def get(self, quiz_id):
+        value = cache.get(self.key(quiz_id))
+        return QuizState(*value) if value else None
+
+    def answers(self, quiz_id, state, question_ids):
+        keys = {self.answer_key(quiz_id, state, qid): str(qid) for qid in question_ids}
+        return {keys[key]: oid for key, oid in cache.get_many(list(keys)).items()}
+
+    def start(self, quiz_id, seed):
+        state = QuizState(seed, 0)
+        cache.set(self.key(quiz_id), tuple(state), state_ttl())
+        return state
+
+    def advance(self, quiz_id, state, question_id=None, option_id=None):
+        values = {self.key(quiz_id): (state.seed, state.index + 1)}
+        if question_id is not None:
+            values[self.answer_key(quiz_id, state, question_id)] = option_id
+        cache.set_many(values, state_ttl())
+
+    def clear(self, quiz_id):
+        cache.delete(self.key(quiz_id))
+
+    def finish(self, quiz_id, seed):
+        state = self.get(quiz_id)
+        if state is None or state.seed != seed or not claim_run(self.user_id, quiz_id, seed):
+            return False
+        self.clear(quiz_id)
+        return True
+
+    def commit(self, response):
+        return response
+
+
+class CookieQuizStateStore:
+    def __init__(self, request):
+        self.request = request
+        self.user_id = request.user.pk
+        self.pending = {}  # cookie name -> signed value, or None to delete
+
+    def cookie_name(self, quiz_id):
+        return f'quiz_state_{quiz_id}'
+
+    def load(self, quiz_id):
+        name = self.cookie_name(quiz_id)
+        if name in self.pending:
+            return self.pending[name] and signing.loads(self.pending[name], salt=COOKIE_SALT)
+        try:
+            data = signing.loads(self.request.COOKIES.get(name, ''), salt=COOKIE_SALT, max_age=state_ttl())
+        except signing.BadSignature:
+            return None
+        return data if data.get('user') == self.user_id else None
+
+    def save(self, quiz_id, data):
+        self.pending[self.cookie_name(quiz_id)] = signing.dumps(data, salt=COOKIE_SALT, compress=True)
+
+    def get(self, quiz_id):
+        data = self.load(quiz_id)
+        return QuizState(data['seed'], data['index']) if data else None
+
+    def answers(self, quiz_id, state, question_ids):
+        data = self.load(quiz_id) or {}
+        wanted = set(map(str, question_ids))
+        return {qid: oid for qid, oid in data.get('answers', {}).items() if qid in wanted}
+
+    def start(self, quiz_id, seed):
+        self.save(quiz_id, {'user': self.user_id, 'seed': seed, 'index': 0, 'answers': {}})
+        return QuizState(seed, 0)
+
+    def advance(self, quiz_id, state, question_id=None, option_id=None):
+        data = self.load(quiz_id)
+        if not data or data['seed'] != state.seed:
+            return
+        data['index'] += 1
+        if question_id is not None:
+            data['answers'][str(question_id)] = option_id
+        self.save(quiz_id, data)
+
+    def clear(self, quiz_id):
+        self.pending[self.cookie_name(quiz_id)] = None
+
+    def finish(self, quiz_id, seed):
+        # The cookie comes back with every double submit, so the guard has to live server-side
+        state = self.get(quiz_id)
+        if state is None or state.seed != seed or not claim_run(self.user_id, quiz_id, seed):
+            return False
+        self.clear(quiz_id)
+        return True
+
+    def commit(self, response):
+        for name, value in self.pending.items():
+            if value is None:
+                response.delete_cookie(name)
+            else:
+                response.set_cookie(
+                    name, value, max_age=state_ttl(), httponly=True,
+                    secure=settings.SESSION_COOKIE_SECURE, samesite='Lax',
+                )
+        self.pending = {}
+        return response
+
+
+BACKENDS = {
+    'db': DatabaseQuizStateStore,
+    'cache': CacheQuizStateStore,
+    'cookie': CookieQuizStateStore,
+}
+
+
+def quiz_state_store(request):
+    """The configured store bound to ``request`` (one instance per request)."""
+    store = getattr(request, '_quiz_state_store', None)
+    if store is None:
+        backend = getattr(settings, 'QUIZ_STATE_BACKEND', 'db')
+        store = request._quiz_state_store = BACKENDS.get(backend, DatabaseQuizStateStore)(request)
+    return store
+
+
+def purge_expired():
+    """Delete expired 'db' backend rows. Returns how many were removed."""
+    deleted, _ = QuizProgress.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
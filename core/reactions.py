@@ -0,0 +1,53 @@
+"""
+Blog.like_count and Blog.dislike_count, kept in step by BlogReaction receivers.
+
+As with comment_count (see core/comments.py), every reaction created,
+switched or deleted adjusts the counters with one UPDATE ... SET x = x +/- 1,
+so reactions removed by a cascade (a deleted user, say) are counted too.
+Decrements stop at 0. Bulk writes skip signals, and
+``manage.py repair_blog_counters`` recomputes the counters.
+"""
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Blog, BlogReaction
+
+
+def counter_field(is_like):
+    return 'like_count' if is_like else 'dislike_count'
+
+
+def adjust_counters(blog_id, add=None, remove=None):
+    """Count one more ``add`` reaction and one fewer ``remove`` one (True = like, None = neither)."""
+    changes = {}
+    if add is not None:
+        changes[counter_field(add)] = F(counter_field(add)) + 1
+    if remove is not None:
+        changes[counter_field(remove)] = Greatest(F(counter_field(remove)) - 1, 0)
+    if changes:
+        Blog.objects.filter(pk=blog_id).update(**changes)
+
+
+@receiver(post_init, sender=BlogReaction)
+def remember_reaction(sender, instance, **kwargs):
+    # The stored value tells post_save whether a save switched the reaction.
+    # Read from __dict__ so a deferred field is not loaded here.
+    instance._stored_is_like = instance.__dict__.get('is_like') if instance.pk else None
+
+
+@receiver(post_save, sender=BlogReaction)
+def count_reaction(sender, instance, created, **kwargs):
+    stored = getattr(instance, '_stored_is_like', None)
+    if created:
+        adjust_counters(instance.blog_id, add=instance.is_like)
+    elif stored is not None and stored != instance.is_like:
+        adjust_counters(instance.blog_id, add=instance.is_like, remove=stored)
+    instance._stored_is_like = instance.is_like
+
+
+@receiver(post_delete, sender=BlogReaction)
+def uncount_reaction(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored_is_like', None)
+    adjust_counters(instance.blog_id, remove=instance.is_like if stored is None else stored)
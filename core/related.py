@@ -0,0 +1,265 @@
+"""
+Related blogs scored by weighted tag overlap and title-term similarity.
+
+Each blog becomes a sparse vector. Its tags contribute 'tag:<id>' entries
+of weight TAG_WEIGHT, and each word of its title contributes a
+'title:<word>' entry of weight TITLE_WEIGHT. Entries are scaled by inverse
+document frequency and the vector is normalized to unit length, so the
+similarity of two blogs is the dot product of their vectors (their cosine).
+
+BlogTerm stores the non-zero entries and doubles as an inverted index. Only
+blogs sharing a term with X can score above zero against it. RelatedBlog
+keeps each blog's RELATED_COUNT best matches, so blog_detail reads them
+with one query.
+
+Saving a blog or changing its tags re-vectorizes that blog and updates
+only the lists it can affect:
+- its own list;
+- the lists that contained it, which are recomputed;
+- the lists of blogs sharing a term with it, which it may now enter.
+
+Other blogs keep the IDF weights from when they were last indexed. Bulk
+writes skip signals. ``manage.py rebuild_related_blogs`` recomputes
+everything, which fixes both.
+
+Every id and term lookup goes through ``filter_in_chunks`` (see
+core/importers.py), because a popular tag can put more blogs into one
+update than SQLite allows bound parameters.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .importers import IN_LOOKUP_CHUNK_SIZE, batched, filter_in_chunks
+from .models import Blog, BlogTerm, RelatedBlog, Tag
+
+RELATED_COUNT = 3
+TAG_WEIGHT = 2.0
+TITLE_WEIGHT = 1.0
+MIN_WORD_LENGTH = 3
+WORD_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'the and for with from that this these those your you are was were how what why when who which into '
+    'about over under not but its our out can use using all any more most some than then them they will'.split()
+)
+
+
+def title_words(title):
+    return [word for word in WORD_RE.findall(title.lower()) if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS]
+
+
+def raw_features(title, tag_ids):
+    features = Counter()
+    for word in title_words(title):
+        features[f'title:{word}'] += TITLE_WEIGHT
+    for tag_id in tag_ids:
+        features[f'tag:{tag_id}'] = TAG_WEIGHT
+    return features
+
+
+def idf(document_frequency, blog_count):
+    # Smoothed, so a term every blog shares still counts a little
+    return math.log((1 + blog_count) / (1 + document_frequency)) + 1.0
+
+
+def unit_vector(features, frequencies, blog_count):
+    vector = {term: weight * idf(frequencies.get(term, 0), blog_count) for term, weight in features.items()}
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {term: value / norm for term, value in vector.items()} if norm else {}
+
+
+def best_matches(blog_id, scores):
+    """The RELATED_COUNT best (score, other_id) pairs, newest blog first on ties."""
+    return heapq.nlargest(RELATED_COUNT, (
+        (round(score, 9), other_id) for other_id, score in scores.items() if other_id != blog_id and score > 0
+    ))
+
+
+def blog_features(blog_ids):
+    titles = dict(filter_in_chunks(Blog.objects.values_list('pk', 'title'), 'pk', blog_ids))
+    tag_ids = defaultdict(list)
+    for blog_id, tag_id in filter_in_chunks(Blog.tags.through.objects.values_list('blog_id', 'tag_id'), 'blog_id', titles):
+        tag_ids[blog_id].append(tag_id)
+    return {pk: raw_features(title, tag_ids[pk]) for pk, title in titles.items()}
+
+
+def similarity_scores(blog_ids):
+    """{blog_id: {other_id: cosine}} for ``blog_ids`` against every blog, from the stored vectors."""
+    vectors = defaultdict(dict)
+    rows = BlogTerm.objects.values_list('blog_id', 'term', 'weight')
+    for blog_id, term, weight in filter_in_chunks(rows, 'blog_id', blog_ids):
+        vectors[blog_id][term] = weight
+    postings = defaultdict(list)
+    terms = set().union(*vectors.values()) if vectors else set()
+    for blog_id, term, weight in filter_in_chunks(rows, 'term', terms):
+        postings[term].append((blog_id, weight))
+
+    scores = {}
+    for blog_id in blog_ids:
+        totals = defaultdict(float)
+        for term, weight in vectors[blog_id].items():
+            for other_id, other_weight in postings[term]:
+                totals[other_id] += weight * other_weight
+        scores[blog_id] = totals
+    return scores
+
+
+def write_lists(lists):
+    for chunk in batched(lists, IN_LOOKUP_CHUNK_SIZE):
+        RelatedBlog.objects.filter(blog_id__in=chunk).delete()
+    RelatedBlog.objects.bulk_create([
+        RelatedBlog(blog_id=blog_id, related_id=other_id, score=score, rank=rank)
+        for blog_id, matches in lists.items()
+        for rank, (score, other_id) in enumerate(matches)
+    ], batch_size=500)
+
+
+def refresh_lists(blog_ids):
+    """Recompute the lists of ``blog_ids`` from the stored vectors."""
+    blog_ids = set(filter_in_chunks(Blog.objects.values_list('pk', flat=True), 'pk', blog_ids))
+    if blog_ids:
+        write_lists({blog_id: best_matches(blog_id, scores) for blog_id, scores in similarity_scores(blog_ids).items()})
+
+
+def index_blogs(blog_ids):
+    """Re-vectorize ``blog_ids`` and update every related list that can change because of them."""
+    features = blog_features(set(blog_ids))
+    if not features:
+        return
+    stored = defaultdict(set)
+    for blog_id, term in filter_in_chunks(BlogTerm.objects.values_list('blog_id', 'term'), 'blog_id', features):
+        stored[blog_id].add(term)
+    # A save that changed neither the title words nor the tags leaves every score as it was
+    changed = {blog_id for blog_id, terms in features.items() if set(terms) != stored[blog_id]}
+    if not changed:
+        return
+
+    with transaction.atomic():
+        all_terms = set().union(*(features[blog_id] for blog_id in changed))
+        frequencies = Counter(dict(filter_in_chunks(
+            BlogTerm.objects.values('term').annotate(blogs=Count('id')).values_list('term', 'blogs'),
+            'term', all_terms,
+        )))
+        # Swap the changed blogs' stored terms for their new ones
+        for blog_id in changed:
+            frequencies.subtract(stored[blog_id] & all_terms)
+            frequencies.update(features[blog_id].keys())
+        blog_count = Blog.objects.count()
+
+        for chunk in batched(changed, IN_LOOKUP_CHUNK_SIZE):
+            BlogTerm.objects.filter(blog_id__in=chunk).delete()
+        BlogTerm.objects.bulk_create([
+            BlogTerm(blog_id=blog_id, term=term, weight=weight)
+            for blog_id in changed
+            for term, weight in unit_vector(features[blog_id], frequencies, blog_count).items()
+        ], batch_size=500)
+
+        scores = similarity_scores(changed)
+        lists = {blog_id: best_matches(blog_id, scores[blog_id]) for blog_id in changed}
+
+        # Lists that held a changed blog may need their next-best match: recompute them
+        stale = set(filter_in_chunks(
+            RelatedBlog.objects.values_list('blog_id', flat=True), 'related_id', changed,
+        )) - changed
+        lists.update({blog_id: best_matches(blog_id, totals) for blog_id, totals in similarity_scores(stale).items()})
+
+        # Any other blog sharing a term can only gain a changed blog (scores are symmetric)
+        offers = defaultdict(dict)
+        for blog_id in changed:
+            for other_id, score in scores[blog_id].items():
+                if other_id not in changed and other_id not in stale:
+                    offers[other_id][blog_id] = score
+        current = defaultdict(dict)
+        for blog_id, related_id, score in filter_in_chunks(
+            RelatedBlog.objects.values_list('blog_id', 'related_id', 'score'), 'blog_id', offers,
+        ):
+            current[blog_id][related_id] = score
+        for blog_id, offered in offers.items():
+            matches = best_matches(blog_id, {**current[blog_id], **offered})
+            if {other_id for _, other_id in matches} != set(current[blog_id]):
+                lists[blog_id] = matches
+
+        write_lists(lists)
+
+
+def rebuild_related_blogs():
+    """Recompute every vector and every list from scratch. Returns the number of blogs indexed."""
+    features = blog_features(Blog.objects.values_list('pk', flat=True))
+    frequencies = Counter(term for terms in features.values() for term in terms)
+    vectors = {blog_id: unit_vector(terms, frequencies, len(features)) for blog_id, terms in features.items()}
+    postings = defaultdict(list)
+    for blog_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((blog_id, weight))
+
+    lists = {}
+    for blog_id, vector in vectors.items():
+        totals = defaultdict(float)
+        for term, weight in vector.items():
+            for other_id, other_weight in postings[term]:
+                totals[other_id] += weight * other_weight
+        lists[blog_id] = best_matches(blog_id, totals)
+
+    with transaction.atomic():
+        BlogTerm.objects.all().delete()
+        BlogTerm.objects.bulk_create([
+            BlogTerm(blog_id=blog_id, term=term, weight=weight)
+            for blog_id, vector in vectors.items() for term, weight in vector.items()
+        ], batch_size=500)
+        RelatedBlog.objects.all().delete()
+        write_lists(lists)
+    return len(vectors)
+
+
+def related_blogs(blog_id):
+    """The precomputed related blogs of ``blog_id``, best first (one query)."""
+    return [
+        entry.related
+        for entry in RelatedBlog.objects.filter(blog_id=blog_id).select_related('related').order_by('rank')
+    ]
+
+
+@receiver(post_save, sender=Blog)
+def index_blog_on_save(sender, instance, **kwargs):
+    index_blogs([instance.pk])
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def index_blog_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # A reverse clear() does not report which blogs lose the tag.
+        instance._related_blog_ids = list(instance.blogs.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            index_blogs([instance.pk])
+        elif action == 'post_clear':
+            index_blogs(getattr(instance, '_related_blog_ids', []))
+        else:
+            index_blogs(pk_set)
+
+
+@receiver(pre_delete, sender=Blog)
+def remember_lists_on_blog_delete(sender, instance, **kwargs):
+    instance._related_list_ids = list(RelatedBlog.objects.filter(related=instance).values_list('blog_id', flat=True))
+
+
+@receiver(post_delete, sender=Blog)
+def refresh_lists_on_blog_delete(sender, instance, **kwargs):
+    # The cascade removed the deleted blog from these lists; refill them
+    refresh_lists(getattr(instance, '_related_list_ids', []))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_blogs_on_tag_delete(sender, instance, **kwargs):
+    instance._related_blog_ids = list(instance.blogs.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def index_blogs_on_tag_delete(sender, instance, **kwargs):
+    index_blogs(getattr(instance, '_related_blog_ids', []))
@@ -0,0 +1,61 @@
+"""
+Render the resized variants of one image file.
+
+``render_variants`` runs in the process pool of ``manage.py process_images``.
+It reads an original from MEDIA_ROOT and writes one file per (size, format)
+under ``variants/``. The sizes are thumb, card and full. The formats are
+WebP plus a fallback: JPEG, or PNG for images with transparency. Images are
+never upscaled. A size that would come out no wider than the one before it
+is skipped.
+
+This module only imports the standard library and Pillow, so it also works
+with the spawn start method.
+"""
+import os
+
+from PIL import Image, ImageOps, features
+
+VARIANT_DIR = 'variants'
+VARIANT_WIDTHS = (('thumb', 320), ('card', 640), ('full', 1600))  # narrowest first
+SAVE_OPTIONS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+
+def variant_name(name, size, image_format):
+    """Storage name of one variant of the original ``name``: variants/blogs/cat.jpg/card.webp."""
+    # The original's extension stays in the directory, so cat.jpg and cat.png do not share variants
+    return f'{VARIANT_DIR}/{name}/{size}.{EXTENSIONS[image_format]}'
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def render_variants(source_path, media_root, name):
+    """Write the variants of ``name`` (found at ``source_path``) under ``media_root`` and describe them."""
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        transparent = has_alpha(image)
+        image = image.convert('RGBA' if transparent else 'RGB')
+
+    formats = (['webp'] if features.check('webp') else []) + ['png' if transparent else 'jpeg']
+    variants = []
+    previous_width = 0
+    for size, target_width in VARIANT_WIDTHS:
+        width = min(target_width, image.width)
+        if width <= previous_width:
+            continue
+        previous_width = width
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for image_format in formats:
+            output = variant_name(name, size, image_format)
+            path = os.path.join(media_root, *output.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            resized.save(path, **SAVE_OPTIONS[image_format])
+            variants.append({'size': size, 'format': image_format, 'name': output, 'width': width, 'height': height})
+    return variants
@@ -0,0 +1,250 @@
+"""
+Full-text search over quizzes and blogs backed by SQLite FTS5.
+
+Two standalone FTS5 tables mirror the searchable text, keyed by the
+model's primary key (the FTS rowid). Model signals keep them in sync and
+``manage.py rebuild_search_index`` repopulates them from scratch. When the
+database is not SQLite or was built without FTS5, ``search_quizzes`` and
+``search_blogs`` fall back to ``icontains`` filtering.
+"""
+import re
+from functools import lru_cache
+from html import unescape
+
+from django.db import connection, transaction, OperationalError
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils.html import strip_tags
+
+from .models import Blog, Quiz, Tag
+
+BLOG_FTS_TABLE = 'core_blog_fts'
+QUIZ_FTS_TABLE = 'core_quiz_fts'
+
+# bm25() column weights, in table column order.
+BLOG_FTS_WEIGHTS = (10.0, 5.0, 1.0, 5.0)  # title, summary, content, tags
+QUIZ_FTS_WEIGHTS = (10.0, 1.0)  # title, description
+
+CREATE_TABLE_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {BLOG_FTS_TABLE} "
+    f"USING fts5(title, summary, content, tags, tokenize='porter unicode61')",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {QUIZ_FTS_TABLE} "
+    f"USING fts5(title, description, tokenize='porter unicode61')",
+]
+DROP_TABLE_SQL = [
+    f"DROP TABLE IF EXISTS {BLOG_FTS_TABLE}",
+    f"DROP TABLE IF EXISTS {QUIZ_FTS_TABLE}",
+]
+
+
+@lru_cache(maxsize=None)
+def fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if cursor.fetchone()[0]:
+                return True
+            # Some builds load FTS5 without advertising the compile option.
+            cursor.execute("CREATE VIRTUAL TABLE temp.core_fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.core_fts5_probe")
+            return True
+        except OperationalError:
+            return False
+
+
+@lru_cache(maxsize=None)
+def fts_tables_exist():
+    if not fts5_available():
+        return False
+    return BLOG_FTS_TABLE in connection.introspection.table_names()
+
+
+def search_enabled():
+    return fts_tables_exist()
+
+
+def create_fts_tables():
+    if not fts5_available():
+        return False
+    with connection.cursor() as cursor:
+        for sql in CREATE_TABLE_SQL:
+            cursor.execute(sql)
+    fts_tables_exist.cache_clear()
+    return True
+
+
+def plain_text(html):
+    return unescape(strip_tags(html or ''))
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def index_blogs(blog_ids):
+    blog_ids = list(blog_ids)
+    if not blog_ids or not search_enabled():
+        return
+    tags = {}
+    for blog_id, name in Blog.tags.through.objects.filter(blog_id__in=blog_ids).values_list('blog_id', 'tag__name'):
+        tags.setdefault(blog_id, []).append(name)
+    rows = [
+        (pk, title, plain_text(summary), plain_text(content), ' '.join(tags.get(pk, [])))
+        for pk, title, summary, content in Blog.objects.filter(pk__in=blog_ids).values_list('pk', 'title', 'summary', 'content')
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {BLOG_FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in blog_ids])
+        cursor.executemany(
+            f"INSERT INTO {BLOG_FTS_TABLE} (rowid, title, summary, content, tags) VALUES (%s, %s, %s, %s, %s)", rows
+        )
+
+
+def index_quizzes(quiz_ids):
+    quiz_ids = list(quiz_ids)
+    if not quiz_ids or not search_enabled():
+        return
+    rows = list(Quiz.objects.filter(pk__in=quiz_ids).values_list('pk', 'title', 'description'))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {QUIZ_FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in quiz_ids])
+        cursor.executemany(
+            f"INSERT INTO {QUIZ_FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+            [(pk, title, description or '') for pk, title, description in rows],
+        )
+
+
+def unindex(table, pk):
+    if search_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(batch_size=500):
+    if not create_fts_tables():
+        return False
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {BLOG_FTS_TABLE}")
+            cursor.execute(f"DELETE FROM {QUIZ_FTS_TABLE}")
+        blog_ids = list(Blog.objects.values_list('pk', flat=True))
+        for start in range(0, len(blog_ids), batch_size):
+            index_blogs(blog_ids[start:start + batch_size])
+        quiz_ids = list(Quiz.objects.values_list('pk', flat=True))
+        for start in range(0, len(quiz_ids), batch_size):
+            index_quizzes(quiz_ids[start:start + batch_size])
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {BLOG_FTS_TABLE}({BLOG_FTS_TABLE}) VALUES ('optimize')")
+            cursor.execute(f"INSERT INTO {QUIZ_FTS_TABLE}({QUIZ_FTS_TABLE}) VALUES ('optimize')")
+    return True
+
+
+class RankedResults:
+    """
+    Sliceable, countable result list for Paginator: each slice runs one
+    BM25-ordered FTS query for the page of ids, then loads those rows.
+    """
+
+    def __init__(self, model, table, weights, match):
+        self.model = model
+        self.table = table
+        self.weights = ', '.join(str(weight) for weight in weights)
+        self.match = match
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.table} WHERE {self.table} MATCH %s", [self.match])
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not isinstance(page, slice):
+            return self[page:page + 1][0]
+        offset = page.start or 0
+        limit = (page.stop - offset) if page.stop is not None else -1
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, {self.weights}) LIMIT %s OFFSET %s",
+                [self.match, limit, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        objects = self.model.objects.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+
+def search_quizzes(query):
+    match = fts_query(query)
+    if search_enabled():
+        if not match:
+            return []
+        return RankedResults(Quiz, QUIZ_FTS_TABLE, QUIZ_FTS_WEIGHTS, match)
+    return Quiz.objects.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    ).order_by('-created_at')
+
+
+def search_blogs(query):
+    match = fts_query(query)
+    if search_enabled():
+        if not match:
+            return []
+        return RankedResults(Blog, BLOG_FTS_TABLE, BLOG_FTS_WEIGHTS, match)
+    return Blog.objects.filter(
+        Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
+    ).distinct().order_by('-created_at')
+
+
+@receiver(post_save, sender=Blog)
+def index_blog_on_save(sender, instance, **kwargs):
+    index_blogs([instance.pk])
+
+
+@receiver(post_delete, sender=Blog)
+def unindex_blog_on_delete(sender, instance, **kwargs):
+    unindex(BLOG_FTS_TABLE, instance.pk)
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def index_blog_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # A reverse clear() does not report which blogs lose the tag.
+        instance._fts_blog_ids = list(instance.blogs.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            index_blogs([instance.pk])
+        elif action == 'post_clear':
+            index_blogs(getattr(instance, '_fts_blog_ids', []))
+        else:
+            index_blogs(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+def index_blogs_on_tag_save(sender, instance, created, **kwargs):
+    if not created:
+        index_blogs(instance.blogs.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_blogs_on_tag_delete(sender, instance, **kwargs):
+    instance._fts_blog_ids = list(instance.blogs.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def index_blogs_on_tag_delete(sender, instance, **kwargs):
+    index_blogs(getattr(instance, '_fts_blog_ids', []))
+
+
+@receiver(post_save, sender=Quiz)
+def index_quiz_on_save(sender, instance, **kwargs):
+    index_quizzes([instance.pk])
+
+
+@receiver(post_delete, sender=Quiz)
+def unindex_quiz_on_delete(sender, instance, **kwargs):
+    unindex(QUIZ_FTS_TABLE, instance.pk)
@@ -0,0 +1,138 @@
+"""
+Throughput and tail latency of the read-heavy views under WSGI and ASGI.
+
+Both modes run in this process against the same seeded database, so no
+HTTP server is needed. In WSGI mode, ``concurrency`` threads call
+Django's WSGIHandler, like a threaded WSGI server, with
+CONCURRENT_READS off. In ASGI mode, ``concurrency`` request coroutines
+share one event loop and call Django's ASGIHandler, with
+CONCURRENT_READS on, as quiz_project/asgi.py sets it. Each view gets
+one warm-up request first. Caches stay warm, as they would in
+production. The result reports requests per second plus median and p99
+latency for each (view, mode). Run it through
+``manage.py benchmark_serving``.
+"""
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from .benchmarks import VIEW_SPECS
+from .write_benchmark import percentile
+
+SERVED_VIEWS = ('home', 'blog_list', 'blog_detail', 'search')
+
+
+def view_url(name, dataset):
+    spec = VIEW_SPECS[name]
+    url = reverse(name, kwargs=spec.kwargs(dataset))
+    return url, spec.query
+
+
+def wsgi_request(handler, path, query):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1', 'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    statuses = []
+    started = time.perf_counter()
+    body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(statuses[0].split()[0]), (time.perf_counter() - started) * 1000
+
+
+async def asgi_request(application, path, query):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return statuses[0], (time.perf_counter() - started) * 1000
+
+
+def run_wsgi(path, query, requests, concurrency):
+    handler = WSGIHandler()
+    wsgi_request(handler, path, query)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: wsgi_request(handler, path, query), range(requests)))
+    return results, time.perf_counter() - started
+
+
+def run_asgi(path, query, requests, concurrency):
+    application = ASGIHandler()
+
+    async def main():
+        await asgi_request(application, path, query)
+        queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+        results = []
+
+        async def client():
+            while not queue.empty():
+                queue.get_nowait()
+                results.append(await asgi_request(application, path, query))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return results, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+MODES = {
+    'wsgi': (run_wsgi, False),
+    'asgi': (run_asgi, True),
+}
+
+
+def summarize(results, elapsed):
+    latencies = [ms for _, ms in results]
+    return {
+        'requests': len(results),
+        'errors': sum(1 for status, _ in results if status >= 500),
+        'requests_per_second': round(len(results) / elapsed, 1) if elapsed else 0.0,
+        'median_ms': round(statistics.median(latencies), 3) if latencies else 0.0,
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def run_serving_benchmark(dataset, requests=200, concurrency=8, names=None):
+    """Return {view name: {mode: summary}} for the read-heavy views."""
+    summaries = {}
+    for name in names or SERVED_VIEWS:
+        path, query = view_url(name, dataset)
+        summaries[name] = {}
+        for mode, (run, concurrent_reads) in MODES.items():
+            with override_settings(CONCURRENT_READS=concurrent_reads):
+                results, elapsed = run(path, query, requests, concurrency)
+            summaries[name][mode] = summarize(results, elapsed)
+    return summaries
@@ -0,0 +1,225 @@
+"""
+Static and media delivery without a CDN in front.
+
+Build step: with STATICFILES_STORAGE set to CompressedManifestStaticFilesStorage
+(settings_production does this), ``manage.py collectstatic`` writes
+content-hashed copies (css/style.3f2a91c0b4de.css) and staticfiles.json,
+the name -> hashed name manifest that {% static %} reads. It also writes
+.gz siblings, plus .br siblings when the optional ``brotli`` package is
+installed, for text assets that compress well.
+
+Serving: ``serve_static`` serves STATIC_ROOT. It picks the best
+precompressed sibling the client's Accept-Encoding allows, and marks hashed
+names immutable for a year. ``serve_media`` serves MEDIA_ROOT with
+single-range requests, so video/audio seeking and resumed downloads work.
+Both answer If-None-Match/If-Modified-Since with 304. ``urlpatterns()``
+routes them. Static files are only routed when SERVE_STATIC_FILES is on,
+since runserver serves them itself in development.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.txt', '.html', '.json', '.xml', '.ico', '.ttf', '.eot')
+MIN_COMPRESS_BYTES = 256
+MIN_SAVING = 0.05  # drop a sibling that is not at least 5% smaller
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))  # preferred first
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_CACHE_SECONDS = 60 * 60
+MEDIA_CACHE_SECONDS = 60 * 60 * 24
+RANGE_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def compress_file(path):
+    """Write the .gz (and .br) siblings of ``path``. Returns the encodings written."""
+    with open(path, 'rb') as source:
+        data = source.read()
+    written = []
+    candidates = [('gzip', '.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.append(('br', '.br', lambda: brotli.compress(data, quality=11)))
+    for encoding, suffix, compress in candidates:
+        compressed = compress()
+        if len(compressed) <= len(data) * (1 - MIN_SAVING):
+            with open(path + suffix, 'wb') as output:
+                output.write(compressed)
+            written.append(encoding)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also precompresses what it collects."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and not isinstance(processed, Exception):
+                for candidate in {name, hashed_name} - {None}:
+                    if self.is_compressible(candidate) and self.exists(candidate):
+                        compress_file(self.path(candidate))
+            yield name, hashed_name, processed
+
+    def is_compressible(self, name):
+        return name.lower().endswith(COMPRESSIBLE_EXTENSIONS) and self.size(name) >= MIN_COMPRESS_BYTES
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+@lru_cache(maxsize=1)
+def hashed_names():
+    """Every content-hashed name in the manifest; empty unless a manifest storage is configured."""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def resolve(root, path):
+    """Absolute path of ``path`` under ``root``, refusing traversal and directories."""
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(root, path)
+    except Exception:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return path, full_path
+
+
+def file_validators(full_path):
+    stat = os.stat(full_path)
+    return quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}'), int(stat.st_mtime), stat.st_size
+
+
+def not_modified_or_none(request, etag, last_modified):
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def serve_static(request, path):
+    path, full_path = resolve(settings.STATIC_ROOT, path)
+    if path.endswith(('.gz', '.br')):
+        raise Http404  # siblings are only served in place of their original
+
+    encoding, served_path = None, full_path
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            encoding, served_path = candidate, full_path + suffix
+            break
+
+    etag, last_modified, _ = file_validators(served_path)
+    response = not_modified_or_none(request, etag, last_modified)
+    if response is None:
+        content_type, _ = mimetypes.guess_type(full_path)
+        response = FileResponse(open(served_path, 'rb'), content_type=content_type or 'application/octet-stream')
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    if path in hashed_names():
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = f'public, max-age={STATIC_CACHE_SECONDS}'
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single 'bytes=' range, None to ignore the header, or 'invalid'."""
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None  # multiple ranges or another unit: answer with the whole file
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+def read_range(full_path, start, length):
+    with open(full_path, 'rb') as media_file:
+        media_file.seek(start)
+        while length > 0:
+            chunk = media_file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_media(request, path):
+    _, full_path = resolve(settings.MEDIA_ROOT, path)
+    etag, last_modified, size = file_validators(full_path)
+    response = not_modified_or_none(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and request.META.get('HTTP_IF_RANGE', etag) in (etag, http_date(last_modified)):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+
+    if byte_range == 'invalid':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(read_range(full_path, start, end - start + 1), status=206,
+                                         content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={MEDIA_CACHE_SECONDS}'
+    return response
+
+
+def prefix_pattern(url):
+    return r'^%s(?P<path>.*)$' % re.escape(url.lstrip('/'))
+
+
+def urlpatterns():
+    patterns = [re_path(prefix_pattern(settings.MEDIA_URL), serve_media, name='media')]
+    if getattr(settings, 'SERVE_STATIC_FILES', False):
+        patterns.insert(0, re_path(prefix_pattern(settings.STATIC_URL), serve_static, name='static'))
+    return patterns
@@ -0,0 +1,67 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from core.images import IMG_SRC_RE, IMG_TAG_RE, content_image_names, media_name, variants_for
+from core.renditions import VARIANT_WIDTHS
+
+register = template.Library()
+
+CARD_SIZES = '(min-width: 992px) 350px, (min-width: 768px) 33vw, 100vw'
+CONTENT_SIZES = '(min-width: 1200px) 1110px, 100vw'
+
+
+def srcset(variants, image_format):
+    return format_html_join(', ', '{} {}w', (
+        (default_storage.url(variant['name']), variant['width'])
+        for variant in variants if variant['format'] == image_format
+    ))
+
+
+def picture(variants, size, sizes, img_attributes):
+    """<picture> offering the WebP and fallback variants up to ``size`` ('thumb', 'card' or 'full')."""
+    allowed = [name for name, _ in VARIANT_WIDTHS]
+    allowed = allowed[:allowed.index(size) + 1]
+    variants = [variant for variant in variants if variant['size'] in allowed]
+    fallback = [variant for variant in variants if variant['format'] != 'webp']
+    webp = srcset(variants, 'webp')
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        format_html('<source type="image/webp" srcset="{}" sizes="{}">', webp, sizes) if webp else '',
+        default_storage.url(fallback[-1]['name']), srcset(fallback, fallback[-1]['format']), sizes, img_attributes,
+    )
+
+
+@register.simple_tag
+def responsive_image(image, alt='', css_class='', size='card', sizes=CARD_SIZES):
+    """
+    Render an ImageField file with srcset, using the variants ``attach_variants``
+    put on it. Falls back to the original until those are ready.
+    """
+    if not image:
+        return ''
+    attributes = format_html('class="{}" alt="{}" loading="lazy"', css_class, alt)
+    variants = getattr(image, 'variants', None)
+    if not variants:
+        return format_html('<img src="{}" {}>', image.url, attributes)
+    return picture(variants, size, sizes, attributes)
+
+
+@register.filter(is_safe=True)
+def responsive_content(html, sizes=CONTENT_SIZES):
+    """Give the CKEditor uploads embedded in trusted ``html`` WebP and resized variants (one query)."""
+    found = variants_for(content_image_names(html))
+    if not found:
+        return html
+
+    def replace(match):
+        tag = match.group(0)
+        src = IMG_SRC_RE.search(tag)
+        name = src and media_name(src.group(1))
+        if name not in found or 'srcset' in tag.lower():
+            return tag
+        attributes = mark_safe(IMG_SRC_RE.sub('', tag[len('<img'):].rstrip('/>')).strip())
+        return picture(found[name], 'full', sizes, attributes)
+
+    return mark_safe(IMG_TAG_RE.sub(replace, html))
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.analytics import counter_values, rebuild_rollups
+from core.models import Attempt, Category, QuizDailyStats, Quiz
+
+
+class DailyRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='General')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=category)
+        cls.other_quiz = Quiz.objects.create(title='Rivers', category=category)
+        cls.player = User.objects.create(username='player')
+        cls.rival = User.objects.create(username='rival')
+
+    def attempt(self, user, score, quiz=None):
+        return Attempt.objects.create(user=user, quiz=quiz or self.quiz, score=score, total=5)
+
+    def rollups(self):
+        return sorted(QuizDailyStats.objects.values_list(
+            'quiz_id', 'date', 'attempt_count', 'score_sum', 'perfect_count', 'unique_users',
+        ))
+
+    def assertMatchesRebuild(self):
+        incremental, counters = self.rollups(), counter_values()
+        rebuild_rollups()
+        # A rebuild drops days with no attempts left; the incremental rows stay at zero
+        self.assertEqual([row for row in incremental if row[2]], self.rollups())
+        self.assertEqual(counters, counter_values())
+
+    def test_repeat_attempts_count_the_user_once(self):
+        self.attempt(self.player, 3)
+        self.attempt(self.player, 5)
+        self.attempt(self.rival, 2)
+        (_, _, attempts, score_sum, perfect, users), = self.rollups()
+        self.assertEqual((attempts, score_sum, perfect, users), (3, 10, 1, 2))
+
+    def test_deleting_one_of_several_attempts_keeps_the_user(self):
+        self.attempt(self.player, 3)
+        self.attempt(self.player, 5).delete()
+        self.assertEqual(self.rollups()[0][2:], (1, 3, 0, 1))
+        self.assertMatchesRebuild()
+
+    def test_deleting_a_user_with_repeat_attempts(self):
+        self.attempt(self.player, 3)
+        self.attempt(self.player, 5)
+        self.attempt(self.player, 1, quiz=self.other_quiz)
+        self.attempt(self.rival, 2)
+        User.objects.get(pk=self.player.pk).delete()  # keep the shared test-data instance intact
+        self.assertEqual([(row[0],) + row[2:] for row in self.rollups()], [
+            (self.quiz.id, 1, 2, 0, 1),
+            (self.other_quiz.id, 0, 0, 0, 0),
+        ])
+        self.assertEqual(counter_values()['attempts'], 1)
+        self.assertMatchesRebuild()
+
+    def test_admin_can_delete_a_user_with_repeat_attempts(self):
+        self.attempt(self.player, 3)
+        self.attempt(self.player, 4)
+        staff = User.objects.create(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('delete_user', args=[self.player.id]))
+        self.assertRedirects(response, reverse('admin_manage_users'), fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(pk=self.player.pk).exists())
+        self.assertEqual(self.rollups()[0][2:], (0, 0, 0, 0))
+
+    def test_deleting_a_quiz_does_not_trip_the_constraints(self):
+        quiz = Quiz.objects.create(title='Lakes', category=self.quiz.category)
+        self.attempt(self.player, 3, quiz=quiz)
+        self.attempt(self.player, 4, quiz=quiz)
+        quiz.delete()
+        self.assertEqual(self.rollups(), [])
+        self.assertEqual(counter_values()['attempts'], 0)
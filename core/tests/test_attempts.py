@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.attempts import record_attempt
+from core.models import Answer, Attempt, Category, Option, Question, Quiz
+from core.quiz_cache import draw_question_ids, draw_token, get_quiz_snapshot
+from core.quiz_state import DatabaseQuizStateStore
+
+
+class QuizFixtureMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='player')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'))
+        cls.correct = {}
+        for n in range(3):
+            question = Question.objects.create(quiz=cls.quiz, text=f'Question {n}?')
+            cls.correct[question.id] = Option.objects.create(question=question, text='Right', is_correct=True).id
+            Option.objects.create(question=question, text='Wrong')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+
+class RecordAttemptTests(QuizFixtureMixin, TransactionTestCase):
+    # Not a TestCase: record_attempt's own transaction must be the outermost one to roll back on its own.
+    # serialized_rollback restores the rows the data migrations seed after each flush.
+    serialized_rollback = True
+
+    def setUp(self):
+        self.setUpTestData()
+        super().setUp()
+
+    def test_grades_and_keeps_only_valid_answers(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        first, second, third = snapshot.question_ids
+        other_question_option = self.correct[second]
+        attempt = record_attempt(self.user, snapshot, {
+            str(first): self.correct[first],          # right
+            str(second): 'not a number',              # malformed
+            str(third): other_question_option,        # an option of another question
+            '999999': self.correct[first],            # not in the draw
+        })
+        self.assertEqual((attempt.score, attempt.total), (1, 3))
+        self.assertEqual(list(Answer.objects.filter(attempt=attempt).values_list('question_id', flat=True)), [first])
+        self.assertEqual(attempt.question_order, ','.join(map(str, snapshot.question_ids)))
+
+    def test_attempt_and_answers_are_written_together(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        answers = {str(qid): oid for qid, oid in self.correct.items()}
+        with mock.patch('core.attempts.Answer.objects.bulk_create', side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                record_attempt(self.user, snapshot, answers)
+        self.assertFalse(Attempt.objects.exists())
+
+
+@override_settings(QUIZ_STATE_BACKEND='db')
+class StepByStepResultTests(QuizFixtureMixin, TestCase):
+    def answer_everything(self):
+        self.client.get(reverse('start_quiz', args=[self.quiz.id]))
+        for _ in self.correct:
+            response = self.client.get(reverse('attempt_quiz', args=[self.quiz.id]))
+            question_id = response.context['question'].id
+            self.client.post(reverse('attempt_quiz', args=[self.quiz.id]), {'option': self.correct[question_id]})
+
+    def test_result_records_one_attempt_however_often_it_is_loaded(self):
+        self.answer_everything()
+        for _ in range(2):
+            response = self.client.get(reverse('quiz_result', args=[self.quiz.id]))
+            self.assertEqual((response.context['score'], response.context['total_questions']), (3, 3))
+        self.assertEqual(Attempt.objects.count(), 1)
+        self.assertEqual(Answer.objects.count(), 3)
+
+    def test_a_submit_that_loses_the_race_records_nothing(self):
+        self.answer_everything()
+        request = RequestFactory().get('/')
+        request.user = self.user
+        state = DatabaseQuizStateStore(request).get(self.quiz.id)
+        self.client.get(reverse('quiz_result', args=[self.quiz.id]))
+        # A concurrent request read the run before the first one finished it
+        with mock.patch.object(DatabaseQuizStateStore, 'get', return_value=state):
+            response = self.client.get(reverse('quiz_result', args=[self.quiz.id]))
+        self.assertEqual(response.context['score'], 3)
+        self.assertEqual(Attempt.objects.count(), 1)
+
+
+class WholeQuizSubmitTests(QuizFixtureMixin, TestCase):
+    def fetch(self):
+        response = self.client.get(reverse('attempt_quiz_all', args=[self.quiz.id]), {'format': 'json'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def submit(self, body):
+        return self.client.post(reverse('attempt_quiz_all', args=[self.quiz.id]), body,
+                                content_type='application/json')
+
+    def test_json_round_trip(self):
+        served = self.fetch()
+        self.assertEqual(len(served['questions']), 3)
+        first = served['questions'][0]['id']
+        response = self.submit({'draw': served['draw'], 'answers': {str(first): self.correct[first]}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['score'], response.json()['total']), (1, 3))
+
+    def test_form_post_redirects_to_the_result(self):
+        served = self.fetch()
+        fields = {f'question_{qid}': oid for qid, oid in self.correct.items()}
+        response = self.client.post(reverse('attempt_quiz_all', args=[self.quiz.id]), {'draw': served['draw'], **fields})
+        self.assertRedirects(response, reverse('quiz_result', args=[self.quiz.id]))
+        self.assertEqual(Attempt.objects.get().score, 3)
+
+    def test_double_submit_records_one_attempt(self):
+        served = self.fetch()
+        body = {'draw': served['draw'], 'answers': {str(qid): oid for qid, oid in self.correct.items()}}
+        self.assertEqual(self.submit(body).status_code, 200)
+        self.assertEqual(self.submit(body).status_code, 409)
+        self.assertEqual(Attempt.objects.count(), 1)
+
+    def test_a_token_for_a_run_that_was_never_served_is_refused(self):
+        self.fetch()
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        forged = draw_token(snapshot, 12345)
+        self.assertEqual(self.submit({'draw': forged, 'answers': {}}).status_code, 409)
+        self.assertFalse(Attempt.objects.exists())
+
+    def test_limited_draws_need_a_valid_token(self):
+        Quiz.objects.filter(pk=self.quiz.pk).update(questions_per_attempt=2)
+        cache.clear()
+        served = self.fetch()
+        self.assertEqual(len(served['questions']), 2)
+        self.assertEqual(self.submit({'draw': served['draw'][:-2] + 'xx', 'answers': {}}).status_code, 400)
+        response = self.submit({'draw': served['draw'], 'answers': {}})
+        seed = Attempt.objects.get().seed
+        self.assertEqual([q['id'] for q in served['questions']],
+                         draw_question_ids(get_quiz_snapshot(self.quiz.id), seed))
+        self.assertEqual(response.json()['total'], 2)
@@ -0,0 +1,22 @@
+from django.test import TransactionTestCase
+
+from core.benchmarks import VIEW_SPECS, routed_view_names, run_benchmarks, seed_dataset
+
+
+class ViewQueryBudgetTests(TransactionTestCase):
+    # A TransactionTestCase so views' own transactions run as they do in production;
+    # inside TestCase's wrapping atomic they become savepoints and add queries.
+    # The flush between tests would also drop the rows the data migrations seed.
+    serialized_rollback = True
+
+    def test_every_routed_view_has_a_spec(self):
+        self.assertEqual([name for name in routed_view_names() if name not in VIEW_SPECS], [])
+
+    def test_api_views_are_benchmarked(self):
+        self.assertIn('quiz-list', routed_view_names())
+
+    def test_views_stay_within_their_query_budgets(self):
+        dataset = seed_dataset(scale=0.25)
+        results, violations = run_benchmarks(dataset, repeat=2)
+        self.assertEqual(violations, [])
+        self.assertEqual(set(results), set(routed_view_names()))
@@ -0,0 +1,70 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core.comments import COMMENTS_PER_PAGE
+from core.models import Blog, Comment
+
+
+class CommentCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='reader')
+        cls.blog = Blog.objects.create(title='Post', summary='', content='', author=cls.user)
+
+    def comment_count(self):
+        self.blog.refresh_from_db()
+        return self.blog.comment_count
+
+    def test_create_and_delete_adjust_the_counter(self):
+        first = Comment.objects.create(blog=self.blog, user=self.user, content='First')
+        Comment.objects.create(blog=self.blog, user=self.user, content='Second')
+        self.assertEqual(self.comment_count(), 2)
+        first.delete()
+        self.assertEqual(self.comment_count(), 1)
+
+    def test_counter_never_goes_negative(self):
+        comment = Comment.objects.create(blog=self.blog, user=self.user, content='First')
+        Blog.objects.filter(pk=self.blog.pk).update(comment_count=0)
+        comment.delete()
+        self.assertEqual(self.comment_count(), 0)
+
+    def test_repair_recounts_after_bulk_writes(self):
+        Comment.objects.bulk_create([Comment(blog=self.blog, user=self.user, content=str(n)) for n in range(3)])
+        self.assertEqual(self.comment_count(), 0)
+        call_command('repair_blog_counters', stdout=io.StringIO())
+        self.assertEqual(self.comment_count(), 3)
+
+
+class CommentPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='reader')
+        cls.blog = Blog.objects.create(title='Post', summary='', content='', author=cls.user)
+        for n in range(COMMENTS_PER_PAGE + 5):
+            Comment.objects.create(blog=cls.blog, user=cls.user, content=f'Comment {n}')
+
+    def fetch(self, **params):
+        response = self.client.get(reverse('blog_comments', args=[self.blog.id]), {'format': 'json', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_json_pages_run_newest_first_without_gaps(self):
+        first = self.fetch()
+        self.assertEqual(len(first['comments']), COMMENTS_PER_PAGE)
+        self.assertEqual(first['comments'][0]['content'], f'Comment {COMMENTS_PER_PAGE + 4}')
+        second = self.fetch(after=first['next'])
+        self.assertIsNone(second['next'])
+        contents = [comment['content'] for comment in first['comments'] + second['comments']]
+        self.assertEqual(contents, [f'Comment {n}' for n in reversed(range(COMMENTS_PER_PAGE + 5))])
+
+    def test_blog_detail_renders_the_first_page(self):
+        response = self.client.get(reverse('blog_detail', args=[self.blog.id]))
+        self.assertContains(response, f'Comment {COMMENTS_PER_PAGE + 4}')
+        self.assertNotContains(response, 'Comment 4<')
+
+    def test_unknown_blog_is_a_404(self):
+        self.assertEqual(self.client.get(reverse('blog_comments', args=[self.blog.id + 1])).status_code, 404)
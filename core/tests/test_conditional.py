@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Blog, BlogReaction, Category, Comment, Quiz
+
+
+class ConditionalPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='reader')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'))
+        cls.blog = Blog.objects.create(title='Post', summary='', content='', author=cls.user)
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_is_a_304_after_one_query(self):
+        url = reverse('quiz_list')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('private', first['Cache-Control'])
+        with self.assertNumQueries(1):
+            second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 304)
+
+    def test_if_modified_since_alone_is_a_304(self):
+        url = reverse('quiz_list')
+        first = self.client.get(url)
+        second = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_content_change_renders_again(self):
+        url = reverse('quiz_list')
+        first = self.client.get(url)
+        quiz = Quiz.objects.get(pk=self.quiz.pk)
+        quiz.title = 'World capitals'
+        quiz.save()
+        second = self.revalidate(url, first)
+        self.assertContains(second, 'World capitals')
+
+    def test_blog_page_changes_with_comments_and_reactions(self):
+        url = reverse('blog_detail', args=[self.blog.id])
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+        Comment.objects.create(blog=self.blog, user=self.user, content='First!')
+        second = self.revalidate(url, first)
+        self.assertContains(second, 'First!')
+
+        BlogReaction.objects.create(blog=self.blog, user=self.user, is_like=True)
+        self.assertEqual(self.revalidate(url, second).status_code, 200)
+
+    def test_unknown_blog_is_still_a_404(self):
+        self.assertEqual(self.client.get(reverse('blog_detail', args=[self.blog.id + 1])).status_code, 404)
+
+    def test_pending_messages_are_rendered_instead_of_a_304(self):
+        url = reverse('quiz_list')
+        first = self.client.get(url)
+        self.client.post(reverse('login'), {'username': 'nobody', 'password': 'wrong'})
+
+        second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 200)
+        self.assertIn('no-cache', second['Cache-Control'])
+        self.assertNotIn('ETag', second)
+        self.assertEqual([str(message) for message in second.context['messages']], ['Invalid username or password.'])
+
+        del self.client.cookies['messages']
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
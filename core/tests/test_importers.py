@@ -0,0 +1,112 @@
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.importers import MIN_PARALLEL_HASHES, import_mcq_rows, import_quiz_rows, import_user_rows, import_users_csv
+from core.models import Category, Option, Question, Quiz
+
+
+def mcq_row(quiz_title='Capitals', question='Capital of France?', correct='1', **overrides):
+    row = {'quiz_title': quiz_title, 'question': question, 'correct_option_index': correct,
+           'option1': 'Berlin', 'option2': 'Paris', 'option3': 'Rome', 'option4': 'Madrid'}
+    row.update(overrides)
+    return row
+
+
+class McqImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'))
+
+    def test_inserts_questions_with_their_options(self):
+        report = import_mcq_rows([mcq_row(), mcq_row(question='Capital of Italy?', correct='2')], batch_size=1)
+        self.assertEqual((report.inserted, report.skipped, report.rejected), (2, [], []))
+        question = Question.objects.get(text='Capital of France?')
+        self.assertEqual(question.quiz, self.quiz)
+        self.assertEqual(list(question.options.order_by('id').values_list('text', 'is_correct')),
+                         [('Berlin', False), ('Paris', True), ('Rome', False), ('Madrid', False)])
+
+    def test_unknown_quiz_is_skipped_and_invalid_rows_rejected(self):
+        report = import_mcq_rows([
+            mcq_row(quiz_title='Rivers'),
+            mcq_row(correct='4'),
+            mcq_row(correct='two'),
+            mcq_row(option3=''),
+            mcq_row(question=' '),
+        ])
+        self.assertEqual(report.inserted, 0)
+        self.assertEqual(report.skipped, [(2, "no quiz titled 'Rivers'")])
+        self.assertEqual([line for line, _ in report.rejected], [3, 4, 5, 6])
+        self.assertFalse(Option.objects.exists())
+
+
+class UserImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(username='taken', email='Taken@Example.com')
+
+    def test_existing_and_repeated_users_are_skipped(self):
+        report = import_user_rows([
+            {'username': 'taken', 'email': 'new@example.com', 'password': 'secret'},
+            {'username': 'fresh', 'email': 'taken@example.com', 'password': 'secret'},
+            {'username': 'alice', 'email': 'alice@example.com', 'password': 'secret'},
+            {'username': 'alice', 'email': 'other@example.com', 'password': 'secret'},
+            {'username': 'bob', 'email': 'ALICE@example.com', 'password': 'secret'},
+        ], workers=1)
+        self.assertEqual(report.inserted, 1)
+        self.assertEqual([line for line, _ in report.skipped], [2, 3, 5, 6])
+        self.assertTrue(User.objects.get(username='alice').check_password('secret'))
+
+    def test_invalid_rows_are_rejected(self):
+        csv_file = io.StringIO(
+            "username,email,password\n"
+            ",a@example.com,secret\n"
+            "nopassword,b@example.com,\n"
+            "bad name!,c@example.com,secret\n"
+            "carol,not-an-email,secret\n"
+            "dave,dave@example.com,secret\n"
+        )
+        report = import_users_csv(csv_file, workers=1)
+        self.assertEqual(report.inserted, 1)
+        self.assertEqual([line for line, _ in report.rejected], [2, 3, 4, 5])
+        self.assertTrue(User.objects.filter(username='dave').exists())
+
+    def test_no_process_pool_unless_workers_are_asked_for(self):
+        rows = [{'username': f'user{n}', 'email': '', 'password': 'secret'} for n in range(MIN_PARALLEL_HASHES)]
+        with mock.patch('core.importers.ProcessPoolExecutor') as pool:
+            report = import_user_rows(rows)
+        pool.assert_not_called()
+        self.assertEqual(report.inserted, MIN_PARALLEL_HASHES)
+
+class QuizImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'),
+                                       description='Old description')
+
+    def test_without_update_every_row_is_a_new_quiz(self):
+        report = import_quiz_rows([
+            {'title': 'Capitals', 'category': 'Geography'},
+            {'title': 'Rivers', 'category': 'Nature', 'status': 'Hold'},
+            {'title': 'Rivers', 'category': 'Nature'},
+        ])
+        self.assertEqual((report.inserted, report.updated), (3, 0))
+        self.assertEqual(Quiz.objects.filter(title='Capitals').count(), 2)
+        self.assertEqual(Quiz.objects.filter(title='Rivers', status='hold').count(), 1)
+        self.assertTrue(Category.objects.filter(name='Nature').exists())
+
+    def test_update_existing_rewrites_matching_titles(self):
+        report = import_quiz_rows([
+            {'title': 'Capitals', 'category': 'Europe', 'status': 'hold'},
+            {'title': 'Rivers', 'category': 'Nature', 'description': 'First'},
+            {'title': 'Rivers', 'category': 'Nature', 'description': 'Second'},
+            {'title': 'Lakes', 'category': 'Nature', 'status': 'unknown'},
+        ], update_existing=True)
+        self.assertEqual((report.inserted, report.updated), (1, 1))
+        self.assertEqual(report.rejected, [(5, "unknown status 'unknown'")])
+        self.quiz.refresh_from_db()
+        self.assertEqual((self.quiz.category.name, self.quiz.status, self.quiz.description),
+                         ('Europe', 'hold', 'Old description'))
+        self.assertEqual(list(Quiz.objects.filter(title='Rivers').values_list('description', flat=True)), ['Second'])
@@ -0,0 +1,101 @@
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.item_analysis import analyze_quiz, derive_statistics, item_report
+from core.models import Answer, Attempt, Category, Option, Question, QuestionStats, Quiz
+
+# One row per attempt: which of the three questions were answered correctly
+RESPONSES = [
+    (1, 1, 1),
+    (1, 1, 0),
+    (1, 0, 0),
+    (0, 1, 0),
+    (1, 0, 1),
+    (0, 0, 0),
+]
+
+
+class DeriveStatisticsTests(TestCase):
+    def test_matches_a_direct_computation(self):
+        x = np.array(RESPONSES, dtype=np.int64)
+        y = x.sum(axis=1)
+        sums = {
+            'responses': np.full(3, len(x)),
+            'correct': x.sum(axis=0),
+            'score_sum': np.full(3, y.sum()),
+            'score_sq_sum': np.full(3, (y * y).sum()),
+            'correct_score_sum': (x * y[:, None]).sum(axis=0),
+        }
+        difficulty, discrimination = derive_statistics(sums)
+        for question in range(3):
+            with self.subTest(question=question):
+                item = x[:, question]
+                self.assertAlmostEqual(difficulty[question], item.mean())
+                self.assertAlmostEqual(discrimination[question], np.corrcoef(item, y - item)[0, 1])
+
+    def test_undefined_statistics_are_nan(self):
+        sums = {'responses': np.array([0, 3]), 'correct': np.array([0, 3]), 'score_sum': np.array([0, 6]),
+                'score_sq_sum': np.array([0, 14]), 'correct_score_sum': np.array([0, 6])}
+        difficulty, discrimination = derive_statistics(sums)
+        self.assertTrue(np.isnan(difficulty[0]))
+        self.assertEqual(difficulty[1], 1.0)
+        # Everyone got question 2 right, so it cannot discriminate
+        self.assertTrue(np.isnan(discrimination).all())
+
+
+class AnalyzeQuizTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'))
+        cls.user = User.objects.create(username='player')
+        cls.options = []
+        for n in range(3):
+            question = Question.objects.create(quiz=cls.quiz, text=f'Question {n}?')
+            cls.options.append((
+                Option.objects.create(question=question, text='Right', is_correct=True),
+                Option.objects.create(question=question, text='Wrong'),
+            ))
+
+    def add_attempts(self, responses):
+        for row in responses:
+            attempt = Attempt.objects.create(user=self.user, quiz=self.quiz, score=sum(row), total=len(row))
+            Answer.objects.bulk_create([
+                Answer(attempt=attempt, question=right.question, selected_option=right if correct else wrong)
+                for (right, wrong), correct in zip(self.options, row)
+            ])
+
+    def stats(self):
+        return list(QuestionStats.objects.filter(quiz=self.quiz).order_by('question_id').values_list(
+            'responses', 'correct', 'score_sum', 'score_sq_sum', 'correct_score_sum', 'difficulty', 'discrimination',
+        ))
+
+    def test_incremental_runs_match_a_full_run(self):
+        self.add_attempts(RESPONSES[:3])
+        analyze_quiz(self.quiz.id)
+        self.add_attempts(RESPONSES[3:])
+        run = analyze_quiz(self.quiz.id, chunk_size=4)
+        self.assertEqual((run.attempts_processed, run.answers_processed), (6, 18))
+        incremental = self.stats()
+
+        run = analyze_quiz(self.quiz.id, full=True)
+        self.assertEqual((run.attempts_processed, run.answers_processed), (6, 18))
+        self.assertEqual(self.stats(), incremental)
+        self.assertEqual([row[5] for row in incremental], [round(4 / 6, 4), 0.5, round(2 / 6, 4)])
+
+    def test_rerun_without_new_attempts_changes_nothing(self):
+        self.add_attempts(RESPONSES)
+        analyze_quiz(self.quiz.id)
+        before = self.stats()
+        run = analyze_quiz(self.quiz.id)
+        self.assertEqual(run.attempts_processed, 6)
+        self.assertEqual(self.stats(), before)
+
+    def test_report_has_option_selection_rates(self):
+        self.add_attempts(RESPONSES)
+        analyze_quiz(self.quiz.id)
+        first = item_report(self.quiz.id)[0]
+        self.assertEqual(first['responses'], 6)
+        self.assertEqual([(option['text'], option['selections']) for option in first['options']],
+                         [('Right', 4), ('Wrong', 2)])
+        self.assertAlmostEqual(first['options'][0]['selection_rate'], round(4 / 6, 4))
@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.leaderboards import move_bucket, rank_of, rebuild_leaderboards, top_entries, user_standing
+from core.models import Attempt, Category, LeaderboardBucket, LeaderboardEntry, Quiz
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='General')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=category)
+        cls.other_quiz = Quiz.objects.create(title='Rivers', category=category)
+        cls.ann, cls.bob, cls.cy, cls.dee = [
+            User.objects.create(username=name) for name in ('ann', 'bob', 'cy', 'dee')
+        ]
+
+    def attempt(self, user, score, quiz=None):
+        return Attempt.objects.create(user=user, quiz=quiz or self.quiz, score=score, total=10)
+
+    def board(self, quiz_id):
+        return [(entry.user.username, entry.best_score, entry.rank) for entry in top_entries(quiz_id)]
+
+    def buckets(self):
+        return sorted(LeaderboardBucket.objects.filter(users__gt=0).values_list('quiz_id', 'score', 'users'),
+                      key=lambda row: (row[0] or 0, row[1]))
+
+    def test_ties_are_ranked_by_earliest_completion(self):
+        self.attempt(self.ann, 9)
+        self.attempt(self.cy, 7)
+        self.attempt(self.bob, 7)
+        self.attempt(self.dee, 5)
+        self.assertEqual(self.board(self.quiz.id), [('ann', 9, 1), ('cy', 7, 2), ('bob', 7, 3), ('dee', 5, 4)])
+        for username, _, rank in self.board(self.quiz.id):
+            with self.subTest(user=username):
+                entry, standing = user_standing(User.objects.get(username=username), self.quiz.id)
+                self.assertEqual(standing, rank)
+
+    def test_only_a_better_score_replaces_the_best(self):
+        self.attempt(self.ann, 6)
+        self.attempt(self.ann, 4)
+        self.assertEqual(self.board(self.quiz.id), [('ann', 6, 1)])
+        self.attempt(self.ann, 8)
+        self.assertEqual(self.board(self.quiz.id), [('ann', 8, 1)])
+        self.assertEqual(self.buckets(), [(None, 8, 1), (self.quiz.id, 8, 1)])
+
+    def test_global_board_sums_per_quiz_bests(self):
+        self.attempt(self.ann, 6)
+        self.attempt(self.ann, 3, quiz=self.other_quiz)
+        self.attempt(self.bob, 8)
+        self.assertEqual(self.board(None), [('ann', 9, 1), ('bob', 8, 2)])
+
+    def test_deleting_the_best_attempt_falls_back_to_the_next(self):
+        self.attempt(self.ann, 5)
+        best = self.attempt(self.ann, 9)
+        best.delete()
+        self.assertEqual(self.board(self.quiz.id), [('ann', 5, 1)])
+        Attempt.objects.get(user=self.ann).delete()
+        self.assertEqual(self.board(self.quiz.id), [])
+        self.assertEqual(self.board(None), [])
+        self.assertEqual(self.buckets(), [])
+
+    def test_incremental_boards_match_a_rebuild(self):
+        for user, quiz, score in [(self.ann, self.quiz, 4), (self.bob, self.quiz, 7), (self.ann, self.quiz, 7),
+                                  (self.cy, self.other_quiz, 2), (self.bob, self.other_quiz, 9)]:
+            self.attempt(user, score, quiz)
+        self.attempt(self.dee, 1).delete()
+        entries = set(LeaderboardEntry.objects.values_list('quiz_id', 'user_id', 'best_score', 'achieved_at'))
+        buckets = self.buckets()
+
+        rebuild_leaderboards()
+        self.assertEqual(set(LeaderboardEntry.objects.values_list('quiz_id', 'user_id', 'best_score', 'achieved_at')),
+                         entries)
+        self.assertEqual(self.buckets(), buckets)
+
+    def test_move_bucket_does_not_add_when_the_old_bucket_is_empty(self):
+        self.attempt(self.ann, 5)
+        LeaderboardBucket.objects.filter(quiz=self.quiz).update(users=0)
+        move_bucket(self.quiz.id, 5, 8)
+        self.assertFalse(LeaderboardBucket.objects.filter(quiz=self.quiz, score=8).exists())
+        self.assertEqual(LeaderboardBucket.objects.get(quiz=self.quiz, score=5).users, 0)
+
+    def test_same_score_at_the_same_moment_falls_back_to_user_id(self):
+        self.attempt(self.bob, 7)
+        self.attempt(self.ann, 7)
+        LeaderboardEntry.objects.filter(quiz=self.quiz).update(achieved_at=Attempt.objects.first().completed_at)
+        for user, rank in ((self.ann, 1), (self.bob, 2)):
+            with self.subTest(user=user.username):
+                self.assertEqual(rank_of(LeaderboardEntry.objects.get(quiz=self.quiz, user=user)), rank)
+        self.assertEqual([rank for _, _, rank in self.board(self.quiz.id)], [1, 2])
+
+    def test_global_ranks_follow_board_order(self):
+        self.attempt(self.bob, 4)
+        self.attempt(self.ann, 4)
+        self.attempt(self.cy, 6, quiz=self.other_quiz)
+        for user, rank in ((self.cy, 1), (self.bob, 2), (self.ann, 3)):
+            with self.subTest(user=user.username):
+                self.assertEqual(user_standing(user)[1], rank)
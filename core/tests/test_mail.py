@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import RETRY_BASE_SECONDS, claim_batch, deliver_pending
+from core.models import Blog, Comment, OutboundEmail
+
+
+class FailingBackend(EmailBackend):
+    """A locmem backend whose sends (or connects) fail, like an unreachable SMTP server."""
+
+    def __init__(self, fail_open=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_open = fail_open
+
+    def open(self):
+        if self.fail_open:
+            raise ConnectionRefusedError("connection refused")
+
+    def send_messages(self, messages):
+        raise OSError("mailbox unavailable")
+
+
+def queue(count=1, **fields):
+    return [
+        OutboundEmail.enqueue(kind='contact', subject=f'Hello {n}', body='Hi', recipients=['to@example.com'], **fields)
+        for n in range(count)
+    ]
+
+
+class EnqueueTests(TestCase):
+    def test_comment_notifies_the_author_through_the_outbox(self):
+        author = User.objects.create(username='author', email='author@example.com')
+        blog = Blog.objects.create(title='Post', summary='', content='', author=author)
+        Comment.objects.create(blog=blog, user=User.objects.create(username='reader'), content='Nice')
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.kind, email.recipient_list, email.status), ('comment', ['author@example.com'], 'pending'))
+        self.assertEqual(email.digest_key, f'comment-author:{author.id}')
+        self.assertEqual(mail.outbox, [])
+
+    def test_contact_form_is_queued_not_sent(self):
+        response = self.client.post(reverse('contact'), {
+            'name': 'Ann', 'email': 'ann@example.com', 'subject': 'Question', 'message': 'Hello',
+        })
+        self.assertEqual(response.status_code, 302)
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.kind, email.subject), ('contact', 'Question'))
+        self.assertEqual(mail.outbox, [])
+
+
+class ClaimTests(TestCase):
+    def test_a_claimed_batch_is_hidden_from_other_workers(self):
+        queue(3)
+        first = claim_batch(2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len({email.claimed_by for email in first}), 1)
+        second = claim_batch(10)
+        self.assertEqual([email.id for email in second], [OutboundEmail.objects.order_by('id').last().id])
+        self.assertEqual(claim_batch(10), [])
+
+    def test_rows_another_worker_claimed_after_the_select_are_not_returned(self):
+        emails = queue(3)
+        taken = emails[1]
+        OutboundEmail.objects.filter(pk=taken.pk).update(
+            claimed_by='other', next_attempt_at=timezone.now() + timedelta(hours=1),
+        )
+        # The SELECT saw all three rows as due before the other worker's claim landed
+        with mock.patch('core.mail.due_ids', return_value=[email.id for email in emails]):
+            claimed = claim_batch(10)
+        self.assertEqual([email.id for email in claimed], [emails[0].id, emails[2].id])
+        self.assertEqual(OutboundEmail.objects.get(pk=taken.pk).claimed_by, 'other')
+
+    def test_a_dead_workers_claim_falls_due_again(self):
+        email, = queue()
+        claim_batch(10)
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([row.id for row in claim_batch(10)], [email.id])
+
+
+class DeliveryTests(TestCase):
+    def test_sends_and_releases_the_claim(self):
+        queue(2)
+        self.assertEqual(deliver_pending(), (2, 0, 0))
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['Hello 0', 'Hello 1'])
+        self.assertEqual(set(OutboundEmail.objects.values_list('status', 'attempts', 'claimed_by')), {('sent', 1, None)})
+        self.assertEqual(deliver_pending(), (0, 0, 0))
+
+    def test_digest_merges_comment_notifications_per_author(self):
+        for n in range(3):
+            OutboundEmail.enqueue(kind='comment', subject=f'Comment {n}', body='Hi', recipients=['a@example.com'],
+                                  digest_key='comment-author:1')
+        self.assertEqual(deliver_pending(digest=True), (3, 0, 0))
+        self.assertEqual([message.subject for message in mail.outbox], ['3 new comments on your blogs'])
+
+    def test_failed_send_backs_off_then_gives_up(self):
+        email, = queue()
+        started = timezone.now()
+        self.assertEqual(deliver_pending(max_attempts=2, connection=FailingBackend()), (0, 1, 0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.claimed_by), ('pending', 1, None))
+        self.assertEqual(email.last_error, 'mailbox unavailable')
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=RETRY_BASE_SECONDS))
+        self.assertEqual(deliver_pending(max_attempts=2, connection=FailingBackend()), (0, 0, 0))
+
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_pending(max_attempts=2, connection=FailingBackend()), (0, 0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+
+    def test_unreachable_server_puts_the_whole_batch_back(self):
+        queue(3)
+        self.assertEqual(deliver_pending(connection=FailingBackend(fail_open=True)), (0, 3, 0))
+        self.assertEqual(set(OutboundEmail.objects.values_list('status', 'attempts', 'last_error')),
+                         {('pending', 1, 'connection refused')})
+        self.assertEqual(mail.outbox, [])
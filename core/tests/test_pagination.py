@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from core.models import Blog
+from core.pagination import paginate_keyset
+
+ORDERING = ('-created_at', '-id')
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create(username='author')
+        now = timezone.now()
+        # Pairs of posts share a timestamp, so pages must break ties on id
+        Blog.objects.bulk_create([
+            Blog(title=f'Post {i}', summary='', content='', author=author, created_at=now - timedelta(hours=i // 2))
+            for i in range(7)
+        ])
+        cls.expected = list(Blog.objects.order_by(*ORDERING).values_list('id', flat=True))
+
+    def page(self, **params):
+        request = RequestFactory().get('/', params)
+        return paginate_keyset(request, Blog.objects.all(), ORDERING, per_page=3)
+
+    def ids(self, page):
+        return [blog.id for blog in page]
+
+    def test_forward_pages_cover_every_row_once(self):
+        seen, page = [], self.page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(self.ids(page))
+            if not page.has_next:
+                break
+            page = self.page(after=page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_the_earlier_page(self):
+        first = self.page()
+        second = self.page(after=first.next_cursor)
+        self.assertEqual(self.ids(second), self.expected[3:6])
+        back = self.page(before=second.previous_cursor)
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertFalse(back.has_previous)
+        self.assertEqual(self.ids(self.page(after=back.next_cursor)), self.ids(second))
+
+    def test_last_page_has_no_next_cursor(self):
+        second = self.page(after=self.page().next_cursor)
+        last = self.page(after=second.next_cursor)
+        self.assertEqual(self.ids(last), self.expected[6:])
+        self.assertFalse(last.has_next)
+        self.assertTrue(last.has_previous)
+
+    def test_tampered_cursor_falls_back_to_the_first_page(self):
+        cursor = self.page().next_cursor
+        for bad in (cursor[:-2] + 'xx', 'garbage', ''):
+            with self.subTest(cursor=bad):
+                self.assertEqual(self.ids(self.page(after=bad)), self.expected[:3])
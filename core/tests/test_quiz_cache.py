@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Category, Option, Question, Quiz
+from core.quiz_cache import (
+    draw_question_ids, draw_questions, draw_token, get_quiz_snapshot, is_correct_option, option_belongs_to,
+    read_draw_token,
+)
+
+
+class SnapshotInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title='Capitals', category=Category.objects.create(name='Geography'))
+        cls.question = Question.objects.create(quiz=cls.quiz, text='Capital of France?')
+        cls.right = Option.objects.create(question=cls.question, text='Paris', is_correct=True)
+        cls.wrong = Option.objects.create(question=cls.question, text='Rome')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_snapshot_is_built_once(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        self.assertEqual(snapshot.question_ids, (self.question.id,))
+        self.assertTrue(is_correct_option(snapshot, self.question.id, self.right.id))
+        self.assertFalse(is_correct_option(snapshot, self.question.id, self.wrong.id))
+        self.assertTrue(option_belongs_to(snapshot, self.question.id, self.wrong.id))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_quiz_snapshot(self.quiz.id), snapshot)
+
+    def test_question_save_and_delete_invalidate(self):
+        get_quiz_snapshot(self.quiz.id)
+        added = Question.objects.create(quiz=self.quiz, text='Capital of Italy?')
+        self.assertEqual(get_quiz_snapshot(self.quiz.id).question_ids, (self.question.id, added.id))
+        added.text = 'Capital of Spain?'
+        added.save()
+        self.assertEqual(get_quiz_snapshot(self.quiz.id).questions_by_id[added.id].text, 'Capital of Spain?')
+        added.delete()
+        self.assertEqual(get_quiz_snapshot(self.quiz.id).question_ids, (self.question.id,))
+
+    def test_option_save_and_delete_invalidate(self):
+        get_quiz_snapshot(self.quiz.id)
+        option = Option.objects.get(pk=self.wrong.pk)
+        option.is_correct = True
+        option.save()
+        self.assertTrue(is_correct_option(get_quiz_snapshot(self.quiz.id), self.question.id, self.wrong.id))
+        option.delete()
+        self.assertFalse(option_belongs_to(get_quiz_snapshot(self.quiz.id), self.question.id, self.wrong.id))
+
+    def test_option_saved_with_its_question_does_not_look_the_question_up(self):
+        with CaptureQueriesContext(connection) as context:
+            Option.objects.create(question=self.question, text='Berlin')
+        self.assertFalse([query for query in context.captured_queries if 'FROM "core_question"' in query['sql']])
+
+    def test_quiz_save_invalidates(self):
+        get_quiz_snapshot(self.quiz.id)
+        Quiz.objects.filter(pk=self.quiz.pk).update(status='hold')  # no signal: the cached snapshot stays
+        self.assertEqual(get_quiz_snapshot(self.quiz.id).status, 'active')
+        quiz = Quiz.objects.get(pk=self.quiz.pk)
+        quiz.save()
+        self.assertEqual(get_quiz_snapshot(self.quiz.id).status, 'hold')
+
+
+class DrawTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title='Bank', category=Category.objects.create(name='General'),
+                                       questions_per_attempt=4)
+        Question.objects.bulk_create([Question(quiz=cls.quiz, text=f'Question {n}?') for n in range(10)])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_same_seed_draws_the_same_questions(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        drawn = draw_question_ids(snapshot, 1234)
+        self.assertEqual(len(drawn), 4)
+        self.assertEqual(len(set(drawn)), 4)
+        self.assertTrue(set(drawn) <= set(snapshot.question_ids))
+        cache.clear()
+        self.assertEqual(draw_question_ids(get_quiz_snapshot(self.quiz.id), 1234), drawn)
+        self.assertEqual([question.id for question in draw_questions(snapshot, 1234)], drawn)
+
+    def test_different_seeds_vary_the_draw(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        self.assertGreater(len({tuple(draw_question_ids(snapshot, seed)) for seed in range(20)}), 1)
+
+    def test_unseeded_or_unlimited_draws_take_the_whole_bank_in_order(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        self.assertEqual(draw_question_ids(snapshot, None), list(snapshot.question_ids))
+        whole_bank = snapshot._replace(questions_per_attempt=None)
+        self.assertEqual(sorted(draw_question_ids(whole_bank, 7)), list(snapshot.question_ids))
+        oversized = snapshot._replace(questions_per_attempt=50)
+        self.assertEqual(len(draw_question_ids(oversized, 7)), 10)
+
+    def test_draw_token_round_trip(self):
+        snapshot = get_quiz_snapshot(self.quiz.id)
+        token = draw_token(snapshot, 99)
+        self.assertEqual(read_draw_token(snapshot, token), 99)
+        self.assertIsNone(read_draw_token(snapshot, token[:-2] + 'xx'))
+        self.assertIsNone(read_draw_token(snapshot, None))
+        self.assertIsNone(read_draw_token(snapshot._replace(id=self.quiz.id + 1), token))
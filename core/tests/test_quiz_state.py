@@ -0,0 +1,152 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Category, QuizProgress, Quiz
+from core.quiz_state import (
+    CacheQuizStateStore, CookieQuizStateStore, DatabaseQuizStateStore, QuizState, purge_expired, quiz_state_store,
+)
+
+
+class QuizStateStoreTests:
+    """Behaviour every backend shares; subclasses set ``backend``."""
+    backend = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='player')
+        cls.other = User.objects.create(username='other')
+        category = Category.objects.create(name='General')
+        cls.quiz = Quiz.objects.create(title='Capitals', category=category)
+        cls.second_quiz = Quiz.objects.create(title='Rivers', category=category)
+
+    def setUp(self):
+        cache.clear()
+        self.cookies = {}
+
+    def store(self, user=None):
+        request = RequestFactory().get('/')
+        request.user = user or self.user
+        request.COOKIES.update(self.cookies)
+        return self.backend(request)
+
+    def finish(self, store):
+        # Carry the store's cookies (if any) over to the next request, as a browser would
+        response = store.commit(HttpResponse())
+        for name, morsel in response.cookies.items():
+            if morsel.value:
+                self.cookies[name] = morsel.value
+            else:
+                self.cookies.pop(name, None)
+
+    def test_new_quiz_has_no_state(self):
+        self.assertIsNone(self.store().get(self.quiz.id))
+
+    def test_answers_survive_across_requests(self):
+        store = self.store()
+        state = store.start(self.quiz.id, seed=7)
+        store.advance(self.quiz.id, state, question_id=11, option_id=41)
+        self.finish(store)
+
+        store = self.store()
+        state = store.get(self.quiz.id)
+        self.assertEqual(state, QuizState(7, 1))
+        store.advance(self.quiz.id, state, question_id=12, option_id=45)
+        self.finish(store)
+
+        store = self.store()
+        state = store.get(self.quiz.id)
+        self.assertEqual(state, QuizState(7, 2))
+        self.assertEqual(store.answers(self.quiz.id, state, [11, 12, 13]), {'11': 41, '12': 45})
+        self.assertEqual(store.answers(self.quiz.id, state, [12]), {'12': 45})
+
+    def test_restart_drops_earlier_answers(self):
+        store = self.store()
+        state = store.start(self.quiz.id, seed=7)
+        store.advance(self.quiz.id, state, question_id=11, option_id=41)
+        self.finish(store)
+
+        store = self.store()
+        state = store.start(self.quiz.id, seed=8)
+        self.finish(store)
+        store = self.store()
+        self.assertEqual(store.get(self.quiz.id), QuizState(8, 0))
+        self.assertEqual(store.answers(self.quiz.id, state, [11]), {})
+
+    def test_quizzes_and_users_are_kept_apart(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        self.finish(store)
+        self.assertIsNone(self.store().get(self.second_quiz.id))
+        self.assertIsNone(self.store(self.other).get(self.quiz.id))
+
+    def test_finish_succeeds_once_per_run(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        self.finish(store)
+        # Two requests holding the same state (a double submit) race to finish it
+        first, second = self.store(), self.store()
+        self.assertTrue(first.finish(self.quiz.id, 7))
+        self.assertFalse(second.finish(self.quiz.id, 7))
+        self.finish(first)
+        self.assertIsNone(self.store().get(self.quiz.id))
+
+    def test_finish_needs_the_run_that_was_started(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        self.finish(store)
+        self.assertFalse(self.store().finish(self.quiz.id, 8))
+        self.assertFalse(self.store(self.other).finish(self.quiz.id, 7))
+        self.assertTrue(self.store().finish(self.quiz.id, 7))
+
+    def test_clear(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        self.finish(store)
+        store = self.store()
+        store.clear(self.quiz.id)
+        self.finish(store)
+        self.assertIsNone(self.store().get(self.quiz.id))
+
+
+class DatabaseQuizStateStoreTests(QuizStateStoreTests, TestCase):
+    backend = DatabaseQuizStateStore
+
+    def test_purge_expired_removes_only_stale_rows(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        store.start(self.second_quiz.id, seed=7)
+        QuizProgress.objects.filter(quiz=self.quiz).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(purge_expired(), 1)
+        self.assertIsNone(store.get(self.quiz.id))
+        self.assertIsNotNone(store.get(self.second_quiz.id))
+
+
+class CacheQuizStateStoreTests(QuizStateStoreTests, TestCase):
+    backend = CacheQuizStateStore
+
+
+class CookieQuizStateStoreTests(QuizStateStoreTests, TestCase):
+    backend = CookieQuizStateStore
+
+    def test_tampered_cookie_is_ignored(self):
+        store = self.store()
+        store.start(self.quiz.id, seed=7)
+        self.finish(store)
+        name = store.cookie_name(self.quiz.id)
+        self.cookies[name] = self.cookies[name][:-2] + 'xx'
+        self.assertIsNone(self.store().get(self.quiz.id))
+
+
+class BackendSelectionTests(TestCase):
+    def test_store_follows_the_setting_and_is_reused_per_request(self):
+        request = RequestFactory().get('/')
+        request.user = User(pk=1)
+        with override_settings(QUIZ_STATE_BACKEND='cookie'):
+            store = quiz_state_store(request)
+        self.assertIsInstance(store, CookieQuizStateStore)
+        self.assertIs(quiz_state_store(request), store)
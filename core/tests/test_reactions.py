@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Blog, BlogReaction
+
+
+class ReactionCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.blog = Blog.objects.create(title='Post', summary='', content='', author=cls.author)
+
+    def counts(self):
+        return tuple(Blog.objects.filter(pk=self.blog.pk).values_list('like_count', 'dislike_count').get())
+
+    def react(self, user, reaction_type):
+        self.client.force_login(user)
+        response = self.client.post(reverse('blog_react', args=[self.blog.id, reaction_type]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_toggle_view_adds_switches_and_removes(self):
+        self.assertEqual(self.react(self.reader, 'like'), {'status': 'added', 'likes': 1, 'dislikes': 0})
+        self.assertEqual(self.react(self.reader, 'dislike'), {'status': 'added', 'likes': 0, 'dislikes': 1})
+        self.assertEqual(self.react(self.author, 'dislike'), {'status': 'added', 'likes': 0, 'dislikes': 2})
+        self.assertEqual(self.react(self.reader, 'dislike'), {'status': 'removed', 'likes': 0, 'dislikes': 1})
+
+    def test_reactions_removed_by_a_cascade_are_uncounted(self):
+        doomed = User.objects.create(username='doomed')
+        BlogReaction.objects.create(user=doomed, blog=self.blog, is_like=True)
+        BlogReaction.objects.create(user=self.reader, blog=self.blog, is_like=True)
+        self.assertEqual(self.counts(), (2, 0))
+        doomed.delete()
+        self.assertEqual(self.counts(), (1, 0))
+
+    def test_saving_without_a_switch_changes_nothing(self):
+        reaction = BlogReaction.objects.create(user=self.reader, blog=self.blog, is_like=False)
+        reaction.save()
+        BlogReaction.objects.get(pk=reaction.pk).save()
+        self.assertEqual(self.counts(), (0, 1))
+        reaction.is_like = True
+        reaction.save()
+        self.assertEqual(self.counts(), (1, 0))
+
+    def test_counters_never_go_negative(self):
+        reaction = BlogReaction.objects.create(user=self.reader, blog=self.blog, is_like=True)
+        Blog.objects.filter(pk=self.blog.pk).update(like_count=0)
+        reaction.delete()
+        self.assertEqual(self.counts(), (0, 0))
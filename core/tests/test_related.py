@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.models import Blog, BlogTerm, RelatedBlog, Tag
+from core.related import rebuild_related_blogs, related_blogs
+
+
+class IncrementalIndexTests(TestCase):
+    """
+    Whatever the signals leave behind must match a full rebuild of the same
+    blogs. Blogs the update did not touch keep older IDF weights, so lists are
+    compared as sets; only the vectors of the blogs just reindexed are exact.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='writer')
+        cls.python = Tag.objects.create(name='python')
+        cls.food = Tag.objects.create(name='food')
+
+    def setUp(self):
+        self.blogs = {}
+        for title, tag in [
+            ('Django models tutorial', self.python),
+            ('Django views tutorial', self.python),
+            ('Django forms in depth', self.python),
+            ('Cooking pasta recipes', self.food),
+            ('Cooking pizza recipes', self.food),
+            ('Baking bread recipes', self.food),
+        ]:
+            blog = Blog.objects.create(title=title, summary='', content='', author=self.user)
+            blog.tags.add(tag)
+            self.blogs[title] = blog
+
+    def state(self, blog_ids=()):
+        lists = {blog.pk: {related.pk for related in related_blogs(blog.pk)} for blog in Blog.objects.all()}
+        terms = {
+            (blog_id, term): round(weight, 9)
+            for blog_id, term, weight in BlogTerm.objects.filter(blog_id__in=blog_ids).values_list(
+                'blog_id', 'term', 'weight',
+            )
+        }
+        return lists, terms
+
+    def assertMatchesRebuild(self, *reindexed):
+        blog_ids = [blog.pk for blog in reindexed]
+        before = self.state(blog_ids)
+        rebuild_related_blogs()
+        self.assertEqual(before, self.state(blog_ids))
+
+    def test_creating_blogs_matches_rebuild(self):
+        self.assertMatchesRebuild(self.blogs['Baking bread recipes'])
+        self.assertEqual(
+            [blog.title for blog in related_blogs(self.blogs['Cooking pasta recipes'].pk)],
+            ['Cooking pizza recipes', 'Baking bread recipes'],
+        )
+
+    def test_retitling_a_blog_matches_rebuild(self):
+        rebuild_related_blogs()
+        blog = self.blogs['Django forms in depth']
+        blog.title = 'Pizza dough recipes'
+        blog.save()
+        blog.tags.set([self.food])
+        self.assertMatchesRebuild(blog)
+        self.assertIn(blog.pk, [related.pk for related in related_blogs(self.blogs['Cooking pizza recipes'].pk)])
+
+    def test_unchanged_save_leaves_the_index_alone(self):
+        rebuild_related_blogs()
+        blog = self.blogs['Django views tutorial']
+        before = self.state([blog.pk])
+        blog.save()
+        self.assertEqual(self.state([blog.pk]), before)
+
+    def test_clearing_and_deleting_tags_matches_rebuild(self):
+        rebuild_related_blogs()
+        self.food.blogs.clear()
+        self.assertMatchesRebuild(*Blog.objects.filter(title__contains='recipes'))
+        Tag.objects.get(pk=self.python.pk).delete()
+        self.assertMatchesRebuild(*Blog.objects.filter(title__startswith='Django'))
+
+    def test_deleting_a_blog_refills_lists_that_held_it(self):
+        rebuild_related_blogs()
+        deleted = self.blogs['Cooking pizza recipes']
+        Blog.objects.get(pk=deleted.pk).delete()
+        self.assertFalse(RelatedBlog.objects.filter(related_id=deleted.pk).exists())
+        self.assertMatchesRebuild()
+
+    def test_chunked_lookups_match_rebuild(self):
+        rebuild_related_blogs()
+        with mock.patch('core.importers.IN_LOOKUP_CHUNK_SIZE', 2), mock.patch('core.related.IN_LOOKUP_CHUNK_SIZE', 2):
+            Tag.objects.get(pk=self.food.pk).delete()
+            self.python.blogs.add(*Blog.objects.filter(title__contains='recipes'))
+        self.assertMatchesRebuild(*Blog.objects.filter(title__contains='recipes'))
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from core import search
+from core.models import Blog, Category, Quiz, Tag
+from core.search import fts_query, search_blogs, search_quizzes
+
+
+def titles(results):
+    return [item.title for item in results[:100]]
+
+
+class FtsQueryTests(TestCase):
+    def test_every_word_is_a_quoted_prefix(self):
+        self.assertEqual(fts_query('django models'), '"django"* "models"*')
+
+    def test_fts_syntax_is_escaped(self):
+        self.assertEqual(fts_query('c++ "AND" OR (title: x*) NEAR'), '"c"* "AND"* "OR"* "title"* "x"* "NEAR"*')
+
+    def test_no_words_is_an_empty_query(self):
+        self.assertEqual(fts_query(' "*-( '), '')
+        self.assertEqual(fts_query(None), '')
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='writer')
+        category = Category.objects.create(name='Programming')
+        Quiz.objects.create(title='Python basics', description='Variables and loops', category=category)
+        Quiz.objects.create(title='Loops quiz', description='For and while in Python', category=category)
+        cls.tagged = Blog.objects.create(title='Weekend notes', summary='', content='<p>Nothing here</p>', author=cls.user)
+        cls.tagged.tags.add(Tag.objects.create(name='databases'))
+        Blog.objects.create(title='Indexing tables', summary='', content='<b>SQLite</b> internals', author=cls.user)
+
+    def setUp(self):
+        if not search.search_enabled():
+            self.skipTest('SQLite was built without FTS5')
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(titles(search_quizzes('python')), ['Python basics', 'Loops quiz'])
+
+    def test_words_match_as_prefixes_and_stems(self):
+        self.assertEqual(sorted(titles(search_quizzes('pyth loop'))), ['Loops quiz', 'Python basics'])
+        self.assertEqual(titles(search_blogs('index')), ['Indexing tables'])
+
+    def test_fts_syntax_in_the_query_is_not_an_error(self):
+        for query in ['"python', 'python AND', 'title:python', 'NEAR(python loops)', '*']:
+            response = self.client.get(reverse('search'), {'q': query})
+            self.assertEqual(response.status_code, 200, query)
+        self.assertEqual(titles(search_quizzes('"python')), ['Python basics', 'Loops quiz'])
+        self.assertEqual(search_quizzes('*'), [])
+
+    def test_signals_keep_the_index_in_sync(self):
+        self.assertEqual(titles(search_blogs('databases')), ['Weekend notes'])
+        self.assertEqual(titles(search_blogs('sqlite')), ['Indexing tables'])
+        blog = Blog.objects.get(pk=self.tagged.pk)
+        blog.tags.clear()
+        self.assertEqual(titles(search_blogs('databases')), [])
+        blog.delete()
+        self.assertEqual(titles(search_blogs('weekend')), [])
+
+    def test_missing_tables_fall_back_to_icontains(self):
+        with connection.cursor() as cursor:
+            for sql in search.DROP_TABLE_SQL:
+                cursor.execute(sql)
+        search.fts_tables_exist.cache_clear()
+        self.addCleanup(search.fts_tables_exist.cache_clear)
+
+        self.assertFalse(search.search_enabled())
+        self.assertEqual(sorted(titles(search_quizzes('loops'))), ['Loops quiz', 'Python basics'])
+        self.assertEqual(titles(search_blogs('databases')), ['Weekend notes'])
+        # Writes skip the index instead of failing
+        Blog.objects.create(title='After the drop', summary='', content='', author=self.user)
+        response = self.client.get(reverse('search'), {'q': 'drop'})
+        self.assertContains(response, 'After the drop')
@@ -0,0 +1,93 @@
+"""
+Change stamps for groups of public content, used as HTTP validators.
+
+Each group ('categories', 'quizzes', 'questions', 'blogs', 'tags',
+'comments', 'reactions') has a ContentVersion row holding when anything in
+it last changed. Model signals below touch every group a change can show
+up in. For example, a renamed category changes the quiz payloads too.
+Reactions and comments have groups of their own, so they do not
+invalidate pages that never show them. Reading the stamps is one indexed query, so a view can answer
+If-None-Match/If-Modified-Since before loading anything else. Bulk writers
+that skip signals call ``touch`` themselves.
+"""
+import hashlib
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Blog, BlogReaction, Category, Comment, ContentVersion, Option, ProcessedImage, Question, Quiz, Tag
+
+GROUPS = ('categories', 'quizzes', 'questions', 'blogs', 'tags', 'comments', 'reactions')
+
+
+def touch(*names):
+    now = timezone.now()
+    if ContentVersion.objects.filter(name__in=names).update(changed_at=now) < len(set(names)):
+        for name in names:
+            ContentVersion.objects.get_or_create(name=name, defaults={'changed_at': now})
+
+
+def changed_at(*names):
+    """Latest change time across ``names``."""
+    stamps = dict(ContentVersion.objects.filter(name__in=names).values_list('name', 'changed_at'))
+    missing = [name for name in names if name not in stamps]
+    if missing:
+        touch(*missing)
+        return timezone.now()
+    return max(stamps.values())
+
+
+def etag_for(last_modified, *parts):
+    """A strong ETag for one representation: the change stamp plus whatever selects it (path, format...)."""
+    digest = hashlib.md5('|'.join([last_modified.isoformat(), *map(str, parts)]).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+@receiver([post_save, post_delete], sender=Category)
+def touch_categories(sender, **kwargs):
+    touch('categories', 'quizzes')
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def touch_quizzes(sender, **kwargs):
+    touch('quizzes', 'categories')
+
+
+@receiver([post_save, post_delete], sender=Question)
+@receiver([post_save, post_delete], sender=Option)
+def touch_questions(sender, **kwargs):
+    touch('questions', 'quizzes')
+
+
+@receiver([post_save, post_delete], sender=Blog)
+def touch_blogs(sender, **kwargs):
+    touch('blogs', 'tags')
+
+
+@receiver([post_save, post_delete], sender=BlogReaction)
+def touch_blog_reactions(sender, **kwargs):
+    touch('reactions')
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def touch_comments(sender, **kwargs):
+    touch('comments')
+
+
+@receiver(post_save, sender=ProcessedImage)
+def touch_image_pages(sender, instance, **kwargs):
+    # Quiz and blog cards switch to the resized variants once they are ready
+    if instance.status == 'ready':
+        touch('quizzes', 'blogs')
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def touch_tags(sender, **kwargs):
+    touch('tags', 'blogs')
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def touch_blog_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        touch('blogs', 'tags')
@@ -8,25 +8,49 @@ from django.shortcuts import get_object_or_404
 from .models import Quiz, Question
 from .models import Option
 from .models import Category
-from .models import Attempt, Answer, Blog, Tag, Comment, BlogReaction
+from .models import Attempt, Blog, Tag, BlogReaction, OutboundEmail, QuizItemAnalysis
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Count
+from django.db import IntegrityError, transaction
 from django.contrib.auth.models import User
-import csv
+import json
 from io import TextIOWrapper
 from .forms import BlogForm, CommentForm, CategoryForm
-from django.http import JsonResponse
-from django.core.mail import send_mail
-from django.conf import settings
-import socket
-from django.db.models import Q
+from .quiz_cache import (
+    draw_question_ids, draw_questions, draw_token, get_quiz_snapshot, new_draw_seed, option_belongs_to,
+    read_draw_token,
+)
+from .quiz_state import quiz_state_store
+from .attempts import record_attempt
+from .importers import import_mcq_csv, import_quizzes_csv, import_users_csv
+from .search import search_blogs, search_quizzes
+from .fragments import home_blogs_html, home_categories_html
+from .pagination import paginate_keyset
+from .analytics import counter_values, daily_series, top_quizzes
+from .item_analysis import analyze_quiz, cached_item_report
+from .leaderboards import top_entries, user_standing
+from .concurrency import gather
+from .images import attach_variants
+from .conditional import blog_page_validators, conditional_page, versioned_by
+from .related import related_blogs
+from .comments import comment_json, comment_page
+from django.http import JsonResponse, Http404
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+
+CARDS_PER_PAGE = 12
+ROWS_PER_PAGE = 25
+ADMIN_ROWS_PER_PAGE = 50
+LEADERBOARD_SIZE = 25
+DASHBOARD_RANGES = (7, 30, 90, 365)
 
-# socket.getaddrinfo('localhost', 8000)
 # Create your views here.
 def home(request):
-    categories = Category.objects.all()
-    blogs = Blog.objects.all().order_by('-created_at')[:6]  # latest 6 blogs
-    return render(request, 'core/home.html', {'categories': categories,'blogs':blogs})
+    # Both blocks are cached fragments, invalidated by model signals (see core/fragments.py)
+    categories_html, blogs_html = gather(home_categories_html, home_blogs_html)
+    return render(request, 'core/home.html', {
+        'categories_html': categories_html,
+        'blogs_html': blogs_html,
+    })
 
 def register(request):
     if request.method == 'POST':
@@ -88,129 +112,225 @@ def logout_view(request):
     return redirect('/')
 
 def category_quizzes(request, category_id):
-    quizzes = Quiz.objects.filter(category_id=category_id)
+    quizzes = Quiz.objects.filter(category_id=category_id).select_related('category')
     return render(request, 'core/quizzes_by_category.html', {'quizzes': quizzes})
 
+def get_quiz_snapshot_or_404(quiz_id):
+    snapshot = get_quiz_snapshot(quiz_id)
+    if snapshot is None:
+        raise Http404("No Quiz matches the given query.")
+    return snapshot
+
 @login_required
 def start_quiz(request, quiz_id):
-    quiz = get_object_or_404(Quiz, id=quiz_id)
-
-    request.session['score'] = 0
-    request.session['question_index'] = 0
-    request.session['answers'] = {}
-    request.session['quiz_id'] = quiz_id
+    quiz = get_quiz_snapshot_or_404(quiz_id)
 
     if quiz.status != 'active':
         messages.warning(request, "This quiz is not currently active.")
         return redirect('quizzes_by_category')
 
-    questions = Question.objects.filter(quiz=quiz).order_by('?')
-    return render(request, 'core/quiz_attempt.html', {
+    # Only the seed is stored; every request re-derives the same draw from it
+    store = quiz_state_store(request)
+    state = store.start(quiz.id, new_draw_seed())
+
+    questions = draw_questions(quiz, state.seed)
+    return store.commit(render(request, 'core/quiz_attempt.html', {
         'quiz': quiz,
         'questions': questions,
-        'total_questions': questions.count()
-    })
+        'total_questions': len(questions)
+    }))
 
 @login_required
 def attempt_quiz(request, quiz_id):
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    questions = quiz.question_set.all()
+    quiz = get_quiz_snapshot_or_404(quiz_id)
 
-    # Initialize session variables if not already set
-    if 'question_index' not in request.session:
-        request.session['question_index'] = 0
-        request.session['score'] = 0
-        request.session['answers'] = {}
+    # Start a fresh attempt if there is none in progress (or it expired)
+    store = quiz_state_store(request)
+    state = store.get(quiz.id) or store.start(quiz.id, new_draw_seed())
 
-    question_index = request.session['question_index']
+    questions = draw_questions(quiz, state.seed)
+    question_index = state.index
 
     if question_index >= len(questions):
-        return redirect('quiz_result', quiz_id=quiz_id)
+        return store.commit(redirect('quiz_result', quiz_id=quiz_id))
 
     current_question = questions[question_index]
-    options = current_question.options.all()
+    options = current_question.options
 
     if request.method == 'POST':
-        selected_option_id = request.POST.get('option')
-        if selected_option_id:
-            selected_option = Option.objects.get(id=selected_option_id)
-
-            # Safely update answers and score
-            answers = request.session.get('answers', {})
-            answers[str(current_question.id)] = selected_option.id
-            request.session['answers'] = answers
-
-            if selected_option.is_correct:
-                request.session['score'] += 1
-
-        request.session['question_index'] += 1
-        return redirect('attempt_quiz', quiz_id=quiz_id)  # Pass quiz_id here
+        selected_option_id = request.POST.get('option', '')
+        selected_option_id = int(selected_option_id) if selected_option_id.isdigit() else None
+        if selected_option_id is not None and option_belongs_to(quiz, current_question.id, selected_option_id):
+            # Only this step's answer is written; grading happens in quiz_result
+            store.advance(quiz.id, state, current_question.id, selected_option_id)
+        else:
+            store.advance(quiz.id, state)
+        return store.commit(redirect('attempt_quiz', quiz_id=quiz_id))  # Pass quiz_id here
 
-    return render(request, 'core/quiz_attempt.html', {
+    return store.commit(render(request, 'core/quiz_attempt.html', {
         'question': current_question,
         'options': options,
         'question_number': question_index + 1,
         'total_questions': len(questions),
-    })
+    }))
 
 @login_required
-def quiz_result(request,quiz_id):
-    score = request.session.get('score', 0)
-    # quiz_id = request.session.get('quiz_id')
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    total_questions = quiz.question_set.count()
-    answers = request.session.get('answers', {})
-
-    # Save attempt
-    attempt = Attempt.objects.create(
-        user=request.user,
-        quiz=quiz,
-        score=score,
-        total=total_questions,
-    )
+def attempt_quiz_all(request, quiz_id):
+    """
+    Whole-quiz mode: the drawn question set is served once and every selected
+    option comes back in a single POST (form fields ``question_<id>`` or a JSON
+    body ``{"answers": {"<question_id>": <option_id>}}``), together with the
+    signed ``draw`` token that was served with the questions.
+    """
+    quiz = get_quiz_snapshot_or_404(quiz_id)
+    wants_json = request.content_type == 'application/json' or request.GET.get('format') == 'json'
 
-    # Save each answer
-    for qid, oid in answers.items():
-        question = Question.objects.get(pk=qid)
-        option = Option.objects.get(pk=oid)
-        Answer.objects.create(
-            attempt=attempt,
-            question=question,
-            selected_option=option
-        )
+    if quiz.status != 'active':
+        if wants_json:
+            return JsonResponse({'error': 'This quiz is not currently active.'}, status=400)
+        messages.warning(request, "This quiz is not currently active.")
+        return redirect('quiz_list')
 
-    # Clear session
-    for key in ['score', 'quiz_id', 'question_index', 'answers']:
-        request.session.pop(key, None)
+    if request.method == 'POST':
+        if request.content_type == 'application/json':
+            try:
+                body = json.loads(request.body or b'{}')
+                answers, token = body.get('answers', {}), body.get('draw')
+            except (ValueError, AttributeError):
+                return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+            if not isinstance(answers, dict):
+                return JsonResponse({'error': 'answers must be an object.'}, status=400)
+        else:
+            token = request.POST.get('draw')
+            answers = {
+                key[len('question_'):]: value
+                for key, value in request.POST.items()
+                if key.startswith('question_')
+            }
+
+        store = quiz_state_store(request)
+        seed = read_draw_token(quiz, token)
+        if seed is None and not quiz.questions_per_attempt:
+            # The whole bank is asked either way; the stored run still guards against a double submit
+            state = store.get(quiz.id)
+            seed = state.seed if state else None
+        if seed is None:
+            if wants_json:
+                return JsonResponse({'error': 'Missing or invalid draw token.'}, status=400)
+            messages.warning(request, "Your question set has expired, please start again.")
+            return redirect('attempt_quiz_all', quiz_id=quiz.id)
+
+        # Ending the stored run and recording the attempt commit together: of two
+        # identical submits only the first finds the run, so only one is recorded
+        with transaction.atomic():
+            attempt = record_attempt(request.user, quiz, answers, seed=seed) if store.finish(quiz.id, seed) else None
+
+        if attempt is None:
+            if wants_json:
+                return JsonResponse({'error': 'This question set was already submitted or has expired.'}, status=409)
+            messages.warning(request, "This question set was already submitted or has expired.")
+            return redirect('quiz_result', quiz_id=quiz.id)
+        if wants_json:
+            return store.commit(JsonResponse({'attempt': attempt.id, 'score': attempt.score, 'total': attempt.total}))
+        return store.commit(redirect('quiz_result', quiz_id=quiz.id))
+
+    # Starting the run here also replaces any half-finished step-by-step attempt
+    store = quiz_state_store(request)
+    seed = store.start(quiz.id, new_draw_seed()).seed
+    questions = draw_questions(quiz, seed)
+    if wants_json:
+        return store.commit(JsonResponse({
+            'id': quiz.id,
+            'title': quiz.title,
+            'draw': draw_token(quiz, seed),
+            'questions': [
+                {
+                    'id': question.id,
+                    'text': question.text,
+                    'options': [{'id': option.id, 'text': option.text} for option in question.options],
+                }
+                for question in questions
+            ],
+        }))
+
+    return store.commit(render(request, 'core/quiz_attempt_all.html', {
+        'quiz': quiz,
+        'questions': questions,
+        'draw': draw_token(quiz, seed),
+        'total_questions': len(questions),
+    }))
 
-    return render(request, 'core/quiz_result.html', {
-        'score': score,
-        'total_questions': total_questions,
+@login_required
+def quiz_result(request,quiz_id):
+    quiz = get_quiz_snapshot_or_404(quiz_id)
+    store = quiz_state_store(request)
+    state = store.get(quiz.id)
+
+    attempt = None
+    if state is not None:
+        answers = store.answers(quiz.id, state, draw_question_ids(quiz, state.seed))
+        # Finishing the run and recording it commit together, so a refresh or a
+        # concurrent double submit that finds the run gone shows this attempt instead
+        with transaction.atomic():
+            if store.finish(quiz.id, state.seed):
+                attempt = record_attempt(request.user, quiz, answers, seed=state.seed)
+    if attempt is None:
+        attempt = Attempt.objects.filter(user=request.user, quiz_id=quiz.id).order_by('-id').first()
+        if attempt is None:
+            return redirect('start_quiz', quiz_id=quiz.id)
+
+    return store.commit(render(request, 'core/quiz_result.html', {
+        'score': attempt.score,
+        'total_questions': attempt.total,
         'quiz': quiz
+    }))
+
+def leaderboard(request, quiz_id=None):
+    # Top-N is an index scan; the viewer's rank comes from the score buckets, not a table count
+    quiz = get_object_or_404(Quiz, id=quiz_id) if quiz_id is not None else None
+    my_entry, my_rank = user_standing(request.user, quiz_id)
+    return render(request, 'core/leaderboard.html', {
+        'quiz': quiz,
+        'entries': top_entries(quiz_id, LEADERBOARD_SIZE),
+        'my_entry': my_entry,
+        'my_rank': my_rank,
     })
 
 @login_required
 def my_attempts(request):
-    attempts = Attempt.objects.filter(user=request.user).order_by('-completed_at')
-    return render(request, 'core/my_attempts.html', {'attempts': attempts})
+    attempts = Attempt.objects.filter(user=request.user).select_related('quiz')
+    page = paginate_keyset(request, attempts, ('-completed_at', 'id'), ROWS_PER_PAGE)
+    return render(request, 'core/my_attempts.html', {'attempts': page.object_list, 'page': page})
 
 @staff_member_required
 def admin_dashboard(request):
-    from .models import User, Quiz, Attempt
+    # Reads only the rollups maintained by core.analytics, never the Attempt table
+    days = request.GET.get('days', '30')
+    days = int(days) if days.isdigit() and int(days) in DASHBOARD_RANGES else 30
+    totals = counter_values()
+    series = daily_series(days)
+    peak = max((day['attempts'] for day in series), default=0)
+    for day in series:
+        day['percent'] = round(100 * day['attempts'] / peak) if peak else 0
 
     context = {
-        'total_users': User.objects.count(),
-        'total_quizzes': Quiz.objects.count(),
-        'total_attempts': Attempt.objects.count(),
-        'top_quizzes': Quiz.objects.annotate(attempts=Count('attempt')).order_by('-attempts')[:5],
+        'total_users': totals['users'],
+        'total_quizzes': totals['quizzes'],
+        'total_attempts': totals['attempts'],
+        'top_quizzes': top_quizzes(5),
+        'series': series,
+        'days': days,
+        'ranges': DASHBOARD_RANGES,
+        'range_attempts': sum(day['attempts'] for day in series),
+        'range_perfect': sum(day['perfect'] for day in series),
     }
 
     return render(request, 'core/admin_dashboard.html', context)
 
 @staff_member_required
 def admin_manage_users(request):
-    users = User.objects.all()
-    return render(request, 'core/admin_users.html', {'users': users})
+    page = paginate_keyset(request, User.objects.all(), ('id',), ADMIN_ROWS_PER_PAGE)
+    return render(request, 'core/admin_users.html', {'users': page.object_list, 'page': page})
 
 @staff_member_required
 def admin_add_user(request):
@@ -238,17 +358,10 @@ def upload_users_csv(request):
     if request.method == 'POST':
         csv_file = request.FILES['csv_file']
         file_data = TextIOWrapper(csv_file.file, encoding='utf-8')
-        reader = csv.DictReader(file_data)
+        report = import_users_csv(file_data, workers=1)  # no process pool inside a web worker
 
-        for row in reader:
-            username = row['username']
-            email = row['email']
-            password = row['password']
-            if not User.objects.filter(username=username).exists():
-                User.objects.create_user(username=username, email=email, password=password)
-
-        messages.success(request, "Users uploaded successfully.")
-        return redirect('admin_manage_users')
+        messages.success(request, f"Users uploaded: {report.summary()}.")
+        return render(request, 'core/admin_upload_users.html', {'report': report})
 
     return render(request, 'core/admin_upload_users.html')
 
@@ -272,7 +385,7 @@ def edit_user(request, user_id):
 
 @staff_member_required
 def admin_manage_quizzes(request):
-    quizzes = Quiz.objects.all()
+    page = paginate_keyset(request, Quiz.objects.select_related('category'), ('id',), ADMIN_ROWS_PER_PAGE)
     categories = Category.objects.all()[:9]
 
     # Handle new category form
@@ -285,11 +398,17 @@ def admin_manage_quizzes(request):
         category_form = CategoryForm()
 
     return render(request, 'core/admin_quizzes.html', {
-        'quizzes': quizzes,
+        'quizzes': page.object_list,
+        'page': page,
         'categories': categories,
         'category_form': category_form,
     })
 
+def parse_questions_per_attempt(data):
+    # Blank, zero or junk means "ask every question in the bank"
+    value = data.get('questions_per_attempt', '').strip()
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
 @staff_member_required
 def admin_add_quiz(request):
     categories = Category.objects.all()
@@ -301,7 +420,10 @@ def admin_add_quiz(request):
         category = get_object_or_404(Category, id=category_id)
 
         status = request.POST.get('status')
-        Quiz.objects.create(title=title, category=category, status=status)
+        Quiz.objects.create(
+            title=title, category=category, status=status,
+            questions_per_attempt=parse_questions_per_attempt(request.POST),
+        )
         messages.success(request, "Quiz added successfully.")
         return redirect('admin_manage_quizzes')
     return render(request, 'core/admin_add_quiz.html', {'categories': categories})
@@ -318,6 +440,7 @@ def admin_edit_quiz(request, quiz_id):
         quiz.status = request.POST.get('status')
         quiz.is_paid = request.POST.get('is_paid')
         quiz.price = request.POST.get('price')
+        quiz.questions_per_attempt = parse_questions_per_attempt(request.POST)
         quiz.save()
         messages.success(request, "Quiz updated successfully.")
         return redirect('admin_manage_quizzes')
@@ -335,23 +458,32 @@ def upload_quizzes_csv(request):
     if request.method == 'POST':
         csv_file = request.FILES['csv_file']
         file_data = TextIOWrapper(csv_file.file, encoding='utf-8')
-        reader = csv.DictReader(file_data)
+        report = import_quizzes_csv(file_data, update_existing=bool(request.POST.get('update_existing')))
 
-        for row in reader:
-            category_name = row['category']
-            category, _ = Category.objects.get_or_create(name=category_name)
-
-            Quiz.objects.create(
-                title=row['title'],
-                category=category,
-                status=row.get('status', 'active')
-            )
-
-        messages.success(request, "Quizzes uploaded successfully.")
-        return redirect('admin_manage_quizzes')
+        messages.success(request, f"Quizzes uploaded: {report.summary()}.")
+        return render(request, 'core/admin_upload_quizzes.html', {'report': report})
 
     return render(request, 'core/admin_upload_quizzes.html')
 
+@staff_member_required
+def admin_item_analysis(request, quiz_id):
+    quiz = get_object_or_404(Quiz, id=quiz_id)
+    error = None
+    if request.method == 'POST':
+        try:
+            analyze_quiz(quiz.id, full=bool(request.POST.get('full')))
+            return redirect('admin_item_analysis', quiz_id=quiz.id)
+        except ImproperlyConfigured as exc:
+            error = str(exc)
+
+    run = QuizItemAnalysis.objects.filter(quiz=quiz).first()
+    return render(request, 'core/admin_item_analysis.html', {
+        'quiz': quiz,
+        'run': run,
+        'rows': cached_item_report(run) if run else [],
+        'error': error,
+    })
+
 @staff_member_required
 def admin_add_question(request, quiz_id):
     quiz = get_object_or_404(Quiz, id=quiz_id)
@@ -380,40 +512,27 @@ def upload_mcq_csv(request):
     if request.method == 'POST':
         csv_file = request.FILES['csv_file']
         file_data = TextIOWrapper(csv_file.file, encoding='utf-8')
-        reader = csv.DictReader(file_data)
-
-        for row in reader:
-            quiz_title = row['quiz_title']
-            quiz = Quiz.objects.filter(title=quiz_title).first()
-            if not quiz:
-                continue
-
-            question = Question.objects.create(
-                quiz=quiz,
-                text=row['question']
-            )
+        report = import_mcq_csv(file_data)
 
-            for i in range(1, 5):
-                is_correct = (int(row['correct_option_index']) == i - 1)
-                Option.objects.create(
-                    question=question,
-                    text=row[f'option{i}'],
-                    is_correct=is_correct
-                )
-
-        messages.success(request, "Questions uploaded successfully.")
-        return redirect('admin_dashboard')
+        messages.success(request, f"Questions uploaded: {report.summary()}.")
+        return render(request, 'core/upload_mcq_csv.html', {'report': report})
 
     return render(request, 'core/upload_mcq_csv.html')
 
+@conditional_page(versioned_by('quizzes', 'categories'))
 def quiz_list(request):
     # quizzes = Quiz.objects.filter(status='active')  # or all quizzes if admin
-    quizzes = Quiz.objects.all().order_by('-status')
-    return render(request, 'core/quiz_list.html', {'quizzes': quizzes})
+    quizzes = Quiz.objects.select_related('category')
+    page = paginate_keyset(request, quizzes, ('-status', 'id'), CARDS_PER_PAGE)
+    attach_variants(page.object_list)
+    return render(request, 'core/quiz_list.html', {'quizzes': page.object_list, 'page': page})
 
+@conditional_page(versioned_by('blogs', 'tags', 'comments'))
 def blog_list(request):
-    blogs = Blog.objects.all().order_by('-created_at')
-    return render(request, 'core/blog_list.html', {'blogs': blogs})
+    blogs = Blog.objects.select_related('author').prefetch_related('tags')
+    page = paginate_keyset(request, blogs, ('-created_at', 'id'), CARDS_PER_PAGE)
+    attach_variants(page.object_list)
+    return render(request, 'core/blog_list.html', {'blogs': page.object_list, 'page': page})
 
 def about_us(request):
     return render(request, 'core/about_us.html')
@@ -427,13 +546,12 @@ def contact(request):
 
         full_message = f"Message from {name} ({email}):\n\n{message}"
 
-        # Send email (requires EMAIL settings configured in settings.py)
-        send_mail(
-            subject,
-            full_message,
-            settings.DEFAULT_FROM_EMAIL,
-            [email],  # change to your email
-            fail_silently=False
+        # Queued for `manage.py send_queued_email` (requires EMAIL settings configured in settings.py)
+        OutboundEmail.enqueue(
+            kind='contact',
+            subject=subject,
+            body=full_message,
+            recipients=[email],  # change to your email
         )
 
         messages.success(request, "Thank you for contacting us! We'll reply soon.")
@@ -448,13 +566,15 @@ def category_list(request):
     categories = Category.objects.all()
     return render(request, 'core/category_list.html', {'categories': categories})
 
+@conditional_page(blog_page_validators)
 def blog_detail(request, blog_id):
-    blog = get_object_or_404(Blog, pk=blog_id)
-    comments = blog.comments.order_by('-created_at')
-    related_blogs = Blog.objects.exclude(id=blog_id)[:3]
-
-    like_count = blog.reactions.filter(is_like=True).count()
-    dislike_count = blog.reactions.filter(is_like=False).count()
+    # None of the three reads needs another's result (see core/concurrency.py)
+    blog, comments, related = gather(
+        lambda: get_object_or_404(Blog, pk=blog_id),
+        lambda: comment_page(request, blog_id),
+        lambda: related_blogs(blog_id),
+    )
+    attach_variants([blog] + related)
 
     if request.method == 'POST' and request.user.is_authenticated:
         form = CommentForm(request.POST)
@@ -471,15 +591,28 @@ def blog_detail(request, blog_id):
         'blog': blog,
         'comments': comments,
         'form': form,
-        'related_blogs': related_blogs,
-        'like_count': like_count,
-        'dislike_count': dislike_count,
+        'related_blogs': related,
+        'like_count': blog.like_count,
+        'dislike_count': blog.dislike_count,
     })
 
+@conditional_page(blog_page_validators)
+def blog_comments(request, blog_id):
+    if not Blog.objects.filter(pk=blog_id).exists():
+        raise Http404
+    comments = comment_page(request, blog_id)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [comment_json(comment) for comment in comments],
+            'next': comments.next_cursor,
+        })
+    return render(request, 'core/comment_page.html', {'blog_id': blog_id, 'comments': comments})
+
+@conditional_page(versioned_by('blogs', 'tags', 'comments'))
 def blogs_by_tag(request, tag_name):
     tag = get_object_or_404(Tag, name=tag_name)
-    blogs = tag.blogs.all().order_by('-created_at')
-    return render(request, 'core/blogs_by_tag.html', {'tag': tag, 'blogs': blogs})
+    page = paginate_keyset(request, tag.blogs.all(), ('-created_at', 'id'), CARDS_PER_PAGE)
+    return render(request, 'core/blogs_by_tag.html', {'tag': tag, 'blogs': page.object_list, 'page': page})
 
 @login_required
 def submit_blog(request):
@@ -500,19 +633,34 @@ def toggle_blog_reaction(request, blog_id, reaction_type):
     blog = get_object_or_404(Blog, id=blog_id)
     is_like = True if reaction_type == 'like' else False
 
-    reaction, created = BlogReaction.objects.get_or_create(user=request.user, blog=blog)
-    if not created and reaction.is_like == is_like:
-        # Remove reaction if already liked/disliked
-        reaction.delete()
-        status = 'removed'
-    else:
-        # Update or set new reaction
-        reaction.is_like = is_like
-        reaction.save()
-        status = 'added'
-
-    like_count = blog.reactions.filter(is_like=True).count()
-    dislike_count = blog.reactions.filter(is_like=False).count()
+    # The reaction row and the denormalized counters (adjusted by the receivers
+    # in core/reactions.py) change together.
+    for retry in (False, True):
+        try:
+            with transaction.atomic():
+                reaction = BlogReaction.objects.select_for_update().filter(user=request.user, blog=blog).first()
+                if reaction is None:
+                    BlogReaction.objects.create(user=request.user, blog=blog, is_like=is_like)
+                    status = 'added'
+                elif reaction.is_like == is_like:
+                    # Remove reaction if already liked/disliked
+                    reaction.delete()
+                    status = 'removed'
+                else:
+                    # Switch between like and dislike
+                    reaction.is_like = is_like
+                    reaction.save(update_fields=['is_like'])
+                    status = 'added'
+
+                like_count, dislike_count = Blog.objects.filter(pk=blog.pk).values_list(
+                    'like_count', 'dislike_count',
+                ).get()
+            break
+        except IntegrityError:
+            # A concurrent first reaction inserted the row after our lookup (select_for_update
+            # locks nothing on SQLite): run again against the row it created
+            if retry:
+                raise
 
     return JsonResponse({
         'status': status,
@@ -532,8 +680,8 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def admin_blogs(request):
-    blogs = Blog.objects.all().order_by('-created_at')
-    return render(request, 'core/admin_blogs.html', {'blogs': blogs})
+    page = paginate_keyset(request, Blog.objects.select_related('author'), ('-created_at', 'id'), ADMIN_ROWS_PER_PAGE)
+    return render(request, 'core/admin_blogs.html', {'blogs': page.object_list, 'page': page})
 
 @login_required
 @user_passes_test(is_admin)
@@ -567,23 +715,25 @@ def delete_blog(request, blog_id):
     blog.delete()
     return redirect('admin_blogs')
 
+def search_page(results, page_number):
+    page = Paginator(results, 10).get_page(page_number)
+    page.object_list = list(page.object_list)  # evaluate here, on the thread gather() gave us
+    return page
+
 def search(request):
     query = request.GET.get('q')
     quizzes = []
     blogs = []
 
     if query:
-        quizzes = Quiz.objects.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
+        # Each list pages on its own: the two rarely have the same number of pages
+        quizzes, blogs = gather(
+            lambda: search_page(search_quizzes(query), request.GET.get('quiz_page')),
+            lambda: search_page(search_blogs(query), request.GET.get('blog_page')),
         )
-        blogs = Blog.objects.filter(
-            Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
-        ).distinct()
 
     return render(request, 'core/search_results.html', {
         'query': query,
         'quizzes': quizzes,
         'blogs': blogs
     })
-
-
@@ -0,0 +1,121 @@
+"""
+Concurrent-writer throughput benchmark for SQLite connection settings.
+
+Worker processes run the write transaction that finishing a quiz performs:
+insert an attempt and its answers, then bump the attempts counter. Reader
+processes query a user's attempts at the same time. Each profile runs
+against a fresh database file for a fixed duration, and the run reports
+committed transactions per second, write latency percentiles and how many
+transactions failed with "database is locked".
+
+This module only imports the standard library, so it also works with the
+spawn start method.
+"""
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+SCHEMA = """
+CREATE TABLE attempt (id INTEGER PRIMARY KEY, user_id INTEGER, quiz_id INTEGER, score INTEGER, completed_at REAL);
+CREATE INDEX attempt_user ON attempt (user_id, completed_at);
+CREATE TABLE answer (id INTEGER PRIMARY KEY, attempt_id INTEGER, question_id INTEGER, option_id INTEGER);
+CREATE TABLE counter (name TEXT PRIMARY KEY, value INTEGER);
+INSERT INTO counter VALUES ('attempts', 0);
+"""
+ANSWERS_PER_ATTEMPT = 10
+USERS = 500
+
+
+def connect(path, profile):
+    connection = sqlite3.connect(path, timeout=profile['timeout'])
+    for name, value in profile['pragmas'].items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    return connection
+
+
+def write_once(connection, rng):
+    with connection:
+        attempt_id = connection.execute(
+            'INSERT INTO attempt (user_id, quiz_id, score, completed_at) VALUES (?, ?, ?, ?)',
+            (rng.randrange(USERS), rng.randrange(50), rng.randrange(ANSWERS_PER_ATTEMPT + 1), time.time()),
+        ).lastrowid
+        connection.executemany(
+            'INSERT INTO answer (attempt_id, question_id, option_id) VALUES (?, ?, ?)',
+            [(attempt_id, rng.randrange(10 ** 6), rng.randrange(10 ** 6)) for _ in range(ANSWERS_PER_ATTEMPT)],
+        )
+        connection.execute("UPDATE counter SET value = value + 1 WHERE name = 'attempts'")
+
+
+def read_once(connection, rng):
+    connection.execute(
+        'SELECT id, score FROM attempt WHERE user_id = ? ORDER BY completed_at DESC LIMIT 25', (rng.randrange(USERS),),
+    ).fetchall()
+
+
+def worker(path, profile, role, seconds, seed, results):
+    """Run ``role`` ('write' or 'read') for ``seconds`` and put (role, latencies_ms, errors) on ``results``."""
+    rng = random.Random(seed)
+    operation = write_once if role == 'write' else read_once
+    latencies, errors = [], 0
+    connection = None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = connect(path, profile)
+            operation(connection, rng)
+            latencies.append((time.perf_counter() - started) * 1000)
+        except sqlite3.OperationalError:
+            errors += 1
+        finally:
+            # Without persistent connections every request opens its own, as with CONN_MAX_AGE = 0
+            if connection is not None and not profile['persistent']:
+                connection.close()
+                connection = None
+    if connection is not None:
+        connection.close()
+    results.put((role, latencies, errors))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_profile(profile, writers=8, readers=4, seconds=5.0, start_method=None):
+    context = multiprocessing.get_context(start_method)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        setup = connect(path, profile)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        results = context.Queue()
+        roles = ['write'] * writers + ['read'] * readers
+        processes = [
+            context.Process(target=worker, args=(path, profile, role, seconds, seed, results))
+            for seed, role in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    summary = {}
+    for role in ('write', 'read'):
+        latencies = [ms for kind, values, _ in collected if kind == role for ms in values]
+        summary[role] = {
+            'ops_per_second': round(len(latencies) / seconds, 1),
+            'median_ms': round(statistics.median(latencies), 3) if latencies else 0.0,
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'errors': sum(errors for kind, _, errors in collected if kind == role),
+        }
+    return summary
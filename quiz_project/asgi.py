@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+# Django 3.0 has no async views; under ASGI the read-heavy views overlap their
+# independent queries on a thread pool instead (see core/concurrency.py).
+os.environ.setdefault('DJANGO_CONCURRENT_READS', '1')
 
 application = get_asgi_application()
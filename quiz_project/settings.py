@@ -87,6 +87,30 @@ DATABASES = {
     }
 }
 
+# SQLite tuning of the production profile: settings_production applies it and
+# `manage.py benchmark_db_writes` compares it with the defaults above. WAL lets
+# readers run alongside the single writer; synchronous=NORMAL is durable across
+# application crashes in WAL mode.
+PRODUCTION_SQLITE_BUSY_TIMEOUT = 20  # seconds a writer waits for the lock before "database is locked"
+PRODUCTION_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': PRODUCTION_SQLITE_BUSY_TIMEOUT * 1000,
+}
+
+
+# Cache
+# The quiz snapshots, home page fragments and leaderboards are invalidated by
+# deleting keys, which a per-process LocMemCache only does in the worker that
+# handled the write. That is fine for runserver; settings_production uses a
+# store every worker shares.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -130,6 +154,8 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # `manage.py collectstatic` output
+SERVE_STATIC_FILES = False  # runserver serves static files itself (see core/static_delivery.py)
 LOGIN_URL = '/login/'
 
 
@@ -143,6 +169,16 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 LOGIN_REDIRECT_URL = 'admin/dashboard'  # default for normal users
 
+# Where in-progress quiz attempts live (core.quiz_state): 'db', 'cache' or 'cookie'.
+# Only pick 'cache' when CACHES points at a store shared by every worker.
+QUIZ_STATE_BACKEND = 'db'
+QUIZ_STATE_TTL = 60 * 60 * 6  # abandoned attempts expire after this many seconds
+
+# Run the read-heavy views' independent queries on a thread pool (core.concurrency).
+# quiz_project/asgi.py switches this on; WSGI keeps one query at a time.
+CONCURRENT_READS = os.environ.get('DJANGO_CONCURRENT_READS') == '1'
+CONCURRENT_READ_WORKERS = 4
+
 
 CKEDITOR_UPLOAD_PATH = "uploads/"
 CKEDITOR_ALLOW_NONIMAGE_FILES = False
@@ -0,0 +1,103 @@
+"""
+Production profile: DJANGO_SETTINGS_MODULE=quiz_project.settings_production
+
+Everything deployment specific comes from the environment:
+
+    DJANGO_SECRET_KEY       required; startup fails without it
+    DJANGO_ALLOWED_HOSTS    comma separated host names
+    DB_ENGINE               'sqlite' (default) or 'postgresql' (needs psycopg2)
+    DB_NAME                 database name, or the SQLite file path
+    DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+    DB_CONN_MAX_AGE         seconds to keep connections open between requests
+    DJANGO_STATIC_ROOT      where collectstatic writes the hashed, compressed files
+    DJANGO_SERVE_STATIC     '0' when a web server or CDN serves STATIC_ROOT instead
+    DJANGO_CACHE_BACKEND    'db' (default), 'memcached' (needs python-memcached) or
+                            'locmem' (only safe with a single worker process)
+    DJANGO_CACHE_LOCATION   memcached servers, comma separated (default 127.0.0.1:11211)
+
+Compare the SQLite tuning with the development defaults using
+``manage.py benchmark_db_writes``.
+
+Run ``manage.py createcachetable`` once when using the 'db' cache, and
+``manage.py collectstatic`` on every deploy. Templates then link to
+content-hashed names from the manifest, so a missing run breaks {% static %}.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, PRODUCTION_SQLITE_BUSY_TIMEOUT, PRODUCTION_SQLITE_PRAGMAS, TEMPLATES
+
+DEBUG = False  # also stops every SQL statement being kept in connection.queries
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', '')
+if not SECRET_KEY:
+    # The development key is committed to the repository: signing cookies and cursors with it is not safe
+    raise ImproperlyConfigured("Set DJANGO_SECRET_KEY to run with the production settings.")
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+if os.environ.get('DB_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'quiz_app'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+else:
+    SQLITE_BUSY_TIMEOUT = PRODUCTION_SQLITE_BUSY_TIMEOUT
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+            'OPTIONS': {'timeout': SQLITE_BUSY_TIMEOUT},
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        }
+    }
+    SQLITE_PRAGMAS = PRODUCTION_SQLITE_PRAGMAS  # applied per connection by core.db
+
+# Cache invalidation must reach every worker (see CACHES in settings.py)
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'db')
+if CACHE_BACKEND == 'memcached':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': [
+                server.strip() for server in os.environ.get('DJANGO_CACHE_LOCATION', '127.0.0.1:11211').split(',')
+                if server.strip()
+            ],
+        }
+    }
+elif CACHE_BACKEND == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+elif CACHE_BACKEND != 'locmem':
+    raise ImproperlyConfigured(f"DJANGO_CACHE_BACKEND must be 'db', 'memcached' or 'locmem', not {CACHE_BACKEND!r}.")
+
+# Persistent connections are pinged when a request starts (see core.db)
+DB_HEALTH_CHECKS = True
+
+# Hashed file names, a manifest and .gz/.br siblings, served with immutable cache headers (see core.static_delivery)
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+STATICFILES_STORAGE = 'core.static_delivery.CompressedManifestStaticFilesStorage'
+SERVE_STATIC_FILES = os.environ.get('DJANGO_SERVE_STATIC', '1') == '1'
+
+TEMPLATES = [dict(
+    TEMPLATES[0],
+    APP_DIRS=False,
+    OPTIONS=dict(TEMPLATES[0]['OPTIONS'], loaders=[
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]),
+)]
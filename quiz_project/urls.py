@@ -15,9 +15,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from core import views
-from django.conf import settings
-from django.conf.urls.static import static
+from core import static_delivery, views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,6 +27,7 @@ urlpatterns = [
     path('quiz/<int:quiz_id>/start/', views.start_quiz, name='start_quiz'),
     # path('quiz/attempt/', views.attempt_quiz, name='attempt_quiz'),
     path('quiz/<int:quiz_id>/attempt/', views.attempt_quiz, name='attempt_quiz'),
+    path('quiz/<int:quiz_id>/attempt/all/', views.attempt_quiz_all, name='attempt_quiz_all'),
     path('quiz/<int:quiz_id>/result/', views.quiz_result, name='quiz_result'),
     path('my-attempts/', views.my_attempts, name='my_attempts'),
     path('admin/dashboard/', views.admin_dashboard, name='admin_dashboard'),
@@ -43,10 +42,14 @@ urlpatterns = [
     path('admin/quizzes/delete/<int:quiz_id>/', views.admin_delete_quiz, name='admin_delete_quiz'),
     path('admin/quizzes/upload_csv/', views.upload_quizzes_csv, name='upload_quizzes_csv'),
     path('admin/quizzes/<int:quiz_id>/add-question/', views.admin_add_question, name='admin_add_question'),
+    path('admin/quizzes/<int:quiz_id>/item-analysis/', views.admin_item_analysis, name='admin_item_analysis'),
     path('admin/upload-mcq/', views.upload_mcq_csv, name='upload_mcq_csv'),
     path('quizzes/', views.quiz_list, name='quiz_list'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
+    path('quiz/<int:quiz_id>/leaderboard/', views.leaderboard, name='quiz_leaderboard'),
     path('blogs/', views.blog_list, name='blog_list'),
     path('blogs/<int:blog_id>/', views.blog_detail, name='blog_detail'),
+    path('blogs/<int:blog_id>/comments/', views.blog_comments, name='blog_comments'),
     path('about/', views.about_us, name='about'),
     path('contact/', views.contact, name='contact'),
     path('courses/', views.course, name='course'),
@@ -61,8 +64,8 @@ urlpatterns = [
     path('admin/blogs/<int:blog_id>/edit/', views.edit_blog, name='edit_blog'),
     path('admin/blogs/<int:blog_id>/delete/', views.delete_blog, name='delete_blog'),
 
-    # path('api/', include('api.urls')),
+    path('api/', include('api.urls')),
 
     path('search/', views.search, name='search'),
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+] + static_delivery.urlpatterns()
\ No newline at end of file